@@ -0,0 +1,162 @@
+"""
+Análise em lote, sem interface gráfica.
+
+Processa todos os áudios de uma pasta em paralelo (um processo por núcleo)
+e grava uma linha de métricas por arquivo em CSV ou Parquet. Opcionalmente
+exporta os gráficos do Dashboard (PNG) de cada arquivo.
+
+Uso (a partir da pasta app/):
+    python batch.py ../audios -o metricas.csv
+    python batch.py /gravacoes -o metricas.parquet --png graficos --workers 8
+"""
+import argparse
+import csv
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")  # Sem Tk: os PNGs são gerados fora da tela
+
+from model.audio_analyzer import AudioAnalyzer
+from model.audio_file import AudioFile
+from model.analysis_cache import AnalysisCache
+from view.services.plot_exporter import PlotExporter
+
+EXTENSOES = (".wav", ".mp3", ".flac", ".ogg")
+TODOS_GRAFICOS = ["Waveform", "Spectrogram", "Pitch", "SFFT3D", "Hilbert", "PitchSTFT", "FFT", "RMS"]
+COLUNAS = ["arquivo", "sr", "duration", "crest_factor", "centroid", "rolloff", "f0", "erro"]
+
+# Um AudioAnalyzer por processo de trabalho (criado na primeira tarefa)
+_analyzer = None
+
+def _get_analyzer(use_cache):
+    global _analyzer
+    if _analyzer is None:
+        cache = None
+        if use_cache:
+            try:
+                cache = AnalysisCache()
+            except OSError:
+                cache = None
+        _analyzer = AudioAnalyzer(cache=cache)
+    return _analyzer
+
+def analisar_arquivo(path, fi, fm, png_dir=None, charts=None, use_cache=True):
+    """
+    Executado em um processo de trabalho. Retorna (linha, duração em s).
+    Erros não interrompem o lote: viram a coluna 'erro' da linha.
+    """
+    name = os.path.basename(path)
+    try:
+        analyzer = _get_analyzer(use_cache)
+        audio = AudioFile(path)
+        ctx = analyzer.get_context(audio, audio.fs)
+
+        metrics = analyzer.get_metrics(audio, audio.fs, fmin=fi, fmax=fm, ctx=ctx)
+        row = {"arquivo": name, **metrics, "erro": ""}
+
+        if png_dir:
+            out_dir = os.path.join(png_dir, os.path.splitext(name)[0])
+            os.makedirs(out_dir, exist_ok=True)
+            charts = charts or TODOS_GRAFICOS
+
+            fft_data = []
+            if "FFT" in charts:
+                f, mag = analyzer.calcular_fft_basica(audio, audio.fs, fmin=fi, fmax=fm)
+                fft_data.append({'freq': f, 'mag': mag, 'label': name, 'color': 'C0'})
+
+            PlotExporter().save_dashboard(
+                dir_path=out_dir,
+                active_audio=(audio, audio.fs),
+                plot_list=fft_data,
+                analyzer=analyzer,
+                grid_enabled=True,
+                params={'fi': fi, 'fm': fm},
+                active_charts=charts,
+                context=ctx
+            )
+        return row, audio.duration
+    except Exception as e:
+        return {"arquivo": name, "erro": str(e)}, 0.0
+
+def listar_audios(input_dir, recursive=False):
+    paths = []
+    for root, dirs, files in os.walk(input_dir):
+        for fname in sorted(files):
+            if fname.lower().endswith(EXTENSOES):
+                paths.append(os.path.join(root, fname))
+        if not recursive:
+            break
+    return paths
+
+def motor_parquet_disponivel():
+    """to_parquet precisa do pyarrow (ou fastparquet), que o pandas não traz."""
+    return any(importlib.util.find_spec(m) is not None for m in ("pyarrow", "fastparquet"))
+
+def salvar_tabela(rows, output):
+    if output.lower().endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(rows, columns=COLUNAS).to_parquet(output, index=False)
+        return
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUNAS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análise em lote de gravações (sem interface).")
+    parser.add_argument("input_dir", help="Pasta com os arquivos de áudio")
+    parser.add_argument("-o", "--output", default="metricas.csv", help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--png", metavar="DIR", help="Também exporta os gráficos de cada arquivo nesta pasta")
+    parser.add_argument("--charts", nargs="+", choices=TODOS_GRAFICOS, help="Gráficos exportados com --png")
+    parser.add_argument("--fi", type=float, default=20, help="Frequência mínima (Hz)")
+    parser.add_argument("--fm", type=float, default=20000, help="Frequência máxima (Hz)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processos em paralelo")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Inclui subpastas")
+    parser.add_argument("--no-cache", action="store_true", help="Não usa o cache de análises em disco")
+    args = parser.parse_args(argv)
+
+    # Verificado antes do lote: falhar só ao salvar perderia a análise inteira
+    if args.output.lower().endswith(".parquet") and not motor_parquet_disponivel():
+        print("Saída .parquet requer o pacote pyarrow (pip install pyarrow); "
+              "use -o com .csv ou instale-o.")
+        return 1
+
+    paths = listar_audios(args.input_dir, args.recursive)
+    if not paths:
+        print(f"Nenhum áudio encontrado em {args.input_dir}")
+        return 1
+
+    print(f"Processando {len(paths)} arquivo(s) com {args.workers} processo(s)...")
+    rows = []
+    total_audio = 0.0
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(analisar_arquivo, p, args.fi, args.fm, args.png, args.charts, not args.no_cache): p
+            for p in paths
+        }
+        for i, fut in enumerate(as_completed(futures), start=1):
+            row, duracao = fut.result()
+            rows.append(row)
+            total_audio += duracao
+            status = f"ERRO: {row['erro']}" if row.get("erro") else "ok"
+            print(f"[{i}/{len(paths)}] {row['arquivo']}: {status}")
+
+    decorrido = time.perf_counter() - inicio
+    rows.sort(key=lambda r: r["arquivo"])
+    salvar_tabela(rows, args.output)
+
+    falhas = sum(1 for r in rows if r.get("erro"))
+    print(f"\nMétricas salvas em {args.output} ({len(rows) - falhas} ok, {falhas} com erro)")
+    print(f"Tempo total: {decorrido:.1f} s")
+    print(f"Vazão: {len(rows) / decorrido:.2f} arquivos/s, "
+          f"{total_audio / decorrido:.1f} s de áudio/s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
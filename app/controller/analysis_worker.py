@@ -0,0 +1,110 @@
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+class AnalysisWorker:
+    """
+    Executa os cálculos do Dashboard fora da thread do Tk.
+
+    Cada submit() abre uma nova GERAÇÃO. Tarefas de gerações anteriores que
+    ainda não começaram são canceladas e resultados atrasados são descartados,
+    então só o pedido mais recente chega à tela.
+    Os resultados voltam por uma fila drenada na thread da UI com after().
+
+    Cada job é um TaskGraph: a thread coordenadora dispara as tarefas
+    independentes em paralelo no pool de cálculo, sem passar do tamanho do
+    pool, para que a prioridade de cada tarefa decida quem roda primeiro.
+    """
+    POLL_MS = 30
+    MAX_THREADS = min(4, os.cpu_count() or 1)
+
+    def __init__(self, tk_widget):
+        self.widget = tk_widget
+        self.generation = 0
+        # Coordenador (um job por vez) e pool onde as tarefas realmente rodam
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self._pool = ThreadPoolExecutor(max_workers=self.MAX_THREADS, thread_name_prefix="analysis-task")
+        self._results = queue.Queue()
+        self._callbacks = {}
+        self._polling = False
+
+    def submit(self, graph, on_result, on_done=None, on_error=None):
+        """
+        graph: TaskGraph com as tarefas deste job.
+        on_result(nome, valor) / on_error(nome, exc) / on_done() rodam na UI.
+        Retorna o token da geração.
+        """
+        self.generation += 1
+        gen = self.generation
+        self._callbacks = {gen: (on_result, on_done, on_error)}
+        self._executor.submit(self._run, gen, graph)
+        self._start_polling()
+        return gen
+
+    def cancel(self):
+        """Invalida o trabalho em andamento sem iniciar outro."""
+        self.generation += 1
+        self._callbacks = {}
+
+    def is_current(self, gen):
+        return gen == self.generation
+
+    def shutdown(self):
+        """
+        Cancela tudo e libera os pools sem esperar. As tarefas na fila são
+        descartadas; só as que já estão rodando terminam (o interpretador
+        espera por elas ao sair).
+        """
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Thread de trabalho ---
+
+    def _run(self, gen, graph):
+        # Geração superada: as tarefas que ainda não começaram são abandonadas
+        cancelled = lambda: gen != self.generation
+        if cancelled():
+            return
+        try:
+            graph.run(
+                self._pool,
+                on_result=lambda name, value: self._results.put((gen, "result", name, value)),
+                on_error=lambda name, e: self._results.put((gen, "error", name, e)),
+                cancelled=cancelled,
+                max_workers=self.MAX_THREADS
+            )
+        finally:
+            self._results.put((gen, "done", None, None))
+
+    # --- Thread da UI ---
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                gen, kind, name, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            callbacks = self._callbacks.get(gen)
+            if callbacks is None or gen != self.generation:
+                continue  # resultado de uma geração cancelada
+
+            on_result, on_done, on_error = callbacks
+            if kind == "result":
+                on_result(name, value)
+            elif kind == "error":
+                if on_error: on_error(name, value)
+            else:
+                self._callbacks.pop(gen, None)
+                if on_done: on_done()
+
+        if self._callbacks:
+            self.widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
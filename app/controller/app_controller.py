@@ -1,29 +1,69 @@
-import os
-from scipy.io.wavfile import read
+from collections import OrderedDict
 from model.audio_analyzer import AudioAnalyzer
+from model.audio_file import AudioFile
+from model.analysis_cache import AnalysisCache
+from controller.analysis_worker import AnalysisWorker
+from controller.task_graph import TaskGraph
+from controller.playback import PlaybackTransport
 from view.components.plot_frames import DashboardFrame
 from view.services.plot_exporter import PlotExporter
 from view.windows.loading_window import LoadingWindow
 
 class AppController:
+    # Reanálises de zoom guardadas em memória (por arquivo, gráfico e janela)
+    MAX_DETAIL_CACHE = 32
+    # Intervalo de atualização do playhead (~30 fps)
+    PLAYHEAD_MS = 33
+    # Tarefas intermediárias do TaskGraph: só contam no progresso, não desenham
+    INTERNAL_TASKS = ("STFT", "Pyramid", "Analytic")
+
     def __init__(self, ui_plot_container):
-        self.analyzer = AudioAnalyzer()
+        try:
+            cache = AnalysisCache()
+        except OSError as e:
+            print(f"Cache de análises desativado: {e}")
+            cache = None
+        self.analyzer = AudioAnalyzer(cache=cache)
         self.exporter = PlotExporter()
 
         self.plot_container = ui_plot_container 
         self.active_plot_frame = None 
 
+        # Cálculos em segundo plano; resultados voltam via after()
+        self.worker = AnalysisWorker(ui_plot_container)
+        self._loading = None
+        self._tasks_total = 0
+        self._tasks_done = 0
+        # Último TaskGraph executado: graph.timings / graph.summary() para diagnóstico
+        self._graph = None
+
+        # Detalhe sob demanda do zoom: worker próprio, para não cancelar a análise geral
+        self.detail_worker = AnalysisWorker(ui_plot_container)
+        self._detail_cache = OrderedDict()
+        self._pending_details = {}
+        self._detail_flush_scheduled = False
+
+        # Reprodução do arquivo ativo. playback_listener(t, duração, tocando)
+        # é chamado a cada atualização do playhead (ex.: painel de controle)
+        self.transport = None
+        self._transport_file = None
+        self._playhead_job = None
+        self.playback_listener = None
+
         self.loaded_files = {} 
         self.active_filename = None
         self.plot_list = [] 
 
         self.zoom_mode_active = False
         self.cursor_mode_active = False
+        self.linked_zoom = False
         
         self.grid_enabled = True
         self.fi = 20
         self.fm = 20000
         self.fft_scale = 1
+        self.rms_frame = 2048
+        self.rms_hop = 1024
 
         self.active_charts = [
             "Waveform", "Spectrogram", "Pitch", "SFFT3D", 
@@ -32,23 +72,22 @@ class AppController:
 
     def load_file(self, file_path):
         """
-        Lê um arquivo WAV e retorna (fs, x_float).
-        Converte para float entre [-1, 1] se estiver em inteiro.
+        Abre um arquivo de áudio como AudioFile (PCM mapeado em memória).
+        A conversão para float [-1, 1] e o downmix mono acontecem por bloco,
+        só nos trechos que cada análise lê.
         """
         try:
-            fs, x = read(file_path)
-            if x.dtype.kind in ('i', 'u'):
-                max_val = 2 ** (8 * x.dtype.itemsize - 1)
-                x = x.astype('float32') / max_val
-            else:
-                x = x.astype('float32')
-            if len(x.shape) == 2 and x.shape[1] > 1:
-                x = (x[:, 0] + x[:, 1]) / 2.0
-
-            filename = os.path.basename(file_path)
-
-            self.loaded_files[filename] = (x, fs)
-            self.active_filename = filename
+            audio = AudioFile(file_path)
+            filename = audio.name
+            # A pirâmide da forma de onda é montada no worker (tarefa "Pyramid")
+
+            # Descarta STFTs de uma versão anterior do mesmo arquivo
+            self.analyzer.invalidate_context(filename)
+            self._invalidate_details(filename)
+            if filename == self._transport_file:
+                self.stop_playback()
+            self.loaded_files[filename] = (audio, audio.fs)
+            self._set_active_file(filename)
             print(f"Arquivo carregado: {filename}")
         except Exception as e:
             print(f"Erro ao carregar arquivo: {e}")
@@ -58,125 +97,294 @@ class AppController:
         Inicializa a visualização.
         Nota: O argumento type_name é ignorado, sempre força Dashboard.
         """
-        # Se já existe um frame, destrói para recriar limpo
-        if self.active_plot_frame:
-            self.active_plot_frame.destroy()
-        
-        # Cria e exibe SEMPRE o DashboardFrame
-        self.active_plot_frame = DashboardFrame(self.plot_container)
-        self.active_plot_frame.pack(fill="both", expand=True)
+        # O DashboardFrame é criado uma vez e reaproveitado nas chamadas
+        # seguintes (os gráficos dentro dele também ficam guardados)
+        if self.active_plot_frame is None:
+            self.active_plot_frame = DashboardFrame(self.plot_container)
+            self.active_plot_frame.pack(fill="both", expand=True)
+        self.active_plot_frame.set_linked_x(self.linked_zoom)
         
         # Desenha se já houver dados
         self._update_frames_visibility()
         self.draw_plots()
 
     def draw_plots(self):
-        """Desenha APENAS o que está na lista self.active_charts."""
+        """
+        Desenha APENAS o que está na lista self.active_charts.
+        Os cálculos rodam no AnalysisWorker, fora da thread do Tk, e cada
+        gráfico é desenhado assim que seus dados chegam. Uma nova chamada
+        (ex.: parâmetros alterados) cancela o trabalho da anterior.
+        """
         if not self.active_plot_frame: return
 
-        root = self.plot_container.winfo_toplevel()
-        loading = LoadingWindow(root, message="Processando...")
-        root.update()
-        
-        try:
-            filename_to_plot = self.active_filename
-            if not filename_to_plot and self.plot_list:
-                filename_to_plot = self.plot_list[0]['filename']
-            
-            if not filename_to_plot or filename_to_plot not in self.loaded_files:
-                self.active_plot_frame.clear()
-                self.active_plot_frame.draw()
-                return
+        filename_to_plot = self.active_filename
+        if not filename_to_plot and self.plot_list:
+            filename_to_plot = self.plot_list[0]['filename']
+
+        if not filename_to_plot or filename_to_plot not in self.loaded_files:
+            self.worker.cancel()
+            self._close_loading()
+            self.active_plot_frame.clear()
+            self.active_plot_frame.draw()
+            return
 
-            x, fs = self.loaded_files[filename_to_plot]
+        x, fs = self.loaded_files[filename_to_plot]
 
-            if "FFT" in self.active_charts:
-                self._update_fft_graph()
-            
-            # 2. Espectrograma
-            if "Spectrogram" in self.active_charts:
-                t_spec, f_spec, Sxx_db = self.analyzer.calcular_espectrograma(
-                    x, fs, fmin=self.fi, fmax=self.fm
+        # STFT compartilhada: calculada uma única vez (sob demanda) e
+        # reaproveitada por espectrograma, 3D, pitch STFT e métricas
+        ctx = self.analyzer.get_context(x, fs, file_key=filename_to_plot)
+        self.detail_worker.cancel()
+        self._pending_details = {}
+
+        # Geometria em dia para saber quais gráficos estão à vista agora
+        self.active_plot_frame.cancel_deferred()
+        self.active_plot_frame.update_idletasks()
+        self.active_plot_frame.update_visibility()
+        graph = self._build_analysis_graph(x, fs, ctx, filename_to_plot)
+
+        self._close_loading()
+        root = self.plot_container.winfo_toplevel()
+        self._loading = LoadingWindow(root, message=f"Processando... (0/{len(graph)})")
+        self._tasks_total = len(graph)
+        self._tasks_done = 0
+        self._graph = graph
+
+        self.worker.submit(
+            graph,
+            on_result=self._on_chart_ready,
+            on_done=self._on_analysis_done,
+            on_error=self._on_chart_error
+        )
+
+    def _build_analysis_graph(self, x, fs, ctx, file_key):
+        """
+        Monta o TaskGraph do Dashboard. Os gráficos independentes rodam em
+        paralelo; os derivados da STFT dependem da tarefa "STFT", que a
+        calcula uma única vez. Os parâmetros são capturados agora, para o
+        job não enxergar mudanças posteriores.
+
+        Gráficos à vista no Dashboard têm prioridade; a consulta é feita
+        quando o worker escolhe a próxima tarefa, então rolar a tela durante
+        a análise muda a ordem do que falta.
+        """
+        an = self.analyzer
+        fi, fm = self.fi, self.fm
+        charts = self.active_charts
+        graph = TaskGraph()
+        dashboard = self.active_plot_frame
+
+        def prioridade(name):
+            return lambda: 1 if name in dashboard.visible_charts else 0
+
+        # Análises que leem a STFT compartilhada (nome do gráfico, método, kwargs)
+        usam_stft = [(name, metodo, kw) for name, metodo, kw in [
+            ("Spectrogram", 'calcular_espectrograma', dict(fmin=fi, fmax=fm, ctx=ctx)),
+            ("SFFT3D", 'get_sfft_3d_data', dict(fmin=fi, fmax=fm, ctx=ctx)),
+            ("PitchSTFT", 'get_pitch_variation_stft', dict(ctx=ctx)),
+            ("Metrics", 'get_metrics', dict(fmin=fi, fmax=fm, ctx=ctx)),
+        ] if name in charts or name == "Metrics"]
+
+        def stft():
+            # Se todas já estão no cache em disco, a STFT nem é calculada
+            if all(an.em_cache(metodo, x, fs, **kw) for _, metodo, kw in usam_stft):
+                return None
+            return ctx.S_db.shape
+
+        graph.add("STFT", stft)
+        for name, metodo, kw in usam_stft:
+            graph.add(name, lambda _stft, metodo=metodo, kw=kw: getattr(an, metodo)(x, fs, **kw),
+                      deps=("STFT",), priority=prioridade(name))
+
+        # Forma de onda: a pirâmide é montada uma vez por arquivo (passe
+        # completo no arquivo, fora da UI); depois a envoltória sai na hora
+        if "Waveform" in charts:
+            def piramide():
+                if x.pyramid is None:
+                    x.pyramid = an.build_waveform_pyramid(x, fs)
+            graph.add("Pyramid", piramide)
+            graph.add("Waveform", lambda _piramide: an.get_waveform_data(x, fs),
+                      deps=("Pyramid",), priority=prioridade("Waveform"))
+        if "FFT" in charts:
+            plot_list = list(self.plot_list)
+            fft_scale = self.fft_scale
+            graph.add("FFT", lambda: self._compute_fft_data(plot_list, fi, fm, fft_scale),
+                      priority=prioridade("FFT"))
+
+        # Pitch (frequência instantânea) e Hilbert (envoltória) saem do mesmo
+        # sinal analítico: a tarefa "Analytic" faz um único passe para os dois
+        usam_analitico = [(name, metodo) for name, metodo in [
+            ("Pitch", 'get_instantaneous_frequency'),
+            ("Hilbert", 'get_hilbert_envelope'),
+        ] if name in charts]
+        if usam_analitico:
+            def analitico():
+                # Só o que ainda não está no cache em disco
+                faltam = {name for name, metodo in usam_analitico if not an.em_cache(metodo, x, fs)}
+                if not faltam:
+                    return None
+                return an.calcular_sinal_analitico(
+                    x, fs, envoltoria="Hilbert" in faltam, frequencia="Pitch" in faltam)
+
+            graph.add("Analytic", analitico)
+            for name, metodo in usam_analitico:
+                graph.add(name, lambda a, metodo=metodo: getattr(an, metodo)(x, fs, analitico=a),
+                          deps=("Analytic",), priority=prioridade(name))
+        if "RMS" in charts:
+            rms_frame, rms_hop = self.rms_frame, self.rms_hop
+            graph.add("RMS", lambda: an.get_rms_data(x, fs, frame_len=rms_frame, hop=rms_hop),
+                      priority=prioridade("RMS"))
+
+        # O provedor de envoltória do zoom precisa do sinal desta geração
+        if "Waveform" in charts:
+            self.active_plot_frame.get_frame('Waveform').set_envelope_provider(
+                lambda t0, t1, n_pixels, x=x, fs=fs:
+                    an.get_waveform_data(x, fs, t0, t1, n_pixels)
+            )
+
+        # Zoom nos demais gráficos de tempo: reanálise do trecho visível
+        rms_frame, rms_hop = self.rms_frame, self.rms_hop
+        detalhes = {
+            "Spectrogram": lambda t0, t1, n: an.get_detail_spectrogram(x, fs, t0, t1, fi, fm, n_frames=n),
+            "Pitch": lambda t0, t1, n: an.get_detail_instantaneous_frequency(x, fs, t0, t1, n_points=n),
+            "Hilbert": lambda t0, t1, n: an.get_detail_hilbert_envelope(x, fs, t0, t1, n_points=n),
+            "PitchSTFT": lambda t0, t1, n: an.get_detail_pitch_stft(x, fs, t0, t1, n_frames=n),
+            "RMS": lambda t0, t1, n: an.get_detail_rms(x, fs, t0, t1, rms_frame, rms_hop, n_points=n),
+        }
+        chave_base = (file_key, fi, fm, rms_frame, rms_hop)
+        for name, fn in detalhes.items():
+            if name in charts:
+                self.active_plot_frame.get_frame(name).set_detail_handler(
+                    lambda frame, xlim, ylim, n_pixels, name=name, fn=fn:
+                        self._request_detail(name, frame, xlim, n_pixels, fn, chave_base)
                 )
-                self.active_plot_frame.get_frame('Spectrogram').plot(t_spec, f_spec, Sxx_db)
-
-            # 1. Waveform
-            if "Waveform" in self.active_charts:
-                t_wave, y_wave = self.analyzer.get_waveform_data(x, fs)
-                self.active_plot_frame.get_frame('Waveform').plot(t_wave, y_wave)
-
-            # 3. Pitch (Via Hilbert - Verde)
-            if "Pitch" in self.active_charts:
-                t_pitch, f0_data = self.analyzer.get_instantaneous_frequency(x, fs)
-                self.active_plot_frame.get_frame('Pitch').plot(t_pitch, f0_data)
-
-            # 4. SFFT 3D (O mais pesado de todos!)
-            if "SFFT3D" in self.active_charts:
-                T, F_grid, Zxx_mag = self.analyzer.get_sfft_3d_data(x, fs, fmin=self.fi, fmax=self.fm)
-                self.active_plot_frame.get_frame('SFFT3D').plot(T, F_grid, Zxx_mag)
-
-            # 5. Hilbert (Envoltória - Vermelho)
-            if "Hilbert" in self.active_charts:
-                t_hilbert, env_hilbert = self.analyzer.get_hilbert_envelope(x, fs)
-                self.active_plot_frame.get_frame('Hilbert').plot(t_hilbert, env_hilbert)
-            
-            if "PitchSTFT" in self.active_charts:
-                t_stft, f_stft = self.analyzer.get_pitch_variation_stft(x, fs)
-                self.active_plot_frame.get_frame('PitchSTFT').plot(t_stft, f_stft)
-
-            # 6. RMS
-            if "RMS" in self.active_charts:
-                t_rms, y_rms = self.analyzer.get_rms_data(x, fs)
-                self.active_plot_frame.get_frame('RMS').plot(t_rms, y_rms)
-
-            # 7. FFT e Métricas 
-            metrics_data = self.analyzer.get_metrics(x, fs, fmin=self.fi, fmax=self.fm)
-            if hasattr(self.active_plot_frame, 'update_metrics'):
-                self.active_plot_frame.update_metrics(metrics_data)
-            
-            # Finaliza
-            if hasattr(self.active_plot_frame, 'update_all_grids'):
-                self.active_plot_frame.update_all_grids(self.grid_enabled)
-            
-            self.active_plot_frame.update_layout(self.active_charts)
-            self.active_plot_frame.draw()
-            
+        return graph
+
+    def _request_detail(self, name, frame, xlim, n_pixels, fn, chave_base):
+        """Zoom num gráfico: usa o detalhe em cache ou agenda a reanálise do trecho."""
+        chave = chave_base + (name, round(xlim[0], 6), round(xlim[1], 6), n_pixels)
+        if chave in self._detail_cache:
+            self._detail_cache.move_to_end(chave)
+            frame.show_detail(xlim, self._detail_cache[chave])
+            return
+
+        t0, t1 = max(xlim[0], 0.0), xlim[1]
+        self._pending_details[name] = (chave, frame, xlim, lambda: fn(t0, t1, n_pixels))
+        if not self._detail_flush_scheduled:
+            self._detail_flush_scheduled = True
+            self.plot_container.after_idle(self._flush_details)
+
+    def _flush_details(self):
+        """
+        Os pedidos de detalhe do mesmo tick viram um único job; um zoom novo
+        cancela o job do zoom anterior que ainda não terminou.
+        """
+        self._detail_flush_scheduled = False
+        pedidos, self._pending_details = self._pending_details, {}
+        if not pedidos: return
+
+        graph = TaskGraph()
+        for name, (_, _, _, fn) in pedidos.items():
+            graph.add(name, fn)
+
+        def on_result(name, data):
+            chave, frame, xlim, _ = pedidos[name]
+            self._detail_cache[chave] = data
+            while len(self._detail_cache) > self.MAX_DETAIL_CACHE:
+                self._detail_cache.popitem(last=False)
+            frame.show_detail(xlim, data)
+
+        self.detail_worker.submit(
+            graph, on_result,
+            on_error=lambda name, e: print(f"Erro no detalhe de {name}: {e}")
+        )
+
+    def _invalidate_details(self, file_key=None):
+        """Descarta os detalhes de zoom de um arquivo (ou todos)."""
+        self.detail_worker.cancel()
+        self._pending_details = {}
+        for chave in [k for k in self._detail_cache if file_key is None or k[0] == file_key]:
+            del self._detail_cache[chave]
+
+    def _on_chart_ready(self, name, data):
+        """
+        Recebe os dados de um gráfico (thread da UI). Gráficos fora da área
+        visível do Dashboard só são desenhados quando o usuário rola até eles.
+        """
+        if not self.active_plot_frame: return
+        if name in self.INTERNAL_TASKS:
+            self._advance_progress()
+            return
+        if name == "Metrics":
+            self._draw_chart(name, data)
+        else:
+            self.active_plot_frame.when_visible(name, lambda: self._draw_chart(name, data))
+        self._advance_progress()
+
+    def _draw_chart(self, name, data):
+        try:
+            if name == "Metrics":
+                if hasattr(self.active_plot_frame, 'update_metrics'):
+                    self.active_plot_frame.update_metrics(data)
+            elif name == "FFT":
+                self._apply_fft_data(data)
+            else:
+                frame = self.active_plot_frame.get_frame(name)
+                frame.plot(*data)
+                frame.set_grid(self.grid_enabled)
         except Exception as e:
-            print(f"Erro ao desenhar: {e}")
+            print(f"Erro ao desenhar {name}: {e}")
             import traceback
             traceback.print_exc()
-        
-        finally:
-            loading.destroy()
 
-    def _update_fft_graph(self):
-        # Verifica também aqui para evitar processamento desnecessário nos sliders
-        if not self.active_plot_frame or "FFT" not in self.active_charts: return
+    def _on_chart_error(self, name, error):
+        print(f"Erro ao calcular {name}: {error}")
+        self._advance_progress()
 
-        fft_frame = self.active_plot_frame.get_frame('FFT')
-        fft_frame.reset_axes(self.grid_enabled)
-        
-        for plot_item in self.plot_list:
+    def _on_analysis_done(self):
+        self._close_loading()
+        if hasattr(self.active_plot_frame, 'update_layout'):
+            self.active_plot_frame.update_layout(self.active_charts)
+
+    def _advance_progress(self):
+        self._tasks_done += 1
+        if self._loading is not None:
+            self._loading.set_message(f"Processando... ({self._tasks_done}/{self._tasks_total})")
+
+    def _close_loading(self):
+        if self._loading is not None:
+            self._loading.destroy()
+            self._loading = None
+
+    def _compute_fft_data(self, plot_list, fi, fm, fft_scale):
+        """FFT de cada arquivo selecionado. Seguro para rodar no worker."""
+        fft_data = []
+        for plot_item in plot_list:
             fname = plot_item['filename']
             if fname not in self.loaded_files: continue
-            
+
             x, fs = self.loaded_files[fname]
-            
-            f, mag = self.analyzer.calcular_fft_basica(
-                x, fs, fmin=self.fi, fmax=self.fm
-            )
+            f, mag = self.analyzer.calcular_fft_basica(x, fs, fmin=fi, fmax=fm)
 
-            if self.fft_scale > 1:
-                step = int(self.fft_scale)
+            if fft_scale > 1:
+                step = int(fft_scale)
                 f = f[::step]
                 mag = mag[::step]
-            
-            label_text = plot_item.get('label', fname)
-            fft_frame.add_plot(f, mag, label_text, plot_item['color'])
-        
-        self.active_plot_frame.draw()
+
+            fft_data.append({
+                'freq': f, 'mag': mag,
+                'label': plot_item.get('label', fname),
+                'color': plot_item['color']
+            })
+        return fft_data
+
+    def _apply_fft_data(self, fft_data):
+        fft_frame = self.active_plot_frame.get_frame('FFT')
+        fft_frame.reset_axes(self.grid_enabled)
+        for item in fft_data:
+            fft_frame.add_plot(item['freq'], item['mag'], item['label'], item['color'])
+        fft_frame.draw()
     
-    def update_analysis_params(self, fi=None, fm=None, fft_scale=None):
+    def update_analysis_params(self, fi=None, fm=None, fft_scale=None, rms_frame=None, rms_hop=None):
         """Chamado pelos sliders/botão aplicar"""
         changed = False
 
@@ -189,6 +397,12 @@ class AppController:
         if fft_scale is not None and fft_scale != self.fft_scale: 
             self.fft_scale = fft_scale
             changed = True
+        if rms_frame is not None and rms_frame != self.rms_frame:
+            self.rms_frame = rms_frame
+            changed = True
+        if rms_hop is not None and rms_hop != self.rms_hop:
+            self.rms_hop = rms_hop
+            changed = True
         
         # SE MUDOU PARÂMETRO 
         if changed and self.plot_list:
@@ -211,11 +425,11 @@ class AppController:
         
         # Atualiza arquivo principal
         if main_file and main_file in self.loaded_files:
-            self.active_filename = main_file
+            self._set_active_file(main_file)
         elif self.plot_list:
-            self.active_filename = self.plot_list[0]['filename']
+            self._set_active_file(self.plot_list[0]['filename'])
         else:
-            self.active_filename = None
+            self._set_active_file(None)
 
         if active_charts is not None:
             self.active_charts = active_charts
@@ -304,8 +518,21 @@ class AppController:
         self.loaded_files = {}
         self.active_filename = None
         self.plot_list = []
+        self.stop_playback()
+        self.analyzer.invalidate_context()
+        self._invalidate_details()
         self.draw_plots() # Isso vai limpar a tela pois plot_list está vazia
 
+    def shutdown(self):
+        """Encerra reprodução e análises ao fechar a janela."""
+        self.stop_playback()
+        if self._playhead_job is not None:
+            self.plot_container.after_cancel(self._playhead_job)
+            self._playhead_job = None
+        self._close_loading()
+        self.worker.shutdown()
+        self.detail_worker.shutdown()
+
     def toggle_zoom_mode(self):
         """Alterna entre modo Zoom e Normal."""
         if not self.active_plot_frame: return False
@@ -337,6 +564,88 @@ class AppController:
             
         return self.cursor_mode_active
 
+    def _set_active_file(self, filename):
+        """
+        Troca o arquivo ativo. A reprodução é sempre do arquivo ativo: se
+        outro estava tocando, o transporte é fechado e o playhead some.
+        """
+        self.active_filename = filename
+        if self._transport_file is not None and self._transport_file != filename:
+            self.stop_playback()
+
+    def get_transport(self):
+        """
+        Transporte do arquivo ativo, criado (parado) se ainda não existe:
+        o seek funciona antes do primeiro play. None sem arquivo ativo.
+        """
+        name = self.active_filename
+        if not name or name not in self.loaded_files: return None
+
+        if self.transport is None or self._transport_file != name:
+            self.stop_playback()
+            x, fs = self.loaded_files[name]
+            self.transport = PlaybackTransport(x, fs)
+            self._transport_file = name
+        return self.transport
+
+    def toggle_playback(self):
+        """Play/pause do arquivo ativo. Retorna True se está tocando."""
+        if self.get_transport() is None: return False
+
+        try:
+            playing = self.transport.toggle()
+        except Exception as e:
+            print(f"Erro na reprodução: {e}")
+            return False
+
+        if playing:
+            self._schedule_playhead()
+        else:
+            self._update_playhead()
+        return playing
+
+    def seek_playback(self, t):
+        """Pula para t (s) do arquivo ativo, tocando ou não."""
+        if self.get_transport() is None: return
+        self.transport.seek(t)
+        self._update_playhead()
+
+    def stop_playback(self):
+        if self.transport is not None:
+            self.transport.close()
+        self.transport = None
+        self._transport_file = None
+        if self.active_plot_frame and hasattr(self.active_plot_frame, 'set_playhead'):
+            self.active_plot_frame.set_playhead(None)
+        if self.playback_listener:
+            self.playback_listener(None, 0.0, False)
+
+    def _schedule_playhead(self):
+        if self._playhead_job is None:
+            self._playhead_job = self.plot_container.after(self.PLAYHEAD_MS, self._tick_playhead)
+
+    def _tick_playhead(self):
+        self._playhead_job = None
+        if self.transport is None: return
+        self._update_playhead()
+        if self.transport.playing:
+            self._schedule_playhead()
+
+    def _update_playhead(self):
+        """Posição do stream -> playhead (blit) em todos os gráficos de tempo."""
+        t = self.transport.position()
+        if self.active_plot_frame and hasattr(self.active_plot_frame, 'set_playhead'):
+            self.active_plot_frame.set_playhead(t)
+        if self.playback_listener:
+            self.playback_listener(t, self.transport.duration, self.transport.playing)
+
+    def toggle_linked_zoom(self):
+        """Liga/desliga o zoom vinculado (mesma janela de tempo em todos os gráficos)."""
+        self.linked_zoom = not self.linked_zoom
+        if self.active_plot_frame and hasattr(self.active_plot_frame, 'set_linked_x'):
+            self.active_plot_frame.set_linked_x(self.linked_zoom)
+        return self.linked_zoom
+
     def reset_zoom(self):
         """Reseta todos os gráficos."""
         if self.active_plot_frame:
@@ -353,30 +662,15 @@ class AppController:
         fft_export_data = []
         # Só processa FFT se ele estiver ativo no dashboard
         if "FFT" in self.active_charts:
-            for plot_item in self.plot_list:
-                filename = plot_item['filename']
-                if filename not in self.loaded_files: continue
-                
-                x_raw, fs_raw = self.loaded_files[filename]
-                f, mag = self.analyzer.calcular_fft_basica(
-                    x_raw, fs_raw, fmin=self.fi, fmax=self.fm
-                )
-                
-                if self.fft_scale > 1:
-                    step = int(self.fft_scale)
-                    f = f[::step]
-                    mag = mag[::step]
-                
-                fft_export_data.append({
-                    'freq': f, 'mag': mag, 
-                    'label': plot_item.get('label', filename),
-                    'color': plot_item['color']
-                })
+            fft_export_data = self._compute_fft_data(self.plot_list, self.fi, self.fm, self.fft_scale)
 
         # 2. Dados do Áudio Ativo
         active_audio_data = None
+        active_context = None
         if self.active_filename and self.active_filename in self.loaded_files:
             active_audio_data = self.loaded_files[self.active_filename]
+            x_act, fs_act = active_audio_data
+            active_context = self.analyzer.get_context(x_act, fs_act, file_key=self.active_filename)
 
         # 3. Salva passando a lista self.active_charts
         try:
@@ -386,8 +680,10 @@ class AppController:
                 plot_list=fft_export_data,
                 analyzer=self.analyzer,
                 grid_enabled=self.grid_enabled,
-                params={'fi': self.fi, 'fm': self.fm},
-                active_charts=self.active_charts  # <--- NOVA LINHA IMPORTANTE
+                params={'fi': self.fi, 'fm': self.fm,
+                        'rms_frame': self.rms_frame, 'rms_hop': self.rms_hop},
+                active_charts=self.active_charts,  # <--- NOVA LINHA IMPORTANTE
+                context=active_context
             )
         except Exception as e:
             print(f"Erro na exportação: {e}")
@@ -0,0 +1,102 @@
+import threading
+import numpy as np
+import sounddevice as sd
+
+class PlaybackTransport:
+    """
+    Reprodução (play/pause/seek) do arquivo ativo via sd.OutputStream.
+    O callback de áudio lê o AudioFile em blocos, sem carregar tudo.
+    A posição vem do relógio do stream (momento em que cada bloco chega
+    ao DAC), então o playhead acompanha o som, não o buffer.
+    """
+    BLOCK_SIZE = 2048
+
+    def __init__(self, x, fs):
+        self.x = x
+        self.fs = fs
+        self.n_samples = len(x)
+        self.stream = None
+        self.playing = False
+
+        self._lock = threading.Lock()
+        self._pos = 0          # próxima amostra a entregar ao stream
+        self._ref = None       # (horário no DAC, amostra) do último bloco
+
+    @property
+    def duration(self):
+        return self.n_samples / self.fs
+
+    def _callback(self, outdata, frames, time_info, status):
+        with self._lock:
+            start = self._pos
+            chunk = np.asarray(self.x[start:start + frames], dtype='float32')
+            self._pos = start + len(chunk)
+            self._ref = (time_info.outputBufferDacTime, start)
+
+        n = len(chunk)
+        outdata[:n, 0] = chunk
+        outdata[n:] = 0
+        if n < frames:
+            raise sd.CallbackStop
+
+    def _on_finished(self):
+        self.playing = False
+
+    def play(self):
+        if self.playing: return
+        if self._pos >= self.n_samples:
+            self.seek(0.0)
+        if self.stream is not None:
+            # Stream que terminou sozinho (CallbackStop): ainda precisa ser fechado
+            self.stream.close()
+            self.stream = None
+        self.stream = sd.OutputStream(
+            samplerate=self.fs, channels=1, dtype='float32',
+            blocksize=self.BLOCK_SIZE, callback=self._callback,
+            finished_callback=self._on_finished
+        )
+        self.playing = True
+        self.stream.start()
+
+    def pause(self):
+        if self.stream is not None:
+            # A posição tocada (não a bufferizada) vira o ponto de retomada
+            pos = self.position()
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+            self.seek(pos)
+        self.playing = False
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+        return self.playing
+
+    def seek(self, t):
+        with self._lock:
+            self._pos = int(np.clip(t * self.fs, 0, self.n_samples))
+            self._ref = None
+
+    def position(self):
+        """Posição audível atual (s)."""
+        with self._lock:
+            pos, ref = self._pos, self._ref
+        stream = self.stream
+        if ref is None or stream is None:
+            return pos / self.fs
+
+        dac_time, amostra = ref
+        # Amostras já tocadas desde que o último bloco chegou ao DAC
+        decorrido = (stream.time - dac_time) * self.fs
+        # Nunca além do que já foi entregue ao stream
+        return float(np.clip(amostra + decorrido, 0, pos)) / self.fs
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        self.playing = False
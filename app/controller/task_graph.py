@@ -0,0 +1,147 @@
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+
+class TaskGraph:
+    """
+    Grafo de tarefas com dependências, executado num pool de threads.
+
+    Cada tarefa recebe como argumentos os resultados das suas dependências,
+    então um intermediário compartilhado (ex.: a STFT) é calculado uma vez
+    e as tarefas independentes rodam em paralelo (NumPy/SciPy liberam o GIL).
+    Guarda o tempo de parede de cada tarefa para achar o caminho crítico.
+
+    Prioridade: entre as tarefas prontas, as de maior prioridade são
+    iniciadas primeiro. Uma dependência herda a maior prioridade de quem
+    espera por ela (a STFT de um gráfico visível é urgente).
+    """
+    def __init__(self):
+        self._tasks = {}  # nome -> (função, dependências)
+        self._priorities = {}  # nome -> número ou função sem argumentos
+        self.timings = {}  # nome -> (início, fim) em s desde o começo de run()
+        self.errors = {}
+
+    def add(self, name, fn, deps=(), priority=0):
+        """
+        priority: número (maior = antes) ou função consultada no momento de
+        escolher a próxima tarefa, para acompanhar mudanças durante o job.
+        """
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ValueError(f"Dependência desconhecida: {dep}")
+        self._tasks[name] = (fn, tuple(deps))
+        self._priorities[name] = priority
+        return name
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, name):
+        return name in self._tasks
+
+    def _prioridades(self, pendentes):
+        """Prioridade efetiva das tarefas pendentes (herdada pelas dependências)."""
+        efetiva = {}
+        for name in pendentes:
+            p = self._priorities.get(name, 0)
+            efetiva[name] = p() if callable(p) else p
+        # Poucas tarefas: propaga até estabilizar
+        mudou = True
+        while mudou:
+            mudou = False
+            for name in pendentes:
+                for dep in self._tasks[name][1]:
+                    if dep in efetiva and efetiva[dep] < efetiva[name]:
+                        efetiva[dep] = efetiva[name]
+                        mudou = True
+        return efetiva
+
+    def run(self, executor, on_result=None, on_error=None, cancelled=None, max_workers=None):
+        """
+        Executa o grafo no executor. on_result(nome, valor) e
+        on_error(nome, exc) são chamados na thread coordenadora, na ordem
+        em que as tarefas terminam. Se uma tarefa falha, as que dependem
+        dela não rodam (e recebem o mesmo erro).
+        cancelled(): quando verdadeiro, nenhuma tarefa nova é iniciada.
+        max_workers: no máximo esse número de tarefas no executor ao mesmo
+        tempo; as demais esperam aqui e são escolhidas por prioridade
+        (sem limite, a fila do executor seria FIFO).
+        Retorna o dict nome -> resultado das tarefas concluídas.
+        """
+        inicio = time.perf_counter()
+        results = {}
+        pendentes = dict(self._tasks)
+        rodando = {}
+        self.timings = {}
+        self.errors = {}
+
+        def executa(name, fn, args):
+            t0 = time.perf_counter() - inicio
+            try:
+                return fn(*args)
+            finally:
+                self.timings[name] = (t0, time.perf_counter() - inicio)
+
+        while pendentes or rodando:
+            if cancelled is not None and cancelled():
+                return results
+
+            # Propaga falhas para quem depende delas
+            for name, (fn, deps) in list(pendentes.items()):
+                falha = next((d for d in deps if d in self.errors), None)
+                if falha is not None:
+                    del pendentes[name]
+                    self.errors[name] = self.errors[falha]
+                    if on_error: on_error(name, self.errors[falha])
+
+            # Inicia as que já têm as dependências prontas, mais prioritárias primeiro
+            prontas = [name for name, (fn, deps) in pendentes.items()
+                       if all(d in results for d in deps)]
+            if prontas:
+                prioridade = self._prioridades(pendentes)
+                prontas.sort(key=lambda n: -prioridade[n])
+                vagas = len(prontas) if max_workers is None else max(0, max_workers - len(rodando))
+                for name in prontas[:vagas]:
+                    fn, deps = pendentes.pop(name)
+                    args = [results[d] for d in deps]
+                    rodando[executor.submit(executa, name, fn, args)] = name
+
+            if not rodando:
+                break
+
+            prontos, _ = wait(rodando, return_when=FIRST_COMPLETED)
+            for fut in prontos:
+                name = rodando.pop(fut)
+                try:
+                    results[name] = fut.result()
+                except Exception as e:
+                    self.errors[name] = e
+                    if on_error: on_error(name, e)
+                    continue
+                if on_result: on_result(name, results[name])
+        return results
+
+    def critical_path(self):
+        """
+        Sequência de tarefas que determinou o tempo total: parte da que
+        terminou por último e volta pela dependência que terminou mais tarde.
+        """
+        if not self.timings:
+            return []
+        atual = max(self.timings, key=lambda n: self.timings[n][1])
+        caminho = [atual]
+        while True:
+            deps = [d for d in self._tasks[atual][1] if d in self.timings]
+            if not deps:
+                break
+            atual = max(deps, key=lambda n: self.timings[n][1])
+            caminho.append(atual)
+        return caminho[::-1]
+
+    def summary(self):
+        """Texto com o tempo de parede de cada tarefa e o caminho crítico."""
+        linhas = []
+        for name, (t0, t1) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            linhas.append(f"  {name:<12} {t0:7.3f} -> {t1:7.3f} s  ({(t1 - t0) * 1000:8.1f} ms)")
+        total = max((t1 for _, t1 in self.timings.values()), default=0.0)
+        linhas.append(f"  Total: {total:.3f} s | Caminho crítico: {' -> '.join(self.critical_path())}")
+        return "\n".join(linhas)
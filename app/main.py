@@ -51,6 +51,8 @@ class App(ctk.CTk):
 
     def on_closing(self):
         """Limpa recursos antes de fechar para evitar erros no terminal.""" 
+        # Para a reprodução e as análises em segundo plano (threads do pool)
+        self.frames["AnalysisScreen"].logic_controller.shutdown()
         plt.close('all')
         self.quit()
         self.destroy()
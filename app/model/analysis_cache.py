@@ -0,0 +1,199 @@
+import os
+import json
+import hashlib
+import inspect
+import tempfile
+import functools
+import numpy as np
+
+# Mude quando o cálculo de alguma análise mudar, para invalidar o cache antigo
+CACHE_VERSION = 4
+
+def hash_conteudo(x, fs):
+    """
+    Hash rápido do conteúdo PCM. AudioFile calcula (e guarda) o seu próprio;
+    arrays são lidos em blocos, sem cópia.
+    """
+    if hasattr(x, 'content_hash'):
+        return x.content_hash()
+
+    h = hashlib.blake2b(digest_size=16)
+    arr = np.ascontiguousarray(x)
+    h.update(f"{float(fs)}:{arr.dtype.str}:{arr.shape}".encode())
+    plano = arr.reshape(-1)
+    passo = 1 << 22
+    for start in range(0, len(plano), passo):
+        h.update(memoryview(plano[start:start + passo]))
+    return h.hexdigest()
+
+def _normaliza(valor):
+    """
+    Parâmetros numéricos viram float antes do hash, para que fmin=20 e
+    fmin=20.0 (ou np.int64(20)) caiam na mesma entrada. bool fica como está.
+    """
+    if isinstance(valor, (bool, np.bool_)):
+        return bool(valor)
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return float(valor)
+    if isinstance(valor, dict):
+        return {k: _normaliza(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normaliza(v) for v in valor]
+    return valor
+
+class AnalysisCache:
+    """
+    Cache em disco de resultados de análise, em arquivos .npz compactados.
+    A chave é o hash do conteúdo do áudio + o tipo de análise + parâmetros.
+    O tamanho total é limitado; os arquivos menos usados recentemente
+    (mtime, atualizado a cada acerto) são removidos primeiro.
+    """
+    DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".sound_analyzer", "cache")
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or self.DEFAULT_DIR
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, kind, content_hash, params):
+        texto = json.dumps([CACHE_VERSION, kind, content_hash, _normaliza(params)], sort_keys=True, default=str)
+        return f"{kind}_{hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    def get(self, key):
+        """Retorna o dict de arrays guardado ou None. Acerto renova a posição LRU."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            os.utime(path)
+            return arrays
+        except (OSError, ValueError):
+            return None
+
+    def contains(self, key):
+        """Consulta barata (sem ler o arquivo) se a chave está no cache."""
+        return os.path.exists(self._path(key))
+
+    def put(self, key, arrays):
+        """
+        Grava de forma atômica (arquivo temporário + rename) e aplica o limite.
+        Entradas maiores que o próprio limite não são gravadas: seriam
+        compactadas só para serem removidas (levando as outras junto).
+        """
+        if sum(np.asarray(v).nbytes for v in arrays.values()) > self.max_bytes:
+            return
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            if os.path.getsize(tmp) > self.max_bytes:
+                os.remove(tmp)
+                return
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"Aviso (cache): não foi possível gravar {key}: {e}")
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._evict()
+
+    def _evict(self):
+        entradas = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"): continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entradas.append((st.st_mtime, st.st_size, name))
+
+        total = sum(size for _, size, _ in entradas)
+        for _, size, name in sorted(entradas):
+            if total <= self.max_bytes: break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+def _encode(result):
+    """Tupla de arrays ou dict de escalares -> dict de arrays para o .npz."""
+    if isinstance(result, dict):
+        return {f"d_{k}": np.asarray(v) for k, v in result.items()}
+    return {f"t_{i}": np.asarray(v) for i, v in enumerate(result)}
+
+def _decode(arrays):
+    if any(k.startswith("d_") for k in arrays):
+        return {k[2:]: v.item() for k, v in arrays.items()}
+    return tuple(arrays[f"t_{i}"] for i in range(len(arrays)))
+
+def _grande_demais(result, arrays, max_bytes):
+    """
+    Resultados em memmap (já grandes demais para a RAM) ou acima de
+    max_bytes não vão para o cache: compactá-los custa caro e um acerto
+    carregaria tudo na memória de uma vez.
+    """
+    valores = result.values() if isinstance(result, dict) else result
+    if any(isinstance(v, np.memmap) for v in valores):
+        return True
+    return max_bytes is not None and sum(v.nbytes for v in arrays.values()) > max_bytes
+
+def cacheable(kind, max_bytes=None):
+    """
+    Decora um método (self, x, fs, ...) do AudioAnalyzer para consultar
+    self.cache antes de calcular. 'ctx' não entra na chave, apenas os
+    parâmetros da STFT que ele representa; 'analitico' (resultado
+    intermediário já calculado) também não. max_bytes limita o tamanho
+    do resultado que vale a pena guardar.
+    """
+    def decorator(fn):
+        assinatura = inspect.signature(fn)
+
+        def chave(self, cache, x, fs, args, kwargs):
+            bound = assinatura.bind(self, x, fs, *args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k not in ('self', 'x', 'ctx', 'analitico')}
+            if 'ctx' in bound.arguments:
+                ctx = bound.arguments['ctx']
+                params['stft'] = ([ctx.janela, ctx.nperseg, ctx.noverlap]
+                                  if ctx is not None else ['hann', 2048, 1024])
+            return cache.make_key(kind, hash_conteudo(x, fs), params)
+
+        @functools.wraps(fn)
+        def wrapper(self, x, fs, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return fn(self, x, fs, *args, **kwargs)
+
+            key = chave(self, cache, x, fs, args, kwargs)
+            hit = cache.get(key)
+            if hit is not None:
+                return _decode(hit)
+
+            result = fn(self, x, fs, *args, **kwargs)
+            arrays = _encode(result)
+            if not _grande_demais(result, arrays, max_bytes):
+                cache.put(key, arrays)
+            return result
+
+        def em_cache(self, x, fs, *args, **kwargs):
+            """True se esta chamada seria respondida pelo cache (sem calcular)."""
+            cache = getattr(self, 'cache', None)
+            return cache is not None and cache.contains(chave(self, cache, x, fs, args, kwargs))
+
+        wrapper.em_cache = em_cache
+        return wrapper
+    return decorator
@@ -0,0 +1,164 @@
+import tempfile
+import threading
+import numpy as np
+from scipy.signal import get_window
+from model.spectral_peak import pico_espectral
+from model.stft_stream import espectrograma_db, stft_frames_info
+
+class AnalysisContext:
+    """
+    Guarda a STFT de um sinal, calculada UMA única vez para a combinação
+    (arquivo, janela, nperseg, noverlap).
+    A STFT é feita em streaming (bloco a bloco) e só a magnitude em dB é
+    guardada, num buffer float32 (ou float16) pré-alocado. Acima de
+    MEMMAP_BYTES o buffer é um arquivo temporário mapeado (np.memmap): uma
+    gravação de horas não precisa caber na RAM.
+    Espectrograma, superfície 3D, pitch via STFT e métricas derivam dela.
+
+    Os frames seguem stft(..., boundary=None): o fim do sinal é completado
+    com zeros num último frame parcial. Só o espectrograma o descarta, como
+    spectrogram() faz.
+    """
+    # Colunas processadas por vez nas reduções sobre o buffer
+    COLUNAS_POR_BLOCO = 4096
+    # Matrizes (frequência x frames) maiores que isto vão para disco
+    MEMMAP_BYTES = 256 * 1024 * 1024
+    # Pasta dos arquivos temporários (None = a do sistema)
+    MEMMAP_DIR = None
+
+    def __init__(self, x, fs, janela='hann', nperseg=2048, noverlap=1024, dtype='float32'):
+        self.x = x
+        self.fs = fs
+        self.janela = janela
+        self.nperseg = nperseg
+        self.noverlap = noverlap
+        self.dtype = dtype
+
+        self._f = None
+        self._t = None
+        self._S_db = None
+        # O contexto é compartilhado entre a UI e a thread de análise
+        self._lock = threading.Lock()
+
+    def _calcular(self):
+        """Executa a STFT (só na primeira vez que algum dado é pedido)."""
+        with self._lock:
+            if self._S_db is not None:
+                return
+            win = get_window(self.janela, self.nperseg)
+            # Offset (dB) que converte a escala 'spectrum' da STFT em PSD (V²/Hz)
+            self._psd_offset = 10 * np.log10((win.sum() ** 2) / (self.fs * (win ** 2).sum()))
+            n_frames, _, f = stft_frames_info(len(self.x), self.fs, self.nperseg, self.noverlap, padded=True)
+            # Frames sem zeros de preenchimento (os do espectrograma)
+            self._n_completos = stft_frames_info(len(self.x), self.fs, self.nperseg, self.noverlap)[0]
+            t, f, S_db = espectrograma_db(
+                self.x, self.fs, self.janela, self.nperseg, self.noverlap,
+                out=self._alocar((len(f), n_frames), self.dtype), padded=True
+            )
+            self._t, self._f = t, f
+            self._S_db = S_db
+
+    def _alocar(self, shape, dtype):
+        """Buffer em RAM, ou em arquivo temporário mapeado se for grande."""
+        n_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if n_bytes < self.MEMMAP_BYTES:
+            return np.empty(shape, dtype=dtype)
+        # Sem nome no disco: o arquivo some quando o memmap é descartado
+        arquivo = tempfile.TemporaryFile(prefix="stft_", dir=self.MEMMAP_DIR)
+        return np.memmap(arquivo, dtype=dtype, mode='w+', shape=shape)
+
+    def _blocos_colunas(self, n=None):
+        if n is None:
+            n = self.S_db.shape[1]
+        for c0 in range(0, n, self.COLUNAS_POR_BLOCO):
+            yield c0, min(c0 + self.COLUNAS_POR_BLOCO, n)
+
+    @property
+    def f(self):
+        if self._f is None: self._calcular()
+        return self._f
+
+    @property
+    def t(self):
+        if self._t is None: self._calcular()
+        return self._t
+
+    @property
+    def S_db(self):
+        """Magnitude |Zxx| em dB (frequência x tempo), calculada uma vez."""
+        if self._S_db is None: self._calcular()
+        return self._S_db
+
+    def _mascara(self, fmin=None, fmax=None):
+        """
+        Linhas da faixa [fmin, fmax] como slice (f é crescente), para que
+        S_db[mask] seja uma view e não uma cópia da matriz.
+        """
+        f = self.f
+        if fmin is None and fmax is None:
+            return slice(None)
+        i0 = np.searchsorted(f, fmin if fmin else f[0], side='left')
+        i1 = np.searchsorted(f, fmax if fmax else f[-1], side='right')
+        return slice(int(i0), int(i1))
+
+    def psd_db(self, fmin=None, fmax=None):
+        """
+        Espectrograma de potência em dB, na escala de
+        spectrogram(..., mode='psd'). Retorna (t, f, Sxx_db).
+        """
+        mask = self._mascara(fmin, fmax)
+        S_db = self.S_db
+        f = self.f[mask]
+        n = self._n_completos
+
+        # Espectro unilateral: dobra tudo exceto DC (e Nyquist se nperseg for par)
+        dobra = np.full(len(self.f), 10 * np.log10(2), dtype='float32')
+        dobra[0] = 0
+        if self.nperseg % 2 == 0:
+            dobra[-1] = 0
+        dobra = dobra[mask].reshape(-1, 1)
+
+        # Por blocos de colunas, direto no buffer de saída (memmap se for grande)
+        Sxx_db = self._alocar((len(f), n), np.result_type(S_db.dtype, np.float32))
+        for c0, c1 in self._blocos_colunas(n):
+            bloco = Sxx_db[:, c0:c1]
+            np.add(S_db[mask, c0:c1], np.float32(self._psd_offset), out=bloco)
+            bloco += dobra
+            # Mesmo piso de antes: 10*log10(Sxx + 1e-10)
+            np.maximum(bloco, -100, out=bloco)
+        return self.t[:n], f, Sxx_db
+
+    def mag_db(self, fmin=None, fmax=None):
+        """Magnitude da STFT em dB. Retorna (t, f, Zxx_mag)."""
+        mask = self._mascara(fmin, fmax)
+        return self.t, self.f[mask], self.S_db[mask]
+
+    def frequencia_dominante(self, fmin=None, fmax=None):
+        """
+        Frequência de maior magnitude em cada frame, com interpolação
+        sub-bin. Retorna (t, f_dom) com os mesmos frames da STFT.
+        """
+        S_db = self.S_db
+        if S_db.shape[1] <= self.COLUNAS_POR_BLOCO:
+            return self.t, pico_espectral(S_db, self.f, fmin, fmax, em_db=True)
+        f_dom = np.concatenate([
+            pico_espectral(S_db[:, c0:c1], self.f, fmin, fmax, em_db=True)
+            for c0, c1 in self._blocos_colunas()
+        ])
+        return self.t, f_dom
+
+    def centroide(self, fmin=None, fmax=None):
+        """Centróide espectral médio (Hz) dentro da faixa."""
+        mask = self._mascara(fmin, fmax)
+        f = self.f[mask].reshape(-1, 1)
+        S_db = self.S_db
+
+        soma, soma_f = 0.0, 0.0
+        for c0, c1 in self._blocos_colunas():
+            mag = 10 ** (S_db[mask, c0:c1].astype('float32') / 20)
+            soma += float(mag.sum())
+            soma_f += float((f * mag).sum())
+
+        if soma <= 0:
+            return 0.0
+        return soma_f / soma
@@ -1,11 +1,59 @@
 import numpy as np
 from numpy.fft import rfft, rfftfreq
-from scipy.signal import stft, spectrogram, get_window, hilbert
+from collections import OrderedDict
+from model.analysis_context import AnalysisContext
+from model.audio_file import iter_blocks
+from model.waveform_pyramid import WaveformPyramid
+from model.rms_engine import rms_deslizante
+from model.hilbert_blocks import envoltoria_hilbert, frequencia_instantanea, envoltoria_e_frequencia, N_TAPS
+from model.analysis_cache import cacheable
+from model.spectrogram_raster import reduzir_grade
 
 class AudioAnalyzer:
     """
     Responsável por todos os cálculos de análise de áudio.
     """
+    # Quantos contextos de STFT (arquivo + parâmetros) ficam em memória
+    MAX_CONTEXTS = 2
+
+    def __init__(self, cache=None):
+        self._contexts = OrderedDict()
+        # AnalysisCache opcional: resultados persistidos em disco entre sessões
+        self.cache = cache
+
+    def get_context(self, x, fs, file_key=None, janela='hann', nperseg=2048, noverlap=1024):
+        """
+        Retorna o AnalysisContext do sinal, reaproveitando o já existente
+        para a mesma chave (arquivo, janela, nperseg, noverlap).
+        Sem file_key o contexto não é guardado.
+        """
+        if file_key is None:
+            return AnalysisContext(x, fs, janela, nperseg, noverlap)
+
+        key = (file_key, janela, nperseg, noverlap)
+        ctx = self._contexts.get(key)
+        if ctx is None:
+            ctx = AnalysisContext(x, fs, janela, nperseg, noverlap)
+            self._contexts[key] = ctx
+            while len(self._contexts) > self.MAX_CONTEXTS:
+                self._contexts.popitem(last=False)
+        else:
+            self._contexts.move_to_end(key)
+        return ctx
+
+    def invalidate_context(self, file_key=None):
+        """Descarta os contextos de um arquivo (ou todos, se file_key=None)."""
+        if file_key is None:
+            self._contexts.clear()
+            return
+        for key in [k for k in self._contexts if k[0] == file_key]:
+            del self._contexts[key]
+
+    def em_cache(self, metodo, x, fs, **kwargs):
+        """True se self.<metodo>(x, fs, **kwargs) já está no cache em disco."""
+        fn = getattr(type(self), metodo)
+        return hasattr(fn, 'em_cache') and fn.em_cache(self, x, fs, **kwargs)
+
     def calcular_fft_basica(self, x, fs, fmin=None, fmax=None):
         """
         Calcula FFT de magnitude unilateral (rfft).
@@ -23,125 +71,86 @@ class AudioAnalyzer:
             Xmag = Xmag[mask]
         return f, Xmag
 
-    def calcular_stft(self, x, fs, janela='hann', nperseg=2048, noverlap=1024, fmin=None, fmax=None):
+    @cacheable('sfft3d')
+    def get_sfft_3d_data(self, x, fs, fmin=20, fmax=20000, ctx=None, n_t=200, n_f=200):
         """
-        Calcula STFT usando scipy.signal.stft.
-        Retorna (t, f, Zxx) onde Zxx é complexo (tempo x frequência).
-        Permite limitar a faixa de frequências com fmin e fmax.
+        Prepara os dados para o plot de superfície 3D, já reduzidos a uma
+        grade de no máximo n_f x n_t pontos (máximo de cada bloco), sem
+        meshgrid do tamanho da STFT.
+        Retorna (t, f, Z) com t e f 1-D e Z (len(f) x len(t)) em dB.
         """
-        win = get_window(janela, nperseg)
-        # boundary=None é importante para bater com o código do cliente
-        f, t, Zxx = stft(x, fs=fs, window=win, nperseg=nperseg, noverlap=noverlap, boundary=None)
+        # 1. STFT (compartilhada) convertida para dB (Magnitude)
+        if ctx is None:
+            ctx = self.get_context(x, fs)
+        t, f, Zxx_mag = ctx.mag_db(fmin, fmax)
         
-        if fmin is not None or fmax is not None:
-            mask = (f >= (fmin if fmin else f[0])) & (f <= (fmax if fmax else f[-1]))
-            f = f[mask]
-            Zxx = Zxx[mask, :]
-        return t, f, Zxx
-
-    def get_sfft_3d_data(self, x, fs, fmin=20, fmax=20000):
-        """
-        Prepara os dados (X, Y, Z) para o plot de superfície 3D.
-        """
-        # 1. Calcula STFT
-        t, f, Zxx = self.calcular_stft(x, fs, fmin=fmin, fmax=fmax)
-        
-        # 2. Converte para dB (Magnitude)
-        Zxx_mag = 20 * np.log10(np.abs(Zxx) + 1e-10)
-        
-        # 3. Cria a grade (Meshgrid) necessária para superfícies 3D
-        T, Fgrid = np.meshgrid(t, f)
-        
-        return T, Fgrid, Zxx_mag
+        # 2. Max-pooling em blocos direto sobre a view da STFT
+        return reduzir_grade(t, f, Zxx_mag, n_t, n_f)
     
-    def calcular_espectrograma(self, x, fs, fmin=None, fmax=None):
+    # Só espectrogramas pequenos: a matriz de PSD inteira de um arquivo longo
+    # custa mais para compactar e recarregar do que para recalcular
+    @cacheable('spectrogram', max_bytes=32 * 1024 * 1024)
+    def calcular_espectrograma(self, x, fs, fmin=None, fmax=None, ctx=None):
         """
-        Calcula espectrograma (potência) usando scipy.signal.spectrogram.
-        Retorna (t, f, Sxx).
+        Calcula espectrograma (potência, mesma escala de scipy.signal.spectrogram)
+        a partir da STFT compartilhada (hann, 2048, 1024).
+        Retorna (t, f, Sxx_db), já convertido para dB para facilitar o plot.
         Permite limitar a faixa de frequências com fmin e fmax.
         """
-        janela = 'hann'
-        nperseg = 2048
-        noverlap = 1024
-        
-        win = get_window(janela, nperseg)
-        f, t, Sxx = spectrogram(x, fs=fs, window=win, nperseg=nperseg, noverlap=noverlap, mode='psd')
-        
-        if fmin is not None or fmax is not None:
-            mask = (f >= (fmin if fmin else f[0])) & (f <= (fmax if fmax else f[-1]))
-            f = f[mask]
-            Sxx = Sxx[mask, :]
-            
-        # Converte para dB aqui para facilitar o plot
-        Sxx_db = 10 * np.log10(Sxx + 1e-10)
-        return t, f, Sxx_db
+        if ctx is None:
+            ctx = self.get_context(x, fs)
+        return ctx.psd_db(fmin, fmax)
 
-    def estimar_fundamental_por_pico_espectral(self, Zxx, f, faixa):
+    def build_waveform_pyramid(self, x, fs):
         """
-        Estima a frequência fundamental em cada frame de STFT procurando o pico dominante
-        dentro de uma faixa plausível.
+        Monta a pirâmide da forma de onda (uma vez por arquivo): min/max para
+        a envoltória de get_waveform_data e média quadrática para rms().
         """
-        mag = np.abs(Zxx)
-        fmin, fmax = faixa
-        idx_validos = np.where((f >= fmin) & (f <= fmax))[0]
-        f0 = np.zeros(mag.shape[1], dtype='float32')
-        
-        if len(idx_validos) == 0:
-            return f0
-
-        for k in range(mag.shape[1]):
-            col = mag[idx_validos, k]
-            if col.size == 0:
-                f0[k] = 0.0
-                continue
-            ipeak = np.argmax(col)
-            f0[k] = f[idx_validos[ipeak]]
-        return f0
-    
-    def get_waveform_data(self, x, fs):
-        """Retorna tempo e amplitude reduzidos para plotagem rápida."""
-        target_points = 8000
-        if len(x) > target_points:
-            step = len(x) // target_points
-            y_reduced = x[::step]
-            times = np.linspace(0, len(x) / fs, num=len(y_reduced))
-            return times, y_reduced
-        
-        times = np.linspace(0, len(x) / fs, num=len(x))
-        return times, x
+        return WaveformPyramid(x, fs)
+
+    def get_waveform_data(self, x, fs, t0=None, t1=None, n_pixels=2000):
+        """
+        Retorna tempo e amplitude para plotagem: envoltória min/max do trecho
+        [t0, t1] com no máximo ~n_pixels colunas (amostras reais no zoom).
+        Usa a pirâmide guardada no AudioFile, se houver.
+        """
+        pyramid = getattr(x, 'pyramid', None)
+        if pyramid is None:
+            pyramid = self.build_waveform_pyramid(x, fs)
+        return pyramid.envelope(t0, t1, n_pixels)
     
-    def get_rms_data(self, x, fs):
-        # Implementação simples de RMS deslizante (Numpy puro)
-        frame_len = 2048
-        hop = 1024
-        x_sq = x**2
-        window = np.ones(frame_len) / frame_len
-        rms = np.sqrt(np.convolve(x_sq, window, mode='valid')[::hop])
-        t = np.linspace(0, len(x)/fs, len(rms))
-        return t, rms
+    @cacheable('rms')
+    def get_rms_data(self, x, fs, frame_len=2048, hop=1024):
+        """
+        RMS deslizante calculado só nas posições de hop (somas cumulativas,
+        em blocos). Retorna (t, rms) com t no centro de cada janela.
+        """
+        return rms_deslizante(x, fs, frame_len, hop)
     
-    def get_metrics(self, x, fs, fmin=20, fmax=20000):
-        # 1. Calcula STFT básica para métricas
-        t, f, Zxx = self.calcular_stft(x, fs, fmin=fmin, fmax=fmax)
+    @cacheable('metrics')
+    def get_metrics(self, x, fs, fmin=20, fmax=20000, ctx=None):
+        # 1. STFT compartilhada para métricas
+        if ctx is None:
+            ctx = self.get_context(x, fs)
         
-        # 2. Estima F0 usando a função do cliente
-        f0_series = self.estimar_fundamental_por_pico_espectral(Zxx, f, faixa=(fmin, fmax))
+        # 2. Estima F0 pelo pico espectral na faixa
+        _, f0_series = ctx.frequencia_dominante(fmin, fmax)
         # Remove zeros para média
         valid_f0 = f0_series[f0_series > 0]
         avg_f0 = np.mean(valid_f0) if len(valid_f0) > 0 else 0.0
 
-        # 3. Métricas globais (Crest Factor)
-        peak = np.max(np.abs(x))
-        rms = np.sqrt(np.mean(x**2))
+        # 3. Métricas globais (Crest Factor), acumuladas por bloco
+        peak = 0.0
+        soma_quad = 0.0
+        for _, bloco in iter_blocks(x):
+            if bloco.size:
+                peak = max(peak, float(np.max(np.abs(bloco))))
+                soma_quad += float(np.dot(bloco, bloco))
+        rms = np.sqrt(soma_quad / max(len(x), 1))
         crest = peak / (rms + 1e-9)
 
         # 4. Centróide (Simplificado na faixa)
-        mag = np.abs(Zxx)
-        if mag.sum() > 0:
-            freqs_matrix = np.tile(f.reshape(-1, 1), (1, mag.shape[1]))
-            centroid = np.sum(freqs_matrix * mag) / np.sum(mag)
-        else:
-            centroid = 0.0
+        centroid = ctx.centroide(fmin, fmax)
 
         return {
             "sr": fs,
@@ -152,71 +161,118 @@ class AudioAnalyzer:
             "f0": avg_f0
         }
     
-    def get_pitch_data(self, x, fs, fmin=20, fmax=20000):
+    @cacheable('pitch')
+    def get_pitch_data(self, x, fs, fmin=20, fmax=20000, ctx=None):
         """
         Retorna (tempo, f0_series) para plotagem.
         """
-        # 1. Reutiliza a STFT otimizada
-        t, f, Zxx = self.calcular_stft(x, fs, fmin=fmin, fmax=fmax)
-        
-        # 2. Estima a fundamental (Lógica do cliente)
-        f0_series = self.estimar_fundamental_por_pico_espectral(Zxx, f, faixa=(fmin, fmax))
-        
-        return t, f0_series
+        # Reutiliza a STFT compartilhada e estima a fundamental na faixa
+        if ctx is None:
+            ctx = self.get_context(x, fs)
+        return ctx.frequencia_dominante(fmin, fmax)
+
+    def calcular_sinal_analitico(self, x, fs, n_points=8000, envoltoria=True, frequencia=True):
+        """
+        Um único passe de Hilbert para os gráficos que dependem dele.
+        Retorna ((t, envoltória), (t, frequência instantânea)), None no que
+        não foi pedido, para ser passado como 'analitico' a
+        get_hilbert_envelope e get_instantaneous_frequency.
+        """
+        return envoltoria_e_frequencia(x, fs, n_points, envoltoria, frequencia)
 
-    def get_hilbert_envelope(self, x, fs):
+    @cacheable('envelope')
+    def get_hilbert_envelope(self, x, fs, n_points=8000, analitico=None):
         """
         Calcula a Envoltória (Lógica para o Gráfico Vermelho).
+        Hilbert em blocos na taxa original; a redução para ~n_points
+        pontos de tela acontece só depois.
         """
-        # Downsampling para não travar a interface (opcional, mas recomendado)
-        target_points = 8000
-        if len(x) > target_points:
-            step = len(x) // target_points
-            x_reduced = x[::step]
-            t_reduced = np.linspace(0, len(x)/fs, len(x_reduced))
-        else:
-            x_reduced = x
-            t_reduced = np.linspace(0, len(x)/fs, len(x))
-            
-        sinal_analitico = hilbert(x_reduced)
-        envoltoria = np.abs(sinal_analitico)
-        return t_reduced, envoltoria
+        if analitico is not None and analitico[0] is not None:
+            return analitico[0]
+        return envoltoria_hilbert(x, fs, n_points)
 
-    def get_instantaneous_frequency(self, x, fs):
+    @cacheable('inst_freq')
+    def get_instantaneous_frequency(self, x, fs, n_points=8000, analitico=None):
         """
         Calcula a Frequência Instantânea (Lógica para o Gráfico Verde).
-        Matemática: diff(unwrap(angle(hilbert(x))))
-        """
-        # Downsampling
-        target_points = 8000
-        if len(x) > target_points:
-            step = len(x) // target_points
-            x_reduced = x[::step]
-            t_reduced = np.linspace(0, len(x)/fs, len(x_reduced))
-            fs_reduced = fs / step # Ajusta FS para o cálculo da derivada
-        else:
-            x_reduced = x
-            t_reduced = np.linspace(0, len(x)/fs, len(x))
-            fs_reduced = fs
-
-        sinal_analitico = hilbert(x_reduced)
-        fase_instantanea = np.unwrap(np.angle(sinal_analitico))
-        
-        # Derivada da fase = Frequência Angular. Divide por 2pi para Hz.
-        freq_inst = (np.diff(fase_instantanea) / (2.0 * np.pi) * fs_reduced)
-        
-        # diff perde 1 ponto, ajustamos o tempo
-        return t_reduced[1:], freq_inst
+        Matemática: diff(unwrap(angle(hilbert(x)))), feita em blocos
+        (overlap-save) na taxa original, sem aliasing da decimação prévia.
+        """
+        if analitico is not None and analitico[1] is not None:
+            return analitico[1]
+        return frequencia_instantanea(x, fs, n_points)
 
+    @cacheable('pitch_stft')
     def get_pitch_variation_stft(self, x, fs,
-                           nperseg=2048, noverlap=1024):
+                           nperseg=2048, noverlap=1024, ctx=None):
 
-        # STFT
-        win = get_window('hann', nperseg)
-        f, t, Zxx = stft(x, fs=fs, window=win, nperseg=nperseg,
-                        noverlap=noverlap, boundary=None)
+        # STFT (compartilhada se os parâmetros coincidirem)
+        if ctx is None or (ctx.janela, ctx.nperseg, ctx.noverlap) != ('hann', nperseg, noverlap):
+            ctx = self.get_context(x, fs, nperseg=nperseg, noverlap=noverlap)
 
         # Frequência dominante por janela
-        freq_dominante = np.array([f[np.argmax(np.abs(Zxx[:, i]))] for i in range(Zxx.shape[1])])
+        return ctx.frequencia_dominante()
+
+    # --- Detalhe sob demanda (zoom) ---
+    # Reanálises só do trecho visível, em resolução maior que a visão geral.
+    # Retornam tempos absolutos (s) e são guardadas em memória pelo controller.
+
+    def _trecho(self, x, fs, t0, t1, margem=0):
+        """Amostras de [t0, t1] mais 'margem' de cada lado. Retorna (seg, s0)."""
+        s0 = max(int(np.floor(t0 * fs)) - margem, 0)
+        s1 = min(int(np.ceil(t1 * fs)) + margem, len(x))
+        return np.asarray(x[s0:max(s0, s1)], dtype='float32'), s0
+
+    def _recorta(self, t, y, t0, t1):
+        sel = (t >= t0) & (t <= t1)
+        return t[sel], y[sel]
+
+    def _contexto_trecho(self, x, fs, t0, t1, n_frames, nperseg=2048):
+        """
+        AnalysisContext só do trecho, com hop reduzido para ~n_frames frames
+        (mínimo 1 amostra, máximo o hop da visão geral).
+        """
+        seg, s0 = self._trecho(x, fs, t0, t1, margem=nperseg // 2)
+        if len(seg) < nperseg:
+            return None, s0
+        hop = int(np.clip((len(seg) - nperseg) // max(int(n_frames), 1), 1, nperseg // 2))
+        return AnalysisContext(seg, fs, 'hann', nperseg, nperseg - hop), s0
+
+    def get_detail_spectrogram(self, x, fs, t0, t1, fmin=None, fmax=None, n_frames=1000):
+        """Espectrograma de [t0, t1] com hop pequeno. Retorna (t, f, Sxx_db)."""
+        ctx, s0 = self._contexto_trecho(x, fs, t0, t1, n_frames)
+        if ctx is None:
+            return np.zeros(0), np.zeros(0), np.zeros((0, 0), dtype='float32')
+        t, f, S_db = ctx.psd_db(fmin, fmax)
+        return t + s0 / fs, f, S_db
+
+    def get_detail_pitch_stft(self, x, fs, t0, t1, n_frames=1000):
+        """Frequência dominante por frame em [t0, t1], com hop pequeno."""
+        ctx, s0 = self._contexto_trecho(x, fs, t0, t1, n_frames)
+        if ctx is None:
+            return np.zeros(0), np.zeros(0, dtype='float32')
+        t, f_dom = ctx.frequencia_dominante()
+        return self._recorta(t + s0 / fs, f_dom, t0, t1)
+
+    def get_detail_hilbert_envelope(self, x, fs, t0, t1, n_points=2000):
+        """Envoltória de [t0, t1] com ~n_points pontos (taxa cheia se couber)."""
+        # Margem do tamanho do FIR: as bordas do trecho não sofrem com o zero-padding
+        seg, s0 = self._trecho(x, fs, t0, t1, margem=N_TAPS)
+        n_total = max(int(n_points * len(seg) / max((t1 - t0) * fs, 1)), 1)
+        t, env = envoltoria_hilbert(seg, fs, n_total)
+        return self._recorta(t + s0 / fs, env, t0, t1)
+
+    def get_detail_instantaneous_frequency(self, x, fs, t0, t1, n_points=2000):
+        """Frequência instantânea de [t0, t1] com ~n_points pontos."""
+        seg, s0 = self._trecho(x, fs, t0, t1, margem=N_TAPS)
+        n_total = max(int(n_points * len(seg) / max((t1 - t0) * fs, 1)), 1)
+        t, freq = frequencia_instantanea(seg, fs, n_total)
+        return self._recorta(t + s0 / fs, freq, t0, t1)
 
-        return t,freq_dominante
\ No newline at end of file
+    def get_detail_rms(self, x, fs, t0, t1, frame_len=2048, hop=1024, n_points=2000):
+        """RMS de [t0, t1] com a mesma janela e hop reduzido para ~n_points valores."""
+        seg, s0 = self._trecho(x, fs, t0, t1, margem=frame_len)
+        janela = max((t1 - t0) * fs, 1)
+        hop_zoom = int(np.clip(janela // max(int(n_points), 1), 1, hop))
+        t, rms = rms_deslizante(seg, fs, frame_len, hop_zoom)
+        return self._recorta(t + s0 / fs, rms, t0, t1)
@@ -0,0 +1,154 @@
+import os
+import hashlib
+import threading
+import numpy as np
+from scipy.io import wavfile
+
+# Amostras por bloco nas leituras sequenciais
+BLOCK_SIZE = 1 << 20
+
+def iter_blocks(x, block_size=None):
+    """
+    Percorre o sinal (array ou AudioFile) em blocos float32 de 'block_size'
+    amostras, sem materializar o arquivo inteiro. Gera (inicio, bloco).
+    """
+    block_size = block_size or BLOCK_SIZE
+    n = len(x)
+    for start in range(0, n, block_size):
+        yield start, np.asarray(x[start:min(start + block_size, n)], dtype='float32')
+
+class AudioFile:
+    """
+    Handle leve para um arquivo de áudio em disco.
+
+    Os dados PCM ficam mapeados em memória (mmap) no tipo nativo. A conversão
+    para float32 em [-1, 1] e o downmix para mono são feitos por bloco, somente
+    nos trechos que a análise realmente lê.
+    Para len() e fatiamento (x[a:b], x[::passo]) se comporta como um vetor
+    1-D float32, então pode ser passado no lugar do array para o AudioAnalyzer.
+    """
+    ndim = 1
+    dtype = np.dtype('float32')
+
+    # Blocos do soundfile e do hash: o mesmo tamanho de iter_blocks
+    BLOCK_SIZE = BLOCK_SIZE
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._lock = threading.Lock()
+        self._sf = None
+        self._raw = None
+
+        # Pirâmide da forma de onda (montada no worker, na primeira análise)
+        self.pyramid = None
+        self._hash = None
+        # Próprio: a leitura via soundfile já usa self._lock por bloco
+        self._hash_lock = threading.Lock()
+
+        try:
+            fs, raw = wavfile.read(path, mmap=True)
+            self._raw = raw if raw.ndim == 2 else raw.reshape(-1, 1)
+            self.n_samples, self.n_channels = self._raw.shape
+        except ValueError:
+            # WAV 24 bits, compactado ou MP3: leitura por blocos via soundfile
+            import soundfile as sf
+            self._sf = sf.SoundFile(path)
+            fs = self._sf.samplerate
+            self.n_samples = self._sf.frames
+            self.n_channels = self._sf.channels
+
+        self.fs = int(fs)
+
+    @property
+    def shape(self):
+        return (self.n_samples,)
+
+    @property
+    def duration(self):
+        return self.n_samples / self.fs
+
+    def __len__(self):
+        return self.n_samples
+
+    def __array__(self, dtype=None, copy=None):
+        x = self.read()
+        return x if dtype is None else x.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            idx = key + self.n_samples if key < 0 else key
+            if not 0 <= idx < self.n_samples:
+                raise IndexError("Índice fora do áudio")
+            return self[idx:idx + 1][0]
+        if not isinstance(key, slice):
+            raise TypeError("AudioFile aceita apenas índices inteiros e fatias")
+
+        start, stop, step = key.indices(self.n_samples)
+        if step < 0:
+            raise ValueError("AudioFile não suporta passo negativo")
+        if stop <= start:
+            return np.zeros(0, dtype='float32')
+
+        if self._raw is not None:
+            # Fatia a VIEW mapeada; só as amostras tocadas são convertidas
+            return self._to_mono_float(self._raw[start:stop:step])
+
+        # soundfile: lê em blocos múltiplos do passo para manter a fase
+        bs = max(step, (self.BLOCK_SIZE // step) * step)
+        partes = [self._read_sf(b0, min(b0 + bs, stop))[::step]
+                  for b0 in range(start, stop, bs)]
+        return np.concatenate(partes)
+
+    def read(self, start=0, stop=None):
+        """Retorna o trecho [start, stop) como float32 mono."""
+        return self[start:stop]
+
+    def content_hash(self):
+        """
+        Hash (blake2b) do PCM, lido em blocos direto do mapeamento.
+        Calculado uma vez por handle; usado como chave do cache de análises.
+        Tarefas paralelas que pedem o hash ao mesmo tempo esperam a primeira
+        em vez de cada uma ler o arquivo inteiro.
+        """
+        if self._hash is not None:
+            return self._hash
+        with self._hash_lock:
+            if self._hash is None:
+                h = hashlib.blake2b(digest_size=16)
+                h.update(f"{self.fs}:{self.n_channels}:{self.n_samples}".encode())
+                for start in range(0, self.n_samples, self.BLOCK_SIZE):
+                    stop = min(start + self.BLOCK_SIZE, self.n_samples)
+                    if self._raw is not None:
+                        h.update(memoryview(np.ascontiguousarray(self._raw[start:stop])))
+                    else:
+                        h.update(memoryview(self.read(start, stop)))
+                self._hash = h.hexdigest()
+        return self._hash
+
+    def _read_sf(self, start, stop):
+        with self._lock:
+            self._sf.seek(start)
+            data = self._sf.read(stop - start, dtype='float32', always_2d=True)
+        return data.mean(axis=1, dtype='float32') if data.shape[1] > 1 else data[:, 0]
+
+    def _to_mono_float(self, raw):
+        """Escala o trecho inteiro/float para float32 [-1, 1] e faz downmix."""
+        if raw.dtype.kind == 'u':
+            # PCM 8 bits é sem sinal (centro em 128)
+            half = 2 ** (8 * raw.dtype.itemsize - 1)
+            x = (raw.astype('float32') - half) / half
+        elif raw.dtype.kind == 'i':
+            x = raw.astype('float32') / 2 ** (8 * raw.dtype.itemsize - 1)
+        else:
+            x = raw.astype('float32')
+
+        if x.shape[1] > 1:
+            return x.mean(axis=1, dtype='float32')
+        return x[:, 0]
+
+    def close(self):
+        """Libera o mapeamento/arquivo."""
+        if self._sf is not None:
+            self._sf.close()
+        self._raw = None
@@ -0,0 +1,170 @@
+import numpy as np
+
+class EMGClock:
+    """
+    Relógio da aquisição: converte os contadores do dispositivo (ou, sem
+    eles, a contagem de amostras recebidas) em índices absolutos de
+    amostra e ajusta, por mínimos quadrados incrementais, o modelo linear
+    t = t0 + indice / fs contra o horário de cada leitura da porta.
+
+    O horário de leitura tem o jitter do USB/Bluetooth (blocos chegam
+    juntos); o índice não. O ajuste usa todas as leituras, então o jitter
+    se dilui e o tempo de cada amostra sai do modelo, não da chegada.
+    """
+    # Leituras mínimas antes de confiar no modelo
+    MIN_LEITURAS = 8
+    # Salto de contador acima de FOLGA x (amostras esperadas no intervalo)
+    # + MARGEM não é lacuna: é contador corrompido (ou dispositivo reiniciado)
+    FOLGA = 2
+    MARGEM = 64
+
+    def __init__(self, bits_contador=16):
+        self.modulo = 1 << bits_contador
+        self.proximo = 0          # índice esperado da próxima amostra
+        self._ultimo_contador = None
+        self._t_ultimo = None     # leitura do último bloco (limite dos saltos)
+        self.lacunas = 0          # amostras que o contador mostra que se perderam
+        self.duplicadas = 0       # frames repetidos (ou atrasados) descartados
+        self.ressincronias = 0    # saltos impossíveis tratados como contador corrompido
+        self._puladas = 0         # descartes conhecidos ainda não aplicados (sem contador)
+        # Somas do ajuste, centradas na primeira leitura (precisão em sessões longas)
+        self._ref = None
+        self._n = 0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def pular(self, n):
+        """
+        n amostras recebidas foram descartadas antes de chegar aqui (ex.:
+        fila cheia). Sem contador, é o único jeito de manter os índices
+        alinhados ao tempo; com contador, o próprio salto já as revela.
+        """
+        self._puladas += int(n)
+
+    def indices(self, contadores, n, t_leitura=None):
+        """
+        Índices absolutos (int64) das amostras válidas de um bloco e a
+        máscara (n,) de quais são. Com contadores, desfaz a volta do contador
+        e conta os saltos como lacunas. Contador repetido (ou que volta um
+        pouco) é frame duplicado e sai da máscara; salto maior do que cabe no
+        tempo desde a leitura anterior ressincroniza o índice em vez de
+        inventar uma lacuna.
+        """
+        limite = self._limite_salto(n, t_leitura)
+        self._t_ultimo = t_leitura
+        validas = np.ones(n, dtype=bool)
+        if contadores is None:
+            self.proximo += self._puladas
+            self._puladas = 0
+            idx = self.proximo + np.arange(n, dtype=np.int64)
+            self.proximo += n
+            return idx, validas
+
+        self._puladas = 0
+        c = np.asarray(contadores, dtype=np.int64)
+        anterior = self._ultimo_contador if self._ultimo_contador is not None else int(c[0]) - 1
+        base = self.proximo - 1
+        passos = np.diff(np.concatenate([[anterior], c])) % self.modulo
+        if np.all((passos > 0) & (passos <= limite)):
+            idx = base + np.cumsum(passos)
+            self._ultimo_contador = int(c[-1])
+        else:
+            idx = self._indices_frame_a_frame(c, anterior, base, limite, validas)
+            if len(idx) == 0:
+                return idx, validas
+        self.lacunas += int(idx[-1] - base) - len(idx)
+        self.proximo = int(idx[-1]) + 1
+        return idx, validas
+
+    def _limite_salto(self, n, t_leitura):
+        """Maior passo de contador aceito como lacuna real neste bloco."""
+        esperado = n
+        if t_leitura is not None and self._t_ultimo is not None and self.pronto:
+            esperado = max(n, (t_leitura - self._t_ultimo) * self.fs)
+        # Acima de meia volta, 'para trás' e 'para frente' se confundem
+        return min(int(self.FOLGA * esperado) + self.MARGEM, self.modulo // 2)
+
+    def _indices_frame_a_frame(self, c, anterior, base, limite, validas):
+        """
+        Caminho raro (bloco com duplicata ou salto impossível): o passo de
+        cada frame é medido a partir do último frame aceito.
+        """
+        idx = np.empty(len(c), dtype=np.int64)
+        pos = base
+        for i, contador in enumerate(c.tolist()):
+            passo = (contador - anterior) % self.modulo
+            if passo == 0 or passo > self.modulo - limite:
+                validas[i] = False
+                self.duplicadas += 1
+                continue
+            if passo > limite:
+                self.ressincronias += 1
+                passo = 1
+            pos += passo
+            idx[i] = pos
+            anterior = contador
+        if validas.any():
+            self._ultimo_contador = anterior
+        return idx[validas]
+
+    def observa(self, indice, t_leitura):
+        """A amostra 'indice' já tinha chegado no instante t_leitura."""
+        if self._ref is None:
+            self._ref = (indice, t_leitura)
+        x = float(indice - self._ref[0])
+        y = t_leitura - self._ref[1]
+        self._n += 1
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._sxy += x * y
+
+    @property
+    def pronto(self):
+        return self._n >= self.MIN_LEITURAS and self._variancia_x() > 0
+
+    def _variancia_x(self):
+        return self._sxx - self._sx * self._sx / self._n if self._n else 0.0
+
+    def modelo(self):
+        """(t0, periodo): t = t0 + indice * periodo. Só com self.pronto."""
+        periodo = (self._sxy - self._sx * self._sy / self._n) / self._variancia_x()
+        intercepto = (self._sy - periodo * self._sx) / self._n
+        return self._ref[1] + intercepto - self._ref[0] * periodo, periodo
+
+    @property
+    def fs(self):
+        return 1.0 / self.modelo()[1] if self.pronto else None
+
+    def tempos(self, indices):
+        t0, periodo = self.modelo()
+        return t0 + np.asarray(indices, dtype=np.float64) * periodo
+
+def ajustar_relogio(indices, tempos):
+    """Ajuste linear t = t0 + indice * periodo sobre uma gravação inteira."""
+    x = np.asarray(indices, dtype=np.float64)
+    y = np.asarray(tempos, dtype=np.float64)
+    if len(x) < 2 or x[-1] == x[0]:
+        raise ValueError("Amostras insuficientes para estimar a taxa")
+    x0, y0 = x[0], y[0]
+    periodo, intercepto = np.polyfit(x - x0, y - y0, 1)
+    return y0 + intercepto - x0 * periodo, periodo
+
+def reamostrar_uniforme(indices, tempos, amostras):
+    """
+    Leva a gravação para uma grade uniforme no índice de amostra: o tempo
+    vem do modelo do relógio, e lacunas (índices faltando) são preenchidas
+    por interpolação linear, canal a canal. Sem lacunas, as amostras já
+    estão na grade e nada é interpolado.
+    Retorna (t (s, a partir de 0), amostras (n, canais), fs).
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    amostras = np.asarray(amostras)
+    t0, periodo = ajustar_relogio(indices, tempos)
+
+    grade = np.arange(indices[0], indices[-1] + 1, dtype=np.int64)
+    if len(grade) != len(indices):
+        amostras = np.column_stack([
+            np.interp(grade, indices, amostras[:, i]) for i in range(amostras.shape[1])
+        ]).astype(amostras.dtype)
+    t = (grade - grade[0]) * periodo
+    return t, amostras, 1.0 / periodo
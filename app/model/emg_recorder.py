@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import queue
+import struct
+import threading
+import numpy as np
+import pandas as pd
+from model.emg_clock import ajustar_relogio
+
+# Arquivo de gravação: MAGIC | tamanho do cabeçalho (uint32) | cabeçalho JSON | registros
+# Cada registro: índice da amostra int64 + tempo de chegada float64 (s, relógio do PC)
+# + um float32 por canal, little-endian
+MAGIC = b'EMGRAW2\0'
+EXTENSAO = ".emgraw"
+# Linhas por pedaço na conversão para CSV
+CSV_CHUNK = 1 << 18
+
+def dtype_registro(n_canais):
+    return np.dtype([('indice', '<i8'), ('t', '<f8'), ('canais', '<f4', (n_canais,))])
+
+class EMGRecorder:
+    """
+    Grava a sessão em disco enquanto ela acontece: a UI entrega blocos
+    (write) e uma thread de escrita os anexa ao arquivo binário, com flush
+    a cada FLUSH_S segundos. A memória não cresce com a duração e, se o
+    programa cair, o arquivo tem tudo até o último flush.
+    """
+    DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".sound_analyzer", "emg")
+    FLUSH_S = 1.0
+
+    def __init__(self, path=None, n_canais=2, canais_ativos=None, metadados=None):
+        if path is None:
+            os.makedirs(self.DEFAULT_DIR, exist_ok=True)
+            nome = time.strftime("EMG_%Y%m%d_%H%M%S") + EXTENSAO
+            path = os.path.join(self.DEFAULT_DIR, nome)
+        self.path = path
+        self.n_canais = n_canais
+        self.dtype = dtype_registro(n_canais)
+        self.n_amostras = 0
+        self.erro = None
+
+        cabecalho = {
+            "n_canais": n_canais,
+            "canais_ativos": list(canais_ativos) if canais_ativos is not None else [1] * n_canais,
+            "inicio": time.time(),
+            **(metadados or {}),
+        }
+        texto = json.dumps(cabecalho).encode("utf-8")
+        self._arquivo = open(path, "wb")
+        self._arquivo.write(MAGIC + struct.pack("<I", len(texto)) + texto)
+        self._arquivo.flush()
+
+        self._fila = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, indices, timestamps, amostras):
+        """
+        Enfileira um bloco: índices e tempos de chegada (n,), amostras
+        (n, n_canais). Se a thread de escrita falhou (ex.: disco cheio), a
+        falha é levantada aqui (OSError) em vez de acumular blocos na fila.
+        """
+        if self.erro is not None:
+            raise self.erro
+        registros = np.empty(len(timestamps), dtype=self.dtype)
+        registros['indice'] = indices
+        registros['t'] = timestamps
+        registros['canais'] = amostras
+        self.n_amostras += len(registros)
+        self._fila.put(registros)
+
+    def close(self):
+        """Espera a escrita de tudo que foi enfileirado e fecha o arquivo."""
+        if self._thread is None: return
+        self._fila.put(None)
+        self._thread.join()
+        self._thread = None
+
+    # --- Thread de escrita ---
+
+    def _run(self):
+        ultimo_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    registros = self._fila.get(timeout=self.FLUSH_S)
+                except queue.Empty:
+                    registros = ()
+                if registros is None:
+                    break
+                if len(registros):
+                    self._arquivo.write(registros.tobytes())
+                if time.monotonic() - ultimo_flush >= self.FLUSH_S:
+                    self._arquivo.flush()
+                    os.fsync(self._arquivo.fileno())
+                    ultimo_flush = time.monotonic()
+        except OSError as e:
+            self.erro = e
+            print(f"Erro na gravação EMG ({self.path}): {e}")
+        finally:
+            self._arquivo.close()
+
+def ler_cabecalho(path):
+    """Retorna (cabeçalho dict, offset dos registros)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} não é uma gravação EMG")
+        (tamanho,) = struct.unpack("<I", f.read(4))
+        cabecalho = json.loads(f.read(tamanho).decode("utf-8"))
+    return cabecalho, len(MAGIC) + 4 + tamanho
+
+def ler_gravacao(path):
+    """
+    Abre a gravação sem copiar (memmap). Um registro incompleto no fim
+    (gravação interrompida) é ignorado. Retorna (cabeçalho, registros).
+    """
+    cabecalho, offset = ler_cabecalho(path)
+    dtype = dtype_registro(cabecalho["n_canais"])
+    n = (os.path.getsize(path) - offset) // dtype.itemsize
+    if n == 0:
+        return cabecalho, np.zeros(0, dtype=dtype)
+    return cabecalho, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n,))
+
+def exportar_csv(path, csv_path):
+    """
+    Conversão offline para o CSV de sempre: 'Tempo (s)' a partir da primeira
+    amostra e uma coluna 'Canal_N' por canal ativo. As amostras vão para a
+    grade uniforme do relógio ajustado (índice / fs), com lacunas
+    interpoladas; escrito em pedaços. Retorna o número de linhas.
+    """
+    cabecalho, registros = ler_gravacao(path)
+    ativos = [i for i, ativo in enumerate(cabecalho["canais_ativos"]) if ativo]
+    colunas = ['Tempo (s)'] + [f'Canal_{i+1}' for i in ativos]
+    if len(registros) < 2:
+        pd.DataFrame(columns=colunas).to_csv(csv_path, index=False)
+        return 0
+
+    indices = registros['indice']
+    _, periodo = ajustar_relogio(indices, registros['t'])
+    primeiro, ultimo = int(indices[0]), int(indices[-1])
+
+    for g0 in range(primeiro, ultimo + 1, CSV_CHUNK):
+        grade = np.arange(g0, min(g0 + CSV_CHUNK, ultimo + 1))
+        # Só as amostras que cercam este pedaço da grade
+        lo = max(int(np.searchsorted(indices, grade[0], 'right')) - 1, 0)
+        hi = min(int(np.searchsorted(indices, grade[-1], 'left')) + 1, len(indices))
+        fonte = registros[lo:hi]
+
+        data_dict = {'Tempo (s)': (grade - primeiro) * periodo}
+        for i in ativos:
+            data_dict[f'Canal_{i+1}'] = np.interp(grade, fonte['indice'], fonte['canais'][:, i]).astype('float32')
+        pd.DataFrame(data_dict, columns=colunas).to_csv(
+            csv_path, index=False, mode="w" if g0 == primeiro else "a", header=g0 == primeiro)
+    return ultimo - primeiro + 1
@@ -0,0 +1,207 @@
+import re
+import time
+import threading
+from collections import deque
+import numpy as np
+
+# Protocolo binário: SYNC | contador uint16 | canais float32 | checksum uint8 (little-endian)
+SYNC = b'\xa5\x5a'
+# Leitura máxima por chamada de read() (o que exceder fica para a próxima)
+READ_CHUNK = 1 << 16
+
+# Rótulos 'CH1:' / 'Canal 2:' do protocolo de texto
+_ROTULO = re.compile(rb'[^,:\n]*:')
+
+def checksum(dados):
+    """Soma dos bytes módulo 256 (contador + canais de um frame binário)."""
+    return sum(dados) & 0xFF
+
+def montar_frame(contador, valores):
+    """Frame binário de um conjunto de amostras (lado do dispositivo / testes)."""
+    corpo = np.uint16(contador & 0xFFFF).astype('<u2').tobytes() + \
+            np.asarray(valores, dtype='<f4').tobytes()
+    return SYNC + corpo + bytes([checksum(corpo)])
+
+class TextFrameParser:
+    """
+    Protocolo de texto original: uma linha por amostra, 'CH1:0.12,CH2:0.34\\n'
+    (rótulos opcionais). Recebe bytes em pedaços arbitrários e guarda a linha
+    incompleta para o próximo pedaço.
+
+    O caso comum (todas as linhas bem formadas) é convertido de uma vez pelo
+    NumPy; só um pedaço com linha corrompida cai na conversão linha a linha,
+    que descarta as linhas inválidas (contadas em 'erros').
+    """
+    def __init__(self, n_canais=2):
+        self.n_canais = n_canais
+        self._resto = b''
+        self.erros = 0
+
+    def feed(self, dados):
+        """Retorna (contadores, amostras): None e float32 (n, n_canais)."""
+        buf = self._resto + dados
+        fim = buf.rfind(b'\n')
+        if fim < 0:
+            self._resto = buf
+            return None, np.zeros((0, self.n_canais), dtype='float32')
+        self._resto = buf[fim + 1:]
+
+        texto = _ROTULO.sub(b'', buf[:fim]).replace(b'\r', b'').replace(b' ', b'')
+        linhas = [l for l in texto.split(b'\n') if l]
+        if not linhas:
+            return None, np.zeros((0, self.n_canais), dtype='float32')
+
+        try:
+            campos = np.array(b','.join(linhas).split(b',')).astype('float32')
+            if len(campos) == len(linhas) * self.n_canais:
+                return None, campos.reshape(-1, self.n_canais)
+        except ValueError:
+            pass
+        return None, self._por_linha(linhas)
+
+    def _por_linha(self, linhas):
+        amostras = []
+        for linha in linhas:
+            try:
+                valores = [float(v) for v in linha.split(b',') if v]
+            except ValueError:
+                self.erros += 1
+                continue
+            # Como antes: os primeiros n_canais valores, linhas curtas são descartadas
+            if len(valores) < self.n_canais:
+                self.erros += 1
+                continue
+            amostras.append(valores[:self.n_canais])
+        return np.array(amostras, dtype='float32').reshape(-1, self.n_canais)
+
+class BinaryFrameParser:
+    """
+    Protocolo binário compacto: frames de tamanho fixo
+    SYNC (2) | contador uint16 (2) | n_canais x float32 | checksum (1).
+
+    Os frames alinhados de um pedaço são validados todos juntos (SYNC e
+    checksum por linha de uma matriz n_frames x tamanho). Só quando um frame
+    falha é que a busca pelo próximo SYNC recomeça a partir dele; os bytes
+    descartados contam em 'erros'.
+    """
+    def __init__(self, n_canais=2):
+        self.n_canais = n_canais
+        self.frame_size = len(SYNC) + 2 + 4 * n_canais + 1
+        self._resto = np.zeros(0, dtype=np.uint8)
+        self.erros = 0
+
+    def feed(self, dados):
+        """Retorna (contadores uint16 (n,), amostras float32 (n, n_canais))."""
+        buf = np.concatenate([self._resto, np.frombuffer(dados, dtype=np.uint8)])
+        fs = self.frame_size
+        contadores, amostras = [], []
+        pos = 0
+
+        while len(buf) - pos >= fs:
+            inicio = self._procura_sync(buf, pos)
+            if inicio is None:
+                # Guarda o último byte: pode ser o começo de um SYNC
+                self.erros += len(buf) - 1 - pos
+                pos = len(buf) - 1
+                break
+            self.erros += inicio - pos
+            pos = inicio
+
+            n = (len(buf) - pos) // fs
+            if n == 0:
+                break
+            frames = buf[pos:pos + n * fs].reshape(n, fs)
+            validos = ((frames[:, 0] == SYNC[0]) & (frames[:, 1] == SYNC[1]) &
+                       ((frames[:, 2:-1].sum(axis=1, dtype=np.uint32) & 0xFF) == frames[:, -1]))
+            # Primeiro frame inválido (ou todos válidos)
+            k = n if validos.all() else int(np.argmin(validos))
+            if k:
+                bons = frames[:k]
+                contadores.append(np.ascontiguousarray(bons[:, 2:4]).view('<u2').ravel())
+                amostras.append(np.ascontiguousarray(bons[:, 4:-1]).view('<f4').astype('float32'))
+                pos += k * fs
+            if k < n:
+                # Frame corrompido: pula o SYNC dele e procura o próximo
+                self.erros += 1
+                pos += 1
+
+        self._resto = buf[pos:].copy()
+        if not contadores:
+            return np.zeros(0, dtype=np.uint16), np.zeros((0, self.n_canais), dtype='float32')
+        return np.concatenate(contadores), np.concatenate(amostras).reshape(-1, self.n_canais)
+
+    @staticmethod
+    def _procura_sync(buf, pos):
+        if len(buf) - pos >= 2 and buf[pos] == SYNC[0] and buf[pos + 1] == SYNC[1]:
+            return pos
+        achados = np.flatnonzero((buf[pos:-1] == SYNC[0]) & (buf[pos + 1:] == SYNC[1]))
+        return pos + int(achados[0]) if len(achados) else None
+
+class BlockQueue:
+    """
+    Fila limitada de blocos entre a thread serial (única produtora) e a UI
+    (única consumidora). Cheia, a fila descarta o bloco mais antigo: a UI
+    atrasada perde dados velhos, nunca trava a leitura. Os descartes ficam
+    contados. O lock (curto: só mexe na deque) garante que drain() veja
+    os descartes e os blocos da mesma fotografia da fila.
+    """
+    def __init__(self, max_blocos=512):
+        self._fila = deque()
+        self._lock = threading.Lock()
+        self.max_blocos = max_blocos
+        self.overruns = 0         # blocos descartados com a fila cheia
+        self.amostras_perdidas = 0
+        self._perdidas_entregues = 0
+
+    def __len__(self):
+        return len(self._fila)
+
+    def put(self, bloco):
+        """bloco = (t_leitura, contadores, amostras)."""
+        with self._lock:
+            if len(self._fila) >= self.max_blocos:
+                velho = self._fila.popleft()
+                self.overruns += 1
+                self.amostras_perdidas += len(velho[2])
+            self._fila.append(bloco)
+
+    def drain(self, max_blocos=None):
+        """
+        Retira (na ordem) tudo que está na fila, ou até max_blocos.
+        Retorna (blocos, perdidas): perdidas são as amostras descartadas
+        desde o último drain, todas anteriores ao primeiro bloco retornado.
+        """
+        with self._lock:
+            n = len(self._fila) if max_blocos is None else min(max_blocos, len(self._fila))
+            blocos = [self._fila.popleft() for _ in range(n)]
+            perdidas = self.amostras_perdidas - self._perdidas_entregues
+            self._perdidas_entregues = self.amostras_perdidas
+        return blocos, perdidas
+
+    def clear(self):
+        with self._lock:
+            self._fila.clear()
+            self.overruns = 0
+            self.amostras_perdidas = 0
+            self._perdidas_entregues = 0
+
+PARSERS = {
+    "Texto": TextFrameParser,
+    "Binário": BinaryFrameParser,
+}
+
+def ler_blocos(porta, parser, ativo, on_bloco):
+    """
+    Laço da thread serial: um read() por vez com tudo que já chegou (ou
+    espera até o timeout da porta por 1 byte), sem girar em in_waiting.
+    Cada pedaço decodificado vira um bloco on_bloco(t_leitura, contadores, amostras).
+    ativo(): enquanto verdadeiro, continua lendo.
+    """
+    while ativo() and porta.is_open:
+        dados = porta.read(min(max(porta.in_waiting, 1), READ_CHUNK))
+        if not dados:
+            continue
+        t_leitura = time.time()
+        contadores, amostras = parser.feed(dados)
+        if len(amostras):
+            on_bloco(t_leitura, contadores, amostras)
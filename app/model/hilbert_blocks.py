@@ -0,0 +1,160 @@
+import numpy as np
+from scipy.fft import rfft, irfft
+from scipy.signal import get_window
+
+# FIR de Hilbert (ímpar, tipo III): resposta plana acima de ~4*fs/N_TAPS
+N_TAPS = 4095
+# Tamanho da FFT de cada bloco do overlap-save
+FFT_SIZE = 1 << 15
+
+def fir_hilbert(n_taps=N_TAPS):
+    """Transformador de Hilbert FIR janelado (n_taps ímpar, atraso (n_taps-1)/2)."""
+    if n_taps % 2 == 0:
+        raise ValueError("n_taps deve ser ímpar")
+    m = np.arange(n_taps) - (n_taps - 1) // 2
+    h = np.zeros(n_taps)
+    impar = m % 2 != 0
+    h[impar] = 2.0 / (np.pi * m[impar])
+    return h * get_window('hann', n_taps, fftbins=False)
+
+def iter_sinal_analitico(x, n_taps=N_TAPS, fft_size=FFT_SIZE):
+    """
+    Sinal analítico x + j*H{x} na taxa original, por overlap-save em blocos
+    de FFT de tamanho fixo. 'x' pode ser array ou AudioFile.
+
+    Cada bloco lê a sobreposição necessária dos vizinhos, então a fase é
+    contínua entre blocos e a memória fica limitada a fft_size amostras.
+    Gera (inicio, bloco complex64) alinhados às amostras de x.
+    """
+    if fft_size <= n_taps:
+        raise ValueError("fft_size deve ser maior que n_taps")
+    H = rfft(fir_hilbert(n_taps), fft_size)
+    atraso = (n_taps - 1) // 2
+    passo = fft_size - n_taps + 1
+    n = len(x)
+
+    for m0 in range(0, n, passo):
+        m1 = min(m0 + passo, n)
+        # Trecho de entrada [m0 - atraso, m0 - atraso + fft_size), com zeros fora do sinal
+        a = m0 - atraso
+        lo, hi = max(a, 0), min(a + fft_size, n)
+        seg = np.zeros(fft_size, dtype='float32')
+        seg[lo - a:hi - a] = np.asarray(x[lo:hi], dtype='float32')
+
+        y = irfft(rfft(seg) * H, fft_size)
+        # Saídas válidas da convolução linear começam em n_taps-1 (= 2*atraso)
+        hil = y[n_taps - 1:n_taps - 1 + (m1 - m0)]
+        real = seg[atraso:atraso + (m1 - m0)]
+        yield m0, (real + 1j * hil).astype('complex64')
+
+class ReducaoStream:
+    """
+    Reduz uma sequência em streaming para baldes de 'tamanho' amostras
+    ('max', 'min' ou 'mean'), carregando o balde incompleto entre blocos.
+    """
+    def __init__(self, tamanho, modo='mean'):
+        self.tamanho = max(1, int(tamanho))
+        self.modo = modo
+        self._resto = np.zeros(0, dtype='float32')
+        self.saida = []
+
+    def _reduz(self, m):
+        if self.modo == 'max': return m.max(axis=-1)
+        if self.modo == 'min': return m.min(axis=-1)
+        return m.mean(axis=-1, dtype='float64')
+
+    def feed(self, valores):
+        buf = np.concatenate([self._resto, np.asarray(valores, dtype='float32')])
+        cheio = (len(buf) // self.tamanho) * self.tamanho
+        if cheio:
+            self.saida.append(self._reduz(buf[:cheio].reshape(-1, self.tamanho)))
+        self._resto = buf[cheio:]
+
+    def finaliza(self):
+        """Fecha o último balde (parcial) e retorna todos os valores reduzidos."""
+        if len(self._resto):
+            self.saida.append(np.atleast_1d(self._reduz(self._resto)))
+            self._resto = self._resto[:0]
+        if not self.saida:
+            return np.zeros(0, dtype='float32')
+        return np.concatenate(self.saida).astype('float32')
+
+def _tempos_baldes(n_valores, tamanho, offset, fs):
+    """Centro (s) de cada balde de 'tamanho' amostras, começando na amostra 'offset'."""
+    inicios = np.arange(0, n_valores, tamanho)
+    fins = np.minimum(inicios + tamanho, n_valores)
+    return (offset + (inicios + fins - 1) / 2.0) / fs
+
+class _Envoltoria:
+    """|x + j*H{x}| na taxa original, reduzida a ~n_points (máximo de cada balde)."""
+    def __init__(self, n, fs, n_points):
+        self.n, self.fs = n, fs
+        self.tamanho = max(1, -(-n // n_points))
+        self.red = ReducaoStream(self.tamanho, 'max')
+
+    def feed(self, a):
+        self.red.feed(np.abs(a))
+
+    def resultado(self):
+        return _tempos_baldes(self.n, self.tamanho, 0, self.fs), self.red.finaliza()
+
+class _FrequenciaInstantanea:
+    """
+    Derivada da fase do sinal analítico (Hz), contínua entre blocos;
+    reduzida a ~n_points (média de cada balde = avanço de fase médio).
+    """
+    def __init__(self, n, fs, n_points):
+        self.n, self.fs = n, fs
+        self.tamanho = max(1, -(-(n - 1) // n_points))
+        self.red = ReducaoStream(self.tamanho, 'mean')
+        self._anterior = None
+
+    def feed(self, a):
+        if self._anterior is not None:
+            a = np.concatenate([self._anterior, a])
+        # angle(a[n+1] * conj(a[n])) dispensa o unwrap global
+        dfase = np.angle(a[1:] * np.conj(a[:-1]))
+        self.red.feed(dfase * (self.fs / (2.0 * np.pi)))
+        self._anterior = a[-1:]
+
+    def resultado(self):
+        if self.n < 2:
+            return np.zeros(0), np.zeros(0, dtype='float32')
+        return _tempos_baldes(self.n - 1, self.tamanho, 1, self.fs), self.red.finaliza()
+
+def _percorre(x, acumuladores, **kwargs):
+    """Um único passe do sinal analítico alimentando todos os acumuladores."""
+    for _, a in iter_sinal_analitico(x, **kwargs):
+        for acc in acumuladores:
+            acc.feed(a)
+    return [acc.resultado() for acc in acumuladores]
+
+def envoltoria_hilbert(x, fs, n_points=8000, **kwargs):
+    """
+    Envoltória |x + j*H{x}| calculada na taxa original; só depois é reduzida
+    para ~n_points valores (máximo de cada balde). Retorna (t, env).
+    """
+    return _percorre(x, [_Envoltoria(len(x), fs, n_points)], **kwargs)[0]
+
+def frequencia_instantanea(x, fs, n_points=8000, **kwargs):
+    """
+    Frequência instantânea (Hz) pela derivada da fase do sinal analítico
+    na taxa original, com continuidade de fase entre blocos. Reduzida depois
+    para ~n_points valores (média de cada balde = avanço de fase médio).
+    Retorna (t, freq) com um valor a menos que o sinal, como diff().
+    """
+    if len(x) < 2:
+        return np.zeros(0), np.zeros(0, dtype='float32')
+    return _percorre(x, [_FrequenciaInstantanea(len(x), fs, n_points)], **kwargs)[0]
+
+def envoltoria_e_frequencia(x, fs, n_points=8000, envoltoria=True, frequencia=True, **kwargs):
+    """
+    Envoltória e frequência instantânea no MESMO passe do sinal analítico
+    (o FIR de Hilbert roda uma vez só). Retorna ((t, env), (t, freq)), com
+    None no lugar do que não foi pedido.
+    """
+    n = len(x)
+    accs = [_Envoltoria(n, fs, n_points) if envoltoria else None,
+            _FrequenciaInstantanea(n, fs, n_points) if frequencia else None]
+    resultados = iter(_percorre(x, [a for a in accs if a is not None], **kwargs))
+    return tuple(next(resultados) if a is not None else None for a in accs)
@@ -0,0 +1,49 @@
+import numpy as np
+
+class RingBuffer:
+    """
+    Buffer circular pré-alocado (NumPy) para sinais ao vivo.
+    extend() copia um bloco inteiro de uma vez (no máximo duas fatias);
+    nada é realocado depois da criação. Guarda só as últimas 'capacidade'
+    amostras; 'total' conta tudo que já foi escrito.
+    """
+    def __init__(self, capacidade, dtype='float32'):
+        if capacidade <= 0:
+            raise ValueError("capacidade deve ser positiva")
+        self.capacidade = int(capacidade)
+        self._dados = np.zeros(self.capacidade, dtype=dtype)
+        self._fim = 0      # próxima posição de escrita
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacidade)
+
+    def clear(self):
+        self._fim = 0
+        self.total = 0
+
+    def extend(self, valores):
+        valores = np.asarray(valores, dtype=self._dados.dtype).ravel()
+        n = len(valores)
+        if n == 0: return
+        self.total += n
+        if n >= self.capacidade:
+            # Só o final do bloco cabe
+            self._dados[:] = valores[-self.capacidade:]
+            self._fim = 0
+            return
+        primeira = min(n, self.capacidade - self._fim)
+        self._dados[self._fim:self._fim + primeira] = valores[:primeira]
+        self._dados[:n - primeira] = valores[primeira:]
+        self._fim = (self._fim + n) % self.capacidade
+
+    def ultimos(self, n=None):
+        """Cópia das últimas n amostras (todas, se n=None) em ordem cronológica."""
+        disponiveis = len(self)
+        n = disponiveis if n is None else min(int(n), disponiveis)
+        if n <= 0:
+            return self._dados[:0].copy()
+        inicio = (self._fim - n) % self.capacidade
+        if inicio + n <= self.capacidade:
+            return self._dados[inicio:inicio + n].copy()
+        return np.concatenate([self._dados[inicio:], self._dados[:self._fim]])
@@ -0,0 +1,62 @@
+import numpy as np
+from model.audio_file import iter_blocks
+
+class RMSStream:
+    """
+    RMS deslizante incremental: recebe o sinal em blocos e calcula o RMS
+    apenas nas posições de hop, via somas cumulativas (O(N) no total).
+    Guarda entre blocos só a cauda necessária para os próximos frames.
+    """
+    def __init__(self, frame_len=2048, hop=1024):
+        if frame_len <= 0 or hop <= 0:
+            raise ValueError("frame_len e hop devem ser positivos")
+        self.frame_len = frame_len
+        self.hop = hop
+
+        self._tail = np.zeros(0, dtype='float32')
+        self._pos = 0    # índice absoluto da primeira amostra de _tail
+        self._next = 0   # início absoluto do próximo frame
+
+    def feed(self, bloco):
+        """
+        Adiciona um bloco de amostras. Retorna (inicios, rms) dos frames
+        que ficaram completos, com os índices absolutos de início.
+        """
+        buf = np.concatenate([self._tail, np.asarray(bloco, dtype='float32')])
+        fim = self._pos + len(buf)
+
+        inicios = np.arange(self._next, fim - self.frame_len + 1, self.hop)
+        if len(inicios):
+            rel = inicios - self._pos
+            acum = np.zeros(len(buf) + 1)
+            np.cumsum(np.square(buf, dtype='float64'), out=acum[1:])
+            energia = (acum[rel + self.frame_len] - acum[rel]) / self.frame_len
+            rms = np.sqrt(np.maximum(energia, 0.0))
+            self._next = int(inicios[-1]) + self.hop
+        else:
+            rms = np.zeros(0)
+
+        # Descarta o que nenhum frame futuro vai usar
+        corte = min(self._next - self._pos, len(buf))
+        self._tail = buf[corte:]
+        self._pos += corte
+        return inicios, rms
+
+def rms_deslizante(x, fs, frame_len=2048, hop=1024, block_size=1 << 20):
+    """
+    RMS em janelas de frame_len amostras a cada hop amostras.
+    'x' pode ser array ou AudioFile (lido em blocos).
+    Retorna (t, rms) com t no CENTRO de cada janela.
+    """
+    stream = RMSStream(frame_len, hop)
+    inicios, valores = [], []
+    for _, bloco in iter_blocks(x, block_size):
+        i, r = stream.feed(bloco)
+        inicios.append(i)
+        valores.append(r)
+
+    if not inicios:
+        return np.zeros(0), np.zeros(0)
+    inicios = np.concatenate(inicios)
+    t = (inicios + frame_len / 2) / fs
+    return t, np.concatenate(valores).astype('float32')
@@ -0,0 +1,52 @@
+import numpy as np
+
+def pico_espectral(mag, f, fmin=None, fmax=None, interpolar=True, em_db=False):
+    """
+    Estima a frequência dominante de TODOS os frames de uma só vez.
+
+    mag: magnitude da STFT (frequência x tempo); f: frequências (Hz), espaçadas
+    uniformemente. O argmax é feito no eixo da frequência da matriz inteira,
+    limitada à faixa [fmin, fmax]. Com interpolar=True o pico é refinado por
+    interpolação parabólica sobre o log da magnitude (resolução sub-bin).
+    Com em_db=True, 'mag' já está em dB e o log é dispensado.
+    Retorna f0 (float32) com um valor por frame.
+    """
+    n_frames = mag.shape[1]
+    lo = 0 if fmin is None else int(np.searchsorted(f, fmin, side='left'))
+    hi = len(f) if fmax is None else int(np.searchsorted(f, fmax, side='right'))
+    if hi <= lo or n_frames == 0:
+        return np.zeros(n_frames, dtype='float32')
+
+    banda = mag[lo:hi]
+    k = np.argmax(banda, axis=0)
+    f0 = f[lo + k].astype('float32')
+
+    if not interpolar or len(f) < 2 or banda.shape[0] < 3:
+        return f0
+
+    # Só interpola picos com vizinhos dos dois lados dentro da faixa
+    interno = (k > 0) & (k < banda.shape[0] - 1)
+    cols = np.nonzero(interno)[0]
+    if cols.size == 0:
+        return f0
+    kc = k[cols]
+
+    if em_db:
+        alfa = banda[kc - 1, cols].astype('float64')
+        beta = banda[kc, cols].astype('float64')
+        gama = banda[kc + 1, cols].astype('float64')
+    else:
+        alfa = np.log(banda[kc - 1, cols] + 1e-12)
+        beta = np.log(banda[kc, cols] + 1e-12)
+        gama = np.log(banda[kc + 1, cols] + 1e-12)
+    den = alfa - 2 * beta + gama
+
+    # Vértice da parábola que passa pelos 3 bins (deslocamento em bins)
+    p = np.zeros_like(den)
+    ok = den < 0
+    p[ok] = 0.5 * (alfa[ok] - gama[ok]) / den[ok]
+    p = np.clip(p, -0.5, 0.5)
+
+    df = f[1] - f[0]
+    f0[cols] += (p * df).astype('float32')
+    return f0
@@ -0,0 +1,63 @@
+import numpy as np
+
+def _faixa(v, lim):
+    """Índices [i0, i1) dos valores de 'v' (crescente) visíveis em lim, com um de margem."""
+    if lim is None:
+        return 0, len(v)
+    lo, hi = min(lim), max(lim)
+    i0 = max(int(np.searchsorted(v, lo)) - 1, 0)
+    i1 = min(int(np.searchsorted(v, hi, side='right')) + 1, len(v))
+    return i0, i1
+
+def _inicios_baldes(n, n_max):
+    """Início de cada um dos (até) n_max grupos contíguos que cobrem n elementos."""
+    if n <= n_max:
+        return None
+    return np.linspace(0, n, n_max, endpoint=False).astype(np.intp)
+
+def _passo(v):
+    return float(v[1] - v[0]) if len(v) > 1 else 1.0
+
+def reduzir_espectrograma(t, f, S_db, n_t, n_f, xlim=None, ylim=None):
+    """
+    Reduz a matriz dB (frequência x tempo) ao tamanho do canvas, só na janela
+    visível (xlim em s, ylim em Hz): máximo de cada grupo de frames no tempo e
+    de cada faixa linear de bins na frequência, para picos curtos e
+    harmônicos não sumirem. O custo depende da janela, não do arquivo inteiro.
+    Retorna (img, extent) prontos para AxesImage.set_data / set_extent,
+    ou (None, None) se a janela não tem dados.
+    """
+    c0, c1 = _faixa(t, xlim)
+    r0, r1 = _faixa(f, ylim)
+    img = S_db[r0:r1, c0:c1]
+    if img.size == 0:
+        return None, None
+
+    # Tempo primeiro: é o eixo longo, a redução seguinte já opera na matriz pequena
+    inicios = _inicios_baldes(c1 - c0, max(int(n_t), 1))
+    if inicios is not None:
+        img = np.maximum.reduceat(img, inicios, axis=1)
+    inicios = _inicios_baldes(r1 - r0, max(int(n_f), 1))
+    if inicios is not None:
+        img = np.maximum.reduceat(img, inicios, axis=0)
+
+    dt, df = _passo(t), _passo(f)
+    extent = (t[c0] - dt / 2, t[c1 - 1] + dt / 2, f[r0] - df / 2, f[r1 - 1] + df / 2)
+    return np.ascontiguousarray(img), extent
+
+def _pool_eixo(v, S, n_max, axis):
+    inicios = _inicios_baldes(len(v), max(int(n_max), 1))
+    if inicios is None:
+        return v, S
+    contagem = np.diff(np.append(inicios, len(v)))
+    return np.add.reduceat(v, inicios) / contagem, np.maximum.reduceat(S, inicios, axis=axis)
+
+def reduzir_grade(t, f, S_db, n_t, n_f):
+    """
+    Max-pooling em blocos da matriz (frequência x tempo) para uma grade de
+    no máximo n_f x n_t pontos. Os eixos passam a ser o centro de cada bloco.
+    Retorna (t, f, S) 1-D/1-D/2-D; matrizes menores que a grade voltam intactas.
+    """
+    t, S_db = _pool_eixo(t, S_db, n_t, axis=1)
+    f, S_db = _pool_eixo(f, S_db, n_f, axis=0)
+    return t, f, S_db
@@ -0,0 +1,78 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, rfftfreq
+from scipy.signal import get_window
+
+# Frames de STFT processados por bloco (limita a memória de trabalho)
+FRAMES_POR_BLOCO = 512
+
+def stft_frames_info(n_samples, fs, nperseg=2048, noverlap=1024, padded=False):
+    """
+    Número de frames e eixos (t, f) da STFT em streaming.
+    Os frames coincidem com stft(..., boundary=None, padded=padded):
+    com padded=True o fim do sinal é completado com zeros e vira um
+    último frame parcial, como no stft(..., boundary=None) padrão.
+    """
+    hop = nperseg - noverlap
+    if n_samples < nperseg:
+        n_frames = 0
+    elif padded:
+        n_frames = 1 + -(-(n_samples - nperseg) // hop)
+    else:
+        n_frames = 1 + (n_samples - nperseg) // hop
+    t = (nperseg / 2 + hop * np.arange(n_frames)) / fs
+    f = rfftfreq(nperseg, d=1.0 / fs)
+    return n_frames, t, f
+
+def iter_stft(x, fs, janela='hann', nperseg=2048, noverlap=1024, frames_por_bloco=FRAMES_POR_BLOCO,
+              padded=False):
+    """
+    Gerador de STFT por blocos. 'x' pode ser um array ou um AudioFile.
+
+    Cada bloco lê só as amostras dos seus frames (incluindo a sobreposição
+    com o bloco anterior), então a saída é idêntica à STFT do sinal inteiro.
+    Gera (k0, Zbloco), onde Zbloco é complex64 (frequência x frames) a partir
+    do frame k0, na mesma escala de scipy.signal.stft.
+    """
+    hop = nperseg - noverlap
+    n_frames, _, _ = stft_frames_info(len(x), fs, nperseg, noverlap, padded)
+    win = get_window(janela, nperseg).astype('float32')
+    escala = np.float32(1.0 / win.sum())
+
+    for k0 in range(0, n_frames, frames_por_bloco):
+        nb = min(frames_por_bloco, n_frames - k0)
+        s0 = k0 * hop
+        s1 = s0 + (nb - 1) * hop + nperseg
+        trecho = np.asarray(x[s0:s1], dtype='float32')
+        if len(trecho) < s1 - s0:
+            # Último frame parcial (padded=True): completa com zeros
+            trecho = np.pad(trecho, (0, s1 - s0 - len(trecho)))
+
+        frames = sliding_window_view(trecho, nperseg)[::hop]
+        Z = rfft(frames * win, axis=-1)
+        Z *= escala
+        yield k0, Z.T
+
+def iter_espectrograma_db(x, fs, janela='hann', nperseg=2048, noverlap=1024,
+                          frames_por_bloco=FRAMES_POR_BLOCO, padded=False):
+    """
+    Como iter_stft, mas gera (k0, colunas) já em dB de magnitude
+    (20*log10|Z|), em float32.
+    """
+    for k0, Z in iter_stft(x, fs, janela, nperseg, noverlap, frames_por_bloco, padded):
+        yield k0, 20 * np.log10(np.abs(Z) + np.float32(1e-10))
+
+def espectrograma_db(x, fs, janela='hann', nperseg=2048, noverlap=1024,
+                     dtype='float32', out=None, padded=False):
+    """
+    Preenche um buffer pré-alocado (frequência x frames) com a magnitude
+    da STFT em dB, bloco a bloco. 'out' pode ser um np.memmap para sessões
+    que não cabem na memória. Retorna (t, f, S_db).
+    """
+    n_frames, t, f = stft_frames_info(len(x), fs, nperseg, noverlap, padded)
+    if out is None:
+        out = np.empty((len(f), n_frames), dtype=dtype)
+
+    for k0, cols in iter_espectrograma_db(x, fs, janela, nperseg, noverlap, padded=padded):
+        out[:, k0:k0 + cols.shape[1]] = cols
+    return t, f, out
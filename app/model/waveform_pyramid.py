@@ -0,0 +1,133 @@
+import numpy as np
+from model.audio_file import iter_blocks
+
+class WaveformPyramid:
+    """
+    Pirâmide de níveis de detalhe (min/max/RMS) da forma de onda.
+
+    Nível 0 resume blocos de BASE amostras; cada nível seguinte agrupa FATOR
+    bins do anterior. É montada uma vez, num único passe vetorizado por blocos
+    do sinal (array ou AudioFile). Depois disso, qualquer trecho é desenhado
+    com no máximo ~n_pixels bins, em tempo O(pixels).
+    """
+    BASE = 256
+    FATOR = 4
+
+    # Amostras lidas por vez durante a construção (múltiplo de BASE)
+    BLOCO_LEITURA = BASE * 4096
+
+    def __init__(self, x, fs):
+        self.x = x
+        self.fs = fs
+        self.n_samples = len(x)
+        self.levels = []  # lista de (mn, mx, ms) por nível
+
+        self._build_level0()
+        while len(self.levels[-1][0]) > 1:
+            self.levels.append(self._reduce(*self.levels[-1]))
+
+    def _build_level0(self):
+        n_bins = -(-self.n_samples // self.BASE)
+        mn = np.empty(n_bins, dtype='float32')
+        mx = np.empty(n_bins, dtype='float32')
+        ms = np.empty(n_bins, dtype='float32')
+
+        for start, bloco in iter_blocks(self.x, self.BLOCO_LEITURA):
+            b0 = start // self.BASE
+            cheio = (len(bloco) // self.BASE) * self.BASE
+            if cheio:
+                m = bloco[:cheio].reshape(-1, self.BASE)
+                nb = m.shape[0]
+                mn[b0:b0 + nb] = m.min(axis=1)
+                mx[b0:b0 + nb] = m.max(axis=1)
+                ms[b0:b0 + nb] = np.einsum('ij,ij->i', m, m) / self.BASE
+            if cheio < len(bloco):
+                # Último bin, parcial
+                resto = bloco[cheio:]
+                i = b0 + cheio // self.BASE
+                mn[i], mx[i] = resto.min(), resto.max()
+                ms[i] = np.dot(resto, resto) / len(resto)
+
+        self.levels.append((mn, mx, ms))
+
+    def _reduce(self, mn, mx, ms):
+        """Agrupa FATOR bins do nível anterior num bin do próximo."""
+        n = len(mn)
+        pad = (-n) % self.FATOR
+        if pad:
+            mn = np.concatenate([mn, np.full(pad, np.inf, dtype='float32')])
+            mx = np.concatenate([mx, np.full(pad, -np.inf, dtype='float32')])
+            ms = np.concatenate([ms, np.full(pad, np.nan, dtype='float32')])
+        mn = mn.reshape(-1, self.FATOR).min(axis=1)
+        mx = mx.reshape(-1, self.FATOR).max(axis=1)
+        ms = ms.reshape(-1, self.FATOR)
+        ms = np.nanmean(ms, axis=1) if pad else ms.mean(axis=1)
+        return mn, mx, ms.astype('float32')
+
+    def bin_size(self, level):
+        return self.BASE * self.FATOR ** level
+
+    def _faixa(self, t0, t1):
+        s0 = 0 if t0 is None else int(np.clip(np.floor(t0 * self.fs), 0, self.n_samples))
+        s1 = self.n_samples if t1 is None else int(np.clip(np.ceil(t1 * self.fs), 0, self.n_samples))
+        return s0, max(s0, s1)
+
+    def _escolhe_nivel(self, n, n_pixels):
+        """Nível mais fino com no máximo n_pixels bins no trecho."""
+        for level in range(len(self.levels)):
+            if n / self.bin_size(level) <= n_pixels:
+                return level
+        return len(self.levels) - 1
+
+    def _bins(self, s0, s1, n_pixels):
+        """
+        Retorna (centros, mn, mx, ms) do trecho com no máximo ~n_pixels bins.
+        Trechos curtos demais para o nível 0 são resumidos das amostras.
+        """
+        n = s1 - s0
+        if n <= 0:
+            vazio = np.zeros(0, dtype='float32')
+            return vazio, vazio, vazio, vazio
+
+        if n / self.BASE < n_pixels:
+            # Zoom profundo: resume direto as amostras (no máx. BASE * n_pixels)
+            passo = max(1, int(np.ceil(n / n_pixels)))
+            bloco = np.asarray(self.x[s0:s1], dtype='float32')
+            pad = (-n) % passo
+            centros = s0 + (np.arange(-(-n // passo)) + 0.5) * passo
+            if passo == 1:
+                return centros, bloco, bloco, bloco * bloco
+            m = np.concatenate([bloco, np.full(pad, np.nan, dtype='float32')]).reshape(-1, passo)
+            return (centros, np.nanmin(m, axis=1), np.nanmax(m, axis=1),
+                    np.nanmean(m * m, axis=1))
+
+        level = self._escolhe_nivel(n, n_pixels)
+        size = self.bin_size(level)
+        mn, mx, ms = self.levels[level]
+        i0, i1 = s0 // size, -(-s1 // size)
+        centros = (np.arange(i0, i1) + 0.5) * size
+        return centros, mn[i0:i1], mx[i0:i1], ms[i0:i1]
+
+    def envelope(self, t0=None, t1=None, n_pixels=2000):
+        """
+        Envoltória min/max do trecho [t0, t1] (segundos) para desenhar como
+        uma única linha: retorna (t, y) com os pares min/max intercalados.
+        Com poucas amostras no trecho, retorna as próprias amostras.
+        """
+        s0, s1 = self._faixa(t0, t1)
+        if s1 - s0 <= 2 * n_pixels:
+            y = np.asarray(self.x[s0:s1], dtype='float32')
+            return (s0 + np.arange(len(y))) / self.fs, y
+
+        centros, mn, mx, _ = self._bins(s0, s1, n_pixels)
+        t = np.repeat(centros / self.fs, 2)
+        y = np.empty(2 * len(mn), dtype='float32')
+        y[0::2] = mn
+        y[1::2] = mx
+        return t, y
+
+    def rms(self, t0=None, t1=None, n_pixels=2000):
+        """RMS por bin do trecho [t0, t1]. Retorna (t, rms)."""
+        s0, s1 = self._faixa(t0, t1)
+        centros, _, _, ms = self._bins(s0, s1, n_pixels)
+        return centros / self.fs, np.sqrt(ms)
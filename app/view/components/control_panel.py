@@ -44,9 +44,41 @@ class ControlPanel(ctk.CTkFrame):
         self.fft_scale_entry.insert(0, "1")
         self.fft_scale_entry.pack(fill="x", padx=15, pady=5)
 
+        # 3. Janela do RMS (amostras)
+        self._create_section_header("RMS (Frame / Hop)").pack(anchor="w", padx=15, pady=5)
+        rms_box = ctk.CTkFrame(self, fg_color="transparent")
+        rms_box.pack(fill="x", padx=15, pady=5)
+        self.rms_frame_entry = ctk.CTkEntry(rms_box, width=90, font=self.BODY_FONT)
+        self.rms_frame_entry.insert(0, "2048")
+        self.rms_frame_entry.pack(side="left")
+        self.rms_hop_entry = ctk.CTkEntry(rms_box, width=90, font=self.BODY_FONT)
+        self.rms_hop_entry.insert(0, "1024")
+        self.rms_hop_entry.pack(side="right")
+
         self._add_divider()
 
-        # 3. Botões de Ação
+        # 4. Reprodução do arquivo ativo
+        self._create_section_header("Reprodução").pack(anchor="w", padx=15, pady=5)
+        play_box = ctk.CTkFrame(self, fg_color="transparent")
+        play_box.pack(fill="x", padx=15, pady=5)
+        self.btn_play = ctk.CTkButton(
+            play_box, text="▶ Tocar", width=90,
+            command=self._on_toggle_play,
+            fg_color="#3B8ED0"
+        )
+        self.btn_play.pack(side="left")
+        self.lbl_play_time = ctk.CTkLabel(play_box, text="00:00 / 00:00", font=self.BODY_FONT)
+        self.lbl_play_time.pack(side="right")
+
+        # Posição como fração da duração (0..1)
+        self.seek_slider = ctk.CTkSlider(self, from_=0, to=1, command=self._on_seek)
+        self.seek_slider.set(0)
+        self.seek_slider.pack(fill="x", padx=15, pady=(5, 0))
+        self.controller.playback_listener = self._on_playback_update
+
+        self._add_divider()
+
+        # 5. Botões de Ação
         
         # Botão Aplicar
         self.btn_apply = ctk.CTkButton(
@@ -67,10 +99,20 @@ class ControlPanel(ctk.CTkFrame):
             font=self.BODY_FONT
         )
         self.zoom_switch.pack(fill="x", padx=15, pady=(10, 5))
+
+        self.link_switch = ctk.CTkSwitch(
+            self, 
+            text="Zoom Vinculado (Tempo)",
+            command=self._on_toggle_link,
+            onvalue=True, 
+            offvalue=False, 
+            font=self.BODY_FONT
+        )
+        self.link_switch.pack(fill="x", padx=15, pady=5)
         
         self.cursor_switch = ctk.CTkSwitch(
             self, 
-            text="Inspetor (Clique)",
+            text="Inspetor (Mouse)",
             command=self._on_toggle_cursor,
             onvalue=True, 
             offvalue=False, 
@@ -154,12 +196,19 @@ class ControlPanel(ctk.CTkFrame):
             fi = float(self.entry_min.get())
             fm = float(self.entry_max.get())
             fft_scale = int(self.fft_scale_entry.get())
+            rms_frame = int(self.rms_frame_entry.get())
+            rms_hop = int(self.rms_hop_entry.get())
 
             if fi >= fm:
                 messagebox.showwarning("Aviso", "Frequência mínima deve ser menor que a máxima.")
                 return
+            if rms_frame <= 0 or rms_hop <= 0:
+                messagebox.showwarning("Aviso", "Frame e hop do RMS devem ser maiores que zero.")
+                return
             
-            self.controller.update_analysis_params(fi=fi, fm=fm, fft_scale=fft_scale)
+            self.controller.update_analysis_params(
+                fi=fi, fm=fm, fft_scale=fft_scale, rms_frame=rms_frame, rms_hop=rms_hop
+            )
         except ValueError:
             messagebox.showerror("Erro", "Certifique-se de usar apenas números nos campos.")
     
@@ -182,6 +231,33 @@ class ControlPanel(ctk.CTkFrame):
         if is_zoom_on:
             self.cursor_switch.deselect()
 
+    def _on_toggle_play(self):
+        playing = self.controller.toggle_playback()
+        self.btn_play.configure(text="⏸ Pausar" if playing else "▶ Tocar")
+
+    def _on_seek(self, fraction):
+        transport = self.controller.get_transport()
+        if transport is None: return
+        self.controller.seek_playback(float(fraction) * transport.duration)
+
+    def _on_playback_update(self, t, duration, playing):
+        """Chamado pelo controller a cada quadro do playhead."""
+        if t is None:
+            self.seek_slider.set(0)
+            self.lbl_play_time.configure(text="00:00 / 00:00")
+        else:
+            if duration > 0:
+                self.seek_slider.set(t / duration)
+            self.lbl_play_time.configure(text=f"{self._mmss(t)} / {self._mmss(duration)}")
+        self.btn_play.configure(text="⏸ Pausar" if playing else "▶ Tocar")
+
+    @staticmethod
+    def _mmss(seconds):
+        return f"{int(seconds) // 60:02d}:{int(seconds) % 60:02d}"
+
+    def _on_toggle_link(self):
+        self.controller.toggle_linked_zoom()
+
     def _on_toggle_cursor(self):
         # Chama o controller
         is_cursor_on = self.controller.toggle_cursor_mode()
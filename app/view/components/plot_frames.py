@@ -4,27 +4,58 @@ import matplotlib.pyplot as plt
 import numpy as np
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.widgets import RectangleSelector
+from model.spectrogram_raster import reduzir_espectrograma
 
 # Cor de fundo do tema (Cinza Escuro do CTk)
 THEME_COLOR = '#2b2b2b'
 
 class BasePlotFrame(ctk.CTkFrame):
+    # Textos fixos do gráfico (aplicados uma única vez, junto com o estilo)
+    TITLE = ""
+    XLABEL = "Tempo (s)"
+    YLABEL = ""
+
     def __init__(self, master, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
         
         self.fig = plt.Figure(facecolor=THEME_COLOR, figsize=(5, 4), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        # Eixo persistente: criado no primeiro plot e reaproveitado depois
+        self.ax = None
         
         self.selector = None
         self.original_xlim = None
         self.original_ylim = None
+        # Limites da visão geral (dados completos), gravados a cada plot:
+        # o reset volta para eles mesmo com o detalhe do zoom no lugar dos dados
+        self._overview = None
 
         self.cursor_cid = None  # ID da conexão do evento
+        self._inspector_cids = []
+        # Inspetor: mira + texto animados, desenhados por blit sobre o fundo
         self.annotation = None
+        self._vline = None
+        self._hline = None
+        self._background = None
+        self._xy_index = {}
+        # Cursor de reprodução (linha vertical animada, também por blit)
+        self._playhead = None
+
+        # Detalhe sob demanda: handler(frame, xlim, ylim, n_pixels) pede ao
+        # controller uma reanálise do trecho visível; chega em show_detail()
+        self.detail_handler = None
+        self._zoomed = False
+
+        # Avisado a cada janela escolhida pelo usuário: listener(frame, xlim, zoomed)
+        self.view_listener = None
+        self.scroll_cid = None
 
         widget = self.canvas.get_tk_widget()
         widget.configure(bg=THEME_COLOR, highlightthickness=0) 
         widget.pack(fill="both", expand=True)
+
+        # Fundo para blitting (inspetor e playhead), renovado a cada desenho completo
+        self.canvas.mpl_connect('draw_event', self._on_full_draw)
     
     def set_grid(self, enabled):
         """Ativa/Desativa a grade de forma segura."""
@@ -35,9 +66,116 @@ class BasePlotFrame(ctk.CTkFrame):
                 ax.grid(False)
         self.canvas.draw_idle()
 
+    def set_detail_handler(self, handler):
+        self.detail_handler = handler
+
+    def _request_detail(self, ax):
+        if self._zoomed and self.detail_handler is not None:
+            n_pixels = max(int(ax.bbox.width), 100)
+            self.detail_handler(self, ax.get_xlim(), ax.get_ylim(), n_pixels)
+
+    def _notify_view(self):
+        if self.view_listener is not None and self.ax is not None:
+            self.view_listener(self, self.ax.get_xlim(), self._zoomed)
+
+    def apply_linked_xlim(self, xlim, zoomed):
+        """
+        Aplica a janela de tempo vinda de outro gráfico (zoom vinculado).
+        Não redesenha: quem chama agrupa os redesenhos.
+        """
+        if self.ax is None: return False
+        ax = self.ax
+        if zoomed:
+            if self.original_xlim is None:
+                self.original_xlim = ax.get_xlim()
+                self.original_ylim = ax.get_ylim()
+            ax.set_xlim(xlim)
+        else:
+            limites = self._limites_originais()
+            if limites is not None:
+                ax.set_xlim(limites[0])
+                ax.set_ylim(limites[1])
+            self.original_xlim = None
+            self.original_ylim = None
+        self._zoomed = zoomed
+        return True
+
+    def _limites_originais(self):
+        """(xlim, ylim) para onde o reset volta: a visão geral, se houver plot."""
+        if self._overview is not None:
+            return self._overview
+        if self.original_xlim is not None:
+            return self.original_xlim, self.original_ylim
+        return None
+
+    def _salva_limites_originais(self):
+        if self.original_xlim is None:
+            self.original_xlim = self.ax.get_xlim()
+            self.original_ylim = self.ax.get_ylim()
+
+    def _is_current_view(self, xlim):
+        """O detalhe só é aplicado se a janela pedida ainda é a visível."""
+        return self._zoomed and self.ax is not None and tuple(self.ax.get_xlim()) == tuple(xlim)
+
+    def show_detail(self, xlim, data):
+        """Recebe a reanálise do trecho xlim. Subclasses com detalhe sobrescrevem."""
+        pass
+
+    def _ensure_axes(self):
+        """
+        Cria e estiliza o eixo (e os artistas) uma única vez. Os plots
+        seguintes só trocam os dados, sem reconstruir a figura.
+        """
+        if self.ax is None:
+            self.ax = self.fig.add_subplot(111)
+            self._style_axes(self.ax)
+            self._create_artists(self.ax)
+        return self.ax
+
+    def _style_axes(self, ax):
+        ax.set_facecolor(THEME_COLOR)
+        ax.tick_params(colors="white")
+        for spine in ax.spines.values():
+            if spine.spine_type in ['bottom', 'left']:
+                spine.set_color("white")
+            else:
+                spine.set_visible(False)
+
+        ax.set_title(self.TITLE, color="white")
+        ax.set_xlabel(self.XLABEL, color="white")
+        ax.set_ylabel(self.YLABEL, color="white")
+
+    def _create_artists(self, ax):
+        """Subclasses criam aqui seus artistas persistentes (linhas, imagens...)."""
+        pass
+
+    def _clear_data(self):
+        """Subclasses esvaziam aqui os dados dos seus artistas."""
+        pass
+
+    def _autoscale(self):
+        """Ajusta os limites aos dados novos (desfaz o zoom, como um plot novo)."""
+        ax = self.ax
+        ax.set_autoscale_on(True)
+        # Só artistas visíveis: mira escondida não influencia os limites
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
+        self._reset_original_limits()
+
+    def _reset_original_limits(self):
+        # Com o zoom ativo, o "reset" passa a voltar para os dados novos
+        self._overview = (self.ax.get_xlim(), self.ax.get_ylim())
+        if self.original_xlim is not None:
+            self.original_xlim = self.ax.get_xlim()
+            self.original_ylim = self.ax.get_ylim()
+
     def clear(self):
-        # Limpa a FIGURA inteira
-        self.fig.clear()
+        """Esvazia os dados, mantendo eixo, estilo e artistas."""
+        self._hide_inspector()
+        self._overview = None
+        if self.ax is not None:
+            self._clear_data()
+
     
     def draw(self):
         # draw_idle é mais seguro para evitar erros de thread/inicialização
@@ -45,18 +183,19 @@ class BasePlotFrame(ctk.CTkFrame):
     
     def enable_zoom_mode(self):
         """Ativa a ferramenta de seleção retangular."""
-        # Pega o eixo atual (Current Axes)
-        if not self.fig.axes: return # Se não tiver gráfico, ignora
-        ax = self.fig.gca() 
+        if self.ax is None: return # Se não tiver gráfico, ignora
+        ax = self.ax
         
         # Ignora gráficos 3D (eles não suportam RectangleSelector 2D)
         if hasattr(ax, 'name') and ax.name == '3d':
             return
 
         # Salva os limites originais se for a primeira vez ativando
-        if self.original_xlim is None:
-            self.original_xlim = ax.get_xlim()
-            self.original_ylim = ax.get_ylim()
+        self._salva_limites_originais()
+
+        # Roda do mouse desloca a janela em zoom (pan)
+        if self.scroll_cid is None:
+            self.scroll_cid = self.canvas.mpl_connect('scroll_event', self._on_scroll_pan)
 
         # Cria ou reativa o seletor
         if self.selector:
@@ -73,6 +212,9 @@ class BasePlotFrame(ctk.CTkFrame):
             
     def disable_zoom_mode(self):
         """Desativa a ferramenta de seleção."""
+        if self.scroll_cid is not None:
+            self.canvas.mpl_disconnect(self.scroll_cid)
+            self.scroll_cid = None
         if self.selector:
             self.selector.set_active(False)
             self.selector.set_visible(False) # Esconde o retângulo se ficou algum
@@ -80,16 +222,21 @@ class BasePlotFrame(ctk.CTkFrame):
 
     def reset_zoom(self):
         """Volta para o visual original."""
-        if not self.fig.axes: return
-        ax = self.fig.gca()
+        if self.ax is None: return
+        ax = self.ax
         
         # Se tivermos salvado os limites, restaura. Se não, usa autoscale.
-        if self.original_xlim:
-            ax.set_xlim(self.original_xlim)
-            ax.set_ylim(self.original_ylim)
+        # (autoscale só serve sem detalhe: com ele, os dados são os do zoom)
+        limites = self._limites_originais()
+        if limites is not None:
+            ax.set_xlim(limites[0])
+            ax.set_ylim(limites[1])
         else:
             ax.autoscale()
-            
+        
+        self._zoomed = False
+        self._on_view_changed(ax)
+        self._notify_view()
         self.canvas.draw_idle()
         
         # Opcional: Limpa os originais para pegar novos na próxima
@@ -98,75 +245,204 @@ class BasePlotFrame(ctk.CTkFrame):
 
     def _on_select_zoom(self, eclick, erelease):
         """Callback chamado quando você solta o mouse após desenhar o retângulo."""
-        if not self.fig.axes: return
-        ax = self.fig.gca()
+        if self.ax is None: return
+        ax = self.ax
         
         x1, y1 = eclick.xdata, eclick.ydata
         x2, y2 = erelease.xdata, erelease.ydata
+        self._salva_limites_originais()
         
         # Aplica o Zoom
         ax.set_xlim(min(x1, x2), max(x1, x2))
         ax.set_ylim(min(y1, y2), max(y1, y2))
         
+        self._zoomed = True
+        self._on_view_changed(ax)
+        self._notify_view()
+        self.canvas.draw_idle()
+
+    def _on_scroll_pan(self, event):
+        """Roda do mouse (com zoom aplicado): desloca a janela de tempo em 10%."""
+        if self.ax is None or event.inaxes != self.ax or not self._zoomed: return
+        self._salva_limites_originais()
+        x0, x1 = self.ax.get_xlim()
+        passo = (x1 - x0) * 0.1 * (1 if event.button == 'up' else -1)
+        self.ax.set_xlim(x0 + passo, x1 + passo)
+
+        self._on_view_changed(self.ax)
+        self._notify_view()
         self.canvas.draw_idle()
+
+    def _on_view_changed(self, ax):
+        """
+        Chamado após zoom/reset. Frames que conseguem buscar mais detalhe
+        para o trecho visível sobrescrevem este método.
+        """
+        pass
     
     def enable_cursor_mode(self):
-        """Ativa o clique para ver valores."""
+        """
+        Ativa o inspetor: mira que acompanha o mouse (hover) e encaixa no
+        ponto de dado mais próximo. Só a mira é redesenhada (blitting) sobre
+        o fundo guardado da figura.
+        """
         # Se já estiver conectado, não faz nada
         if self.cursor_cid is not None: return
-        
-        # Conecta o evento 'button_press_event' à função _on_click
-        self.cursor_cid = self.canvas.mpl_connect('button_press_event', self._on_plot_click)
+
+        self.cursor_cid = self.canvas.mpl_connect('motion_notify_event', self._on_hover)
+        self._inspector_cids = [
+            self.canvas.mpl_connect('axes_leave_event', lambda event: self._hide_inspector(blit=True)),
+        ]
+        # Redesenho completo gera o primeiro fundo
+        self.canvas.draw_idle()
 
     def disable_cursor_mode(self):
-        """Desativa o clique e remove anotações."""
+        """Desativa o inspetor e esconde a mira."""
         if self.cursor_cid:
             self.canvas.mpl_disconnect(self.cursor_cid)
             self.cursor_cid = None
+            for cid in self._inspector_cids:
+                self.canvas.mpl_disconnect(cid)
+            self._inspector_cids = []
         
-        # Remove a anotação visual se ela existir
-        if self.annotation:
-            self.annotation.remove()
-            self.annotation = None
-            self.canvas.draw_idle()
+        self._hide_inspector(blit=True)
 
-    def _on_plot_click(self, event):
-        """Chamado quando clica no gráfico."""
-        # Verifica se o clique foi dentro dos eixos deste gráfico
-        if event.inaxes != self.fig.gca(): return
-        
-        ax = self.fig.gca()
-        
-        # Ignora gráfico 3D (complicado para anotações simples 2D)
-        if hasattr(ax, 'name') and ax.name == '3d': return
-
-        # Se já tem uma anotação, remove ela para criar uma nova (ou move)
-        if self.annotation:
-            self.annotation.remove()
-        
-        # Pega os dados
-        x_val = event.xdata
-        y_val = event.ydata
-        
-        if x_val is None or y_val is None: return
-
-        # Cria o texto (formata para 2 casas decimais)
-        text = f"X={x_val:.3f}\nY={y_val:.3f}"
-        
-        # Cria a anotação (Tooltip Amarelo)
-        self.annotation = ax.annotate(
-            text,
-            xy=(x_val, y_val),
+    def _ensure_inspector(self):
+        """Cria (uma vez por eixo) a mira e a caixa de texto, fora do desenho normal."""
+        if self._vline is not None and self._vline in self.ax.lines:
+            return
+        estilo = dict(color="#f1c40f", linewidth=0.8, linestyle='--', animated=True)
+        self._vline = self.ax.axvline(0, **estilo)
+        self._hline = self.ax.axhline(0, **estilo)
+        # Tooltip Amarelo
+        self.annotation = self.ax.annotate(
+            "", xy=(0, 0),
             xytext=(10, 10), # Deslocamento leve
             textcoords="offset points",
             bbox=dict(boxstyle="round", fc="#f1c40f", ec="none", alpha=0.9), # Caixa amarela
             color="black",
             fontweight="bold",
             fontsize=9,
-            arrowprops=dict(arrowstyle="->", color="#f1c40f") # Setinha
+            animated=True
         )
-        
-        self.canvas.draw_idle()
+        self._xy_index = {}
+        self._hide_inspector()
+
+    def _inspector_artists(self):
+        return [a for a in (self._vline, self._hline, self.annotation) if a is not None]
+
+    def _hide_inspector(self, blit=False):
+        visivel = any(a.get_visible() for a in self._inspector_artists())
+        for artist in self._inspector_artists():
+            artist.set_visible(False)
+        if blit and visivel:
+            self._blit_overlays()
+
+    def _overlay_artists(self):
+        """Artistas animados (fora do desenho normal) que são repostos por blit."""
+        artistas = self._inspector_artists()
+        if self._playhead is not None:
+            artistas.append(self._playhead)
+        return [a for a in artistas if a.axes is self.ax and a.get_visible()]
+
+    def _on_full_draw(self, event):
+        """Após cada desenho completo, guarda o fundo e repõe os overlays por cima."""
+        if self.ax is None: return
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._overlay_artists():
+            self.ax.draw_artist(artist)
+
+    def _blit_overlays(self):
+        if self._background is None: return
+        self.canvas.restore_region(self._background)
+        for artist in self._overlay_artists():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    def set_playhead(self, t):
+        """
+        Posiciona o cursor de reprodução em t (s), ou esconde com t=None.
+        Só a linha é redesenhada (blit), nunca a figura inteira.
+        """
+        if self.ax is None or getattr(self.ax, 'name', '') == '3d': return
+        if self._playhead is None or self._playhead.axes is not self.ax:
+            self._playhead = self.ax.axvline(0, color="#2ecc71", linewidth=1.2, animated=True)
+            self._playhead.set_visible(False)
+        if t is None:
+            if not self._playhead.get_visible(): return
+            self._playhead.set_visible(False)
+        else:
+            self._playhead.set_xdata([t, t])
+            self._playhead.set_visible(True)
+        self._blit_overlays()
+
+    def _on_hover(self, event):
+        """Move a mira para o ponto de dado mais próximo do mouse."""
+        if self.ax is None or getattr(self.ax, 'name', '') == '3d': return
+        if event.inaxes is not self.ax or event.xdata is None or self._background is None:
+            self._hide_inspector(blit=True)
+            return
+
+        self._ensure_inspector()
+        ponto = self._nearest_point(event)
+        if ponto is None:
+            self._hide_inspector(blit=True)
+            return
+
+        x_val, y_val, text = ponto
+        self._vline.set_xdata([x_val, x_val])
+        self._hline.set_ydata([y_val, y_val])
+        self.annotation.xy = (x_val, y_val)
+        self.annotation.set_text(text)
+        for artist in self._inspector_artists():
+            artist.set_visible(True)
+        self._blit_overlays()
+
+    def _sorted_xy(self, line):
+        """
+        Índice (x ordenado, y) de uma linha, refeito só quando os dados
+        da linha mudam (set_data troca o array).
+        """
+        xdata = line.get_xdata(orig=True)
+        cache = self._xy_index.get(line)
+        if cache is not None and cache[0] is xdata:
+            return cache[1], cache[2]
+
+        xs = np.asarray(xdata, dtype=float)
+        ys = np.asarray(line.get_ydata(orig=True), dtype=float)
+        if len(xs) > 1 and np.any(np.diff(xs) < 0):
+            ordem = np.argsort(xs, kind='stable')
+            xs, ys = xs[ordem], ys[ordem]
+        self._xy_index[line] = (xdata, xs, ys)
+        return xs, ys
+
+    def _nearest_point(self, event):
+        """
+        Ponto real mais próximo do mouse: bisect no x ordenado de cada linha
+        e, entre as linhas, o mais perto em pixels. Retorna (x, y, texto).
+        """
+        melhor = None
+        for line in self.ax.lines:
+            if line in (self._vline, self._hline, self._playhead) or not line.get_visible():
+                continue
+            xs, ys = self._sorted_xy(line)
+            if len(xs) == 0: continue
+
+            i = int(np.searchsorted(xs, event.xdata))
+            vizinhos = [j for j in (i - 1, i) if 0 <= j < len(xs)]
+            j = min(vizinhos, key=lambda k: abs(xs[k] - event.xdata))
+            if not np.isfinite(ys[j]): continue
+
+            px, py = self.ax.transData.transform((xs[j], ys[j]))
+            dist = np.hypot(px - event.x, py - event.y)
+            if melhor is None or dist < melhor[0]:
+                melhor = (dist, xs[j], ys[j])
+
+        if melhor is None:
+            return None
+        _, x_val, y_val = melhor
+        # Formata para 3 casas decimais
+        return x_val, y_val, f"X={x_val:.3f}\nY={y_val:.3f}"
 
 class FFTPlotFrame(BasePlotFrame):
     def __init__(self, master, **kwargs):
@@ -175,16 +451,24 @@ class FFTPlotFrame(BasePlotFrame):
         self._init_subplots()
     
     def _init_subplots(self):
-        self.clear()
         # Cria um ÚNICO eixo (Mono)
         self.ax = self.fig.add_subplot(111)
         self.fig.subplots_adjust(left=0.1, right=0.95, bottom=0.15, top=0.9)
         self.ax.set_facecolor(THEME_COLOR)
     
+    def _clear_data(self):
+        for line in list(self.ax.lines):
+            line.remove()
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+
     def reset_axes(self, grid_enabled):
-        if not self.fig.axes:
+        if self.ax is None:
             self._init_subplots()
 
+        # ax.clear() também remove a mira; ela é recriada no próximo hover
+        self._hide_inspector()
         self.ax.clear()
         self.ax.set_facecolor(THEME_COLOR) 
         self.ax.tick_params(colors="white", labelsize=9)
@@ -212,126 +496,277 @@ class FFTPlotFrame(BasePlotFrame):
         self.ax.plot(freq, mag, color=color, label=label, linewidth=1.5)
         self.ax.legend(fontsize=9, framealpha=0.0, labelcolor='white')
 
-class WaveformPlotFrame(BasePlotFrame):
-    def plot(self, times, y_data): 
-        self.clear()
-        ax = self.fig.add_subplot(111) 
-        ax.set_facecolor(THEME_COLOR)
-        
-        ax.tick_params(colors="white")
-        ax.spines["bottom"].set_color("white")
-        ax.spines["left"].set_color("white")
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        
-        ax.plot(times, y_data, color='#4FC3F7', linewidth=0.6)
-        ax.set_title("Forma de Onda", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        ax.set_ylabel("Amplitude", color="white")
-        
+class LinePlotFrame(BasePlotFrame):
+    """
+    Gráfico de uma única linha. O Line2D é criado uma vez; cada plot()
+    só chama set_data e reajusta os limites.
+    """
+    LINE_STYLE = {}
+    # Decimação visual (passo inteiro) acima deste número de pontos
+    MAX_POINTS = None
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.line = None
+        # Dados da visão geral, restaurados ao sair do zoom
+        self._visao_geral = None
+
+    def _create_artists(self, ax):
+        self.line, = ax.plot([], [], **self.LINE_STYLE)
+
+    def _clear_data(self):
+        self._visao_geral = None
+        self.line.set_data([], [])
+
+    def _on_view_changed(self, ax):
+        if not self._zoomed:
+            if self._visao_geral is not None:
+                self.line.set_data(*self._visao_geral)
+            return
+        self._request_detail(ax)
+
+    def show_detail(self, xlim, data):
+        """Troca a linha pela reanálise do trecho em zoom."""
+        if not self._is_current_view(xlim): return
+        self.line.set_data(*data)
+        self.draw()
+
+    def plot(self, times, y_data):
+        self._ensure_axes()
+        if self.MAX_POINTS and len(y_data) > self.MAX_POINTS:
+            step = int(len(y_data) // self.MAX_POINTS)
+            times, y_data = times[::step], y_data[::step]
+
+        self._hide_inspector()
+        self._visao_geral = (times, y_data)
+        self._zoomed = False
+        self.line.set_data(times, y_data)
+        self._autoscale()
         self.draw()
 
+class WaveformPlotFrame(LinePlotFrame):
+    TITLE = "Forma de Onda"
+    YLABEL = "Amplitude"
+    LINE_STYLE = dict(color='#4FC3F7', linewidth=0.6)
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        # Função (t0, t1, n_pixels) -> (t, y) com a envoltória do trecho
+        self.envelope_provider = None
+
+    def set_envelope_provider(self, provider):
+        self.envelope_provider = provider
+
+    def _on_view_changed(self, ax):
+        """
+        Re-busca a envoltória min/max na resolução do trecho visível. Fora do
+        zoom volta à envoltória do arquivo inteiro já plotada, nos limites da
+        visão geral (não nos dados do zoom que ainda estão na linha).
+        """
+        if self.line is None: return
+        if not self._zoomed and self._visao_geral is not None:
+            self.line.set_data(*self._visao_geral)
+            return
+        if self.envelope_provider is None: return
+        t0, t1 = ax.get_xlim()
+        n_pixels = max(int(ax.bbox.width), 100)
+        times, y_data = self.envelope_provider(max(t0, 0), t1, n_pixels)
+        self.line.set_data(times, y_data)
+
 class SpectrogramPlotFrame(BasePlotFrame):
+    """
+    Espectrograma como AxesImage na resolução do canvas: a matriz completa
+    fica guardada e só a janela visível é reduzida (max-pooling) ao tamanho
+    em pixels, no plot, no zoom e no redimensionamento.
+    """
+    TITLE = "Espectrograma"
+    YLABEL = "Frequência (Hz)"
+    # Rasters (por tamanho e janela) guardados para voltar ao zoom sem recalcular
+    MAX_RASTERS = 8
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.image = None
+        self.cbar = None
+        self._dados = None
+        # (t, f, S_db) da reanálise do trecho em zoom, quando disponível
+        self._detalhe = None
+        self._rasters = {}
+
+    def _create_artists(self, ax):
+        # AxesImage + colorbar persistentes: cada plot só troca dados e extent
+        self.image = ax.imshow(
+            np.zeros((1, 1), dtype='float32'), origin='lower',
+            aspect='auto', cmap='inferno', interpolation='nearest'
+        )
+        self.image.set_visible(False)
+        self.cbar = self.fig.colorbar(self.image, ax=ax, format='%+2.0f dB')
+        self.cbar.ax.yaxis.set_tick_params(color="white") 
+        plt.setp(plt.getp(self.cbar.ax.axes, 'yticklabels'), color='white')
+        self.canvas.mpl_connect('resize_event', lambda event: self._atualiza_raster())
+
+    def _clear_data(self):
+        self._dados = None
+        self._detalhe = None
+        self._rasters = {}
+        self.image.set_visible(False)
+
     def plot(self, t, f, S_db):
-        self.clear()
-        ax = self.fig.add_subplot(111)
-        ax.set_facecolor(THEME_COLOR)
-        
-        ax.tick_params(colors="white")
-        for spine in ax.spines.values():
-            if spine.spine_type in ['bottom', 'left']:
-                spine.set_color("white")
-            else:
-                spine.set_visible(False)
-        
-        img = ax.pcolormesh(t, f, S_db, shading='gouraud', cmap='inferno')
-        
-        cbar = self.fig.colorbar(img, ax=ax, format='%+2.0f dB')
-        cbar.ax.yaxis.set_tick_params(color="white") 
-        plt.setp(plt.getp(cbar.ax.axes, 'yticklabels'), color='white')
-        
-        ax.set_title("Espectrograma", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        ax.set_ylabel("Frequência (Hz)", color="white")
-        
+        ax = self._ensure_axes()
+        self._hide_inspector()
+        if len(t) == 0 or len(f) == 0:
+            self._clear_data()
+            self.draw()
+            return
+
+        self._dados = (t, f, S_db)
+        self._detalhe = None
+        self._zoomed = False
+        self._rasters = {}
+
+        # Visão completa: bordas dos pixels = centro de cada frame/bin +- meio passo
+        dt = (t[-1] - t[0]) / (len(t) - 1) if len(t) > 1 else 1.0
+        df = (f[-1] - f[0]) / (len(f) - 1) if len(f) > 1 else 1.0
+        ax.set_xlim(t[0] - dt / 2, t[-1] + dt / 2)
+        ax.set_ylim(f[0] - df / 2, f[-1] + df / 2)
+
+        img = self._atualiza_raster()
+        self.image.set_clim(float(np.min(img)), float(np.max(img)))
+        self.image.set_visible(True)
+        self.cbar.update_normal(self.image)
+        self._reset_original_limits()
         self.draw()
 
-class PitchPlotFrame(BasePlotFrame):
+    def _atualiza_raster(self):
+        """Reduz a janela visível ao tamanho atual do eixo em pixels."""
+        if self._dados is None or self.ax is None: return None
+        ax = self.ax
+        n_t = max(int(ax.bbox.width), 50)
+        n_f = max(int(ax.bbox.height), 50)
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+
+        dados = self._detalhe if self._detalhe is not None else self._dados
+        chave = (n_t, n_f, xlim, ylim, dados is self._detalhe)
+        raster = self._rasters.get(chave)
+        if raster is None:
+            raster = reduzir_espectrograma(*dados, n_t, n_f, xlim, ylim)
+            if raster[0] is None: return None
+            if len(self._rasters) >= self.MAX_RASTERS:
+                self._rasters.pop(next(iter(self._rasters)))
+            self._rasters[chave] = raster
+
+        img, extent = raster
+        self.image.set_data(img)
+        self.image.set_extent(extent)
+        # set_extent religa o autoscale; a janela é a que o usuário escolheu
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        return img
+
+    def _nearest_point(self, event):
+        """Encaixa no pixel do raster sob o mouse e mostra tempo, frequência e dB."""
+        if self._dados is None or not self.image.get_visible(): return None
+        img = self.image.get_array()
+        x0, x1, y0, y1 = self.image.get_extent()
+        n_f, n_t = img.shape
+        col = int(np.clip((event.xdata - x0) / (x1 - x0) * n_t, 0, n_t - 1))
+        lin = int(np.clip((event.ydata - y0) / (y1 - y0) * n_f, 0, n_f - 1))
+
+        # Centro do pixel, para a mira marcar a célula de onde veio o valor
+        t_val = x0 + (col + 0.5) * (x1 - x0) / n_t
+        f_val = y0 + (lin + 0.5) * (y1 - y0) / n_f
+        return t_val, f_val, f"t={t_val:.3f} s\nf={f_val:.1f} Hz\n{float(img[lin, col]):+.1f} dB"
+
+    def _on_view_changed(self, ax):
+        if not self._zoomed:
+            self._detalhe = None
+        self._atualiza_raster()
+        self._request_detail(ax)
+
+    def show_detail(self, xlim, data):
+        """Troca a matriz da visão geral pela reanálise (hop menor) do trecho."""
+        if not self._is_current_view(xlim) or len(data[0]) == 0: return
+        self._detalhe = data
+        self._atualiza_raster()
+        self.draw()
+
+class PitchPlotFrame(LinePlotFrame):
+    TITLE = "Frequência Instantânea (Pitch)"
+    YLABEL = "Frequência (Hz)"
+    # Plot da linha de Pitch (Azul igual ao cliente)
+    LINE_STYLE = dict(color='#448AFF', linewidth=1.2, label="F0 (Hz)")
+
     def plot(self, times, f0_data):
-        self.clear()
-        ax = self.fig.add_subplot(111)
-        ax.set_facecolor(THEME_COLOR)
-        
-        ax.tick_params(colors="white")
-        for spine in ax.spines.values():
-            if spine.spine_type in ['bottom', 'left']:
-                spine.set_color("white")
-            else:
-                spine.set_visible(False)
+        super().plot(times, f0_data)
 
-        # Plot da linha de Pitch (Azul igual ao cliente)
-        ax.plot(times, f0_data, color='#448AFF', linewidth=1.2, label="F0 (Hz)")
-        
-        ax.set_title("Frequência Instantânea (Pitch)", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        ax.set_ylabel("Frequência (Hz)", color="white")
-        
         # Limita eixo Y visualmente se tiver dados
         if len(f0_data) > 0:
             max_f0 = np.max(f0_data)
             if max_f0 > 0:
-                ax.set_ylim(0, max_f0 * 1.2)
-            
-        self.draw()
+                self.ax.set_ylim(0, max_f0 * 1.2)
+                self._reset_original_limits()
 
 class SFFT3DPlotFrame(BasePlotFrame):
-    def plot(self, T, F, Zxx_mag):
-        self.clear()
-        
-        ax = self.fig.add_subplot(111, projection='3d')
-        ax.set_facecolor(THEME_COLOR)
-        
-        for axis in [ax.xaxis, ax.yaxis, ax.zaxis]:
-            axis.set_tick_params(colors='white')
-            axis.label.set_color('white')
-            axis.pane.fill = False 
-            axis.pane.set_edgecolor('white')
-            
-        surf = ax.plot_surface(
-            T, F, Zxx_mag, 
+    TITLE = "Espectro 3D (SFFT)"
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.surface = None
+
+    def _ensure_axes(self):
+        if self.ax is None:
+            ax = self.fig.add_subplot(111, projection='3d')
+            ax.set_facecolor(THEME_COLOR)
+
+            for axis in [ax.xaxis, ax.yaxis, ax.zaxis]:
+                axis.set_tick_params(colors='white')
+                axis.label.set_color('white')
+                axis.pane.fill = False 
+                axis.pane.set_edgecolor('white')
+
+            ax.set_title(self.TITLE, color="white")
+            ax.set_xlabel("Tempo (s)")
+            ax.set_ylabel("Freq (Hz)")
+            ax.set_zlabel("dB")
+            ax.view_init(elev=30, azim=-60)
+            self.ax = ax
+        return self.ax
+
+    def _clear_data(self):
+        # Superfícies 3D não têm set_data: só a coleção é trocada, o eixo fica
+        if self.surface is not None:
+            self.surface.remove()
+            self.surface = None
+
+    def plot(self, t, f, Z):
+        """t, f: eixos 1-D da grade já reduzida pelo analyzer; Z: len(f) x len(t)."""
+        ax = self._ensure_axes()
+        self._clear_data()
+        if Z.size == 0:
+            self.draw()
+            return
+
+        # A grade já vem limitada (ex.: 200x200): desenha todos os pontos
+        T, F = np.meshgrid(t, f)
+        self.surface = ax.plot_surface(
+            T, F, Z, 
             cmap='viridis', 
             edgecolor='none', 
-            rstride=8, 
-            cstride=8,  
+            rstride=1, 
+            cstride=1,  
             antialiased=False 
         )
-        
-        ax.set_title("Espectro 3D (SFFT)", color="white")
-        ax.set_xlabel("Tempo (s)")
-        ax.set_ylabel("Freq (Hz)")
-        ax.set_zlabel("dB")
-        
-        ax.view_init(elev=30, azim=-60)
+        # O eixo é reaproveitado: limites vêm só da superfície nova
+        ax.set_xlim(t[0], t[-1])
+        ax.set_ylim(f[0], f[-1])
+        ax.set_zlim(np.min(Z), np.max(Z))
         
         self.draw()
 
-class RMSPlotFrame(BasePlotFrame):
-    def plot(self, times, rms_data):
-        self.clear()
-        ax = self.fig.add_subplot(111)
-        ax.set_facecolor(THEME_COLOR)
-        
-        ax.tick_params(colors="white")
-        ax.spines["bottom"].set_color("white")
-        ax.spines["left"].set_color("white")
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-
-        ax.plot(times, rms_data, color='orange')
-        ax.set_title("Envelope RMS", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        ax.set_ylabel("Amplitude RMS", color="white")
-        self.draw()
+class RMSPlotFrame(LinePlotFrame):
+    TITLE = "Envelope RMS"
+    YLABEL = "Amplitude RMS"
+    LINE_STYLE = dict(color='orange')
 
 class MetricsFrame(ctk.CTkFrame):
     def __init__(self, master):
@@ -363,98 +798,62 @@ class MetricsFrame(ctk.CTkFrame):
         for label in self.labels.values():
             label.configure(text="--")
 
-class HilbertFreqPlotFrame(BasePlotFrame):
-    def plot(self, times, freq_data):
-        self.clear()
-        ax = self.fig.add_subplot(111)
-        ax.set_facecolor(THEME_COLOR)
-        
-        ax.tick_params(colors="white")
-        for spine in ax.spines.values():
-            if spine.spine_type in ['bottom', 'left']:
-                spine.set_color("white")
-            else:
-                spine.set_visible(False)
+class HilbertFreqPlotFrame(LinePlotFrame):
+    TITLE = "Pitch estimado via Transformada de Hilbert"
+    YLABEL = "Frequência (Hz)"
+    # Plot VERDE
+    LINE_STYLE = dict(color='green', linewidth=0.8, label='Freq. Instantânea')
+    # Downsampling visual para performance
+    MAX_POINTS = 10000
 
-        # Plot VERDE
-        # Downsampling visual para performance
-        if len(freq_data) > 10000:
-            step = int(len(freq_data) // 10000)
-            ax.plot(times[::step], freq_data[::step], color='green', linewidth=0.8, label='Freq. Instantânea')
-        else:
-            ax.plot(times, freq_data, color='green', linewidth=0.8, label='Freq. Instantânea')
-        
-        ax.set_title("Pitch estimado via Transformada de Hilbert", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        ax.set_ylabel("Frequência (Hz)", color="white")
-        
+    def plot(self, times, freq_data):
+        super().plot(times, freq_data)
         # Limita para visualização mais limpa
-        ax.set_ylim(0, 22000) 
-        
-        self.draw()
-
-class HilbertEnvelopePlotFrame(BasePlotFrame):
-    def plot(self, times, envelope_data):
-        self.clear()
-        ax = self.fig.add_subplot(111)
-        ax.set_facecolor(THEME_COLOR)
-        
-        ax.tick_params(colors="white")
-        for spine in ax.spines.values():
-            if spine.spine_type in ['bottom', 'left']:
-                spine.set_color("white")
-            else:
-                spine.set_visible(False)
-
-        # Plot VERMELHO TRACEJADO
-        if len(envelope_data) > 10000:
-            step = int(len(envelope_data) // 10000)
-            ax.plot(times[::step], envelope_data[::step], color='red', linestyle='--', label='Envoltória')
-        else:
-            ax.plot(times, envelope_data, color='red', linestyle='--', label='Envoltória')
-        
+        self.ax.set_ylim(0, 22000) 
+        self._reset_original_limits()
+
+class HilbertEnvelopePlotFrame(LinePlotFrame):
+    TITLE = "Sinal e sua Envoltória"
+    YLABEL = "Amplitude"
+    # Plot VERMELHO TRACEJADO
+    LINE_STYLE = dict(color='red', linestyle='--', label='Envoltória')
+    MAX_POINTS = 10000
+
+    def _create_artists(self, ax):
+        super()._create_artists(ax)
         ax.legend(fontsize=8, framealpha=0.0, labelcolor='white')
-        ax.set_title("Sinal e sua Envoltória", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        ax.set_ylabel("Amplitude", color="white")
-        
-        self.draw()
 
-class PitchSTFTPlotFrame(BasePlotFrame):
-    def plot(self, t, freq_dominante):
-        # 1. Limpa a figura inteira (herdado de BasePlotFrame)
-        self.clear()
-        
-        # 2. Cria o eixo (Subplot) explicitamente
-        ax = self.fig.add_subplot(111)
-        
-        # 3. Aplica o Tema Escuro (Fundo)
-        ax.set_facecolor(THEME_COLOR)
-        
-        # 4. Estilização dos Eixos (Cor Branca para texto e linhas)
-        ax.tick_params(colors="white")
-        for spine in ax.spines.values():
-            if spine.spine_type in ['bottom', 'left']:
-                spine.set_color("white")
-            else:
-                spine.set_visible(False) # Esconde bordas superior e direita
-
-        # 5. Plotagem dos Dados
-        # Sugestão: Use '#448AFF' (Azul claro) ou 'cyan' para contrastar com o fundo escuro
-        ax.plot(t, freq_dominante, color='#448AFF', linewidth=1.5)
-        
-        # 6. Títulos e Labels (Cor Branca)
-        ax.set_title("Variação da Afinação (Pitch via STFT)", color="white")
-        ax.set_ylabel("Frequência (Hz)", color="white")
-        ax.set_xlabel("Tempo (s)", color="white")
-        
-        # 7. Renderiza
-        self.draw()
+class PitchSTFTPlotFrame(LinePlotFrame):
+    TITLE = "Variação da Afinação (Pitch via STFT)"
+    YLABEL = "Frequência (Hz)"
+    # Sugestão: Use '#448AFF' (Azul claro) ou 'cyan' para contrastar com o fundo escuro
+    LINE_STYLE = dict(color='#448AFF', linewidth=1.5)
     
 class DashboardFrame(ctk.CTkScrollableFrame):
+    # Gráficos com eixo x em segundos (participam do zoom vinculado)
+    TIME_CHARTS = ("Waveform", "Spectrogram", "Pitch", "Hilbert", "HilbertFreq", "PitchSTFT", "RMS")
+
+    # Como criar cada gráfico: (classe, kwargs). Nada é instanciado de antemão
+    FRAME_FACTORIES = {
+        'FFT': (FFTPlotFrame, dict(height=600)),
+        'Spectrogram': (SpectrogramPlotFrame, dict(height=250)),
+        'Waveform': (WaveformPlotFrame, dict(height=250)),
+        'Pitch': (PitchPlotFrame, dict(height=250)),
+        'SFFT3D': (SFFT3DPlotFrame, dict(height=500)),
+        'Hilbert': (HilbertEnvelopePlotFrame, dict(height=250)),
+        'HilbertFreq': (HilbertFreqPlotFrame, dict(height=250)),
+        'RMS': (RMSPlotFrame, dict(height=250)),
+        'PitchSTFT': (PitchSTFTPlotFrame, dict(height=250)),
+    }
+
     def __init__(self, master):
         super().__init__(master, label_text="Dashboard de Análise")
         self.frames = {}
+
+        # Zoom vinculado: todos os gráficos de tempo compartilham a mesma janela
+        self.linked_x = False
+        self._redraw_pending = set()
+        self._redraw_scheduled = False
         
         # Configura o Grid: 2 colunas com peso igual (expandem juntas)
         self.grid_columnconfigure((0, 1), weight=1)
@@ -463,35 +862,94 @@ class DashboardFrame(ctk.CTkScrollableFrame):
         self.metrics_view = MetricsFrame(self)
         self.metrics_view.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 10), padx=5)
         
-        # --- CRIAÇÃO DOS FRAMES (Sem posicionar ainda) ---
-        # Apenas instanciamos aqui. O AppController vai decidir onde colocar com .grid()
-        self.frames['FFT'] = FFTPlotFrame(self, height=600)
-        self.frames['Spectrogram'] = SpectrogramPlotFrame(self)
-        self.frames['Waveform'] = WaveformPlotFrame(self)
-        self.frames['Pitch'] = PitchPlotFrame(self)
-        self.frames['SFFT3D'] = SFFT3DPlotFrame(self, height=500)
-        self.frames['Hilbert'] = HilbertEnvelopePlotFrame(self)
-        self.frames['HilbertFreq'] = HilbertFreqPlotFrame(self)
-        self.frames['RMS'] = RMSPlotFrame(self)
-        self.frames['PitchSTFT'] = PitchSTFTPlotFrame(self)
-        
-        # Configura altura inicial (opcional, pois o grid ajusta)
-        self.frames['Spectrogram'].configure(height=250)
-        self.frames['Waveform'].configure(height=250)
-        self.frames['Pitch'].configure(height=250)
-        self.frames['Hilbert'].configure(height=250)
-        self.frames['HilbertFreq'].configure(height=250)
-        self.frames['RMS'].configure(height=250)
-        self.frames['PitchSTFT'].configure(height=250)
+        # Frames criados sob demanda (get_frame) na primeira vez que o gráfico
+        # é ativado, e mantidos aqui para serem reaproveitados depois
+        self._zoom_mode = False
+        self._cursor_mode = False
+
+        # Visibilidade: gráficos fora da área rolada só desenham ao aparecer.
+        # visible_charts é lido pelo worker para priorizar as análises
+        self.visible_charts = set()
+        self._on_visible = {}
+        self._visibility_scheduled = False
+        self._parent_canvas.configure(yscrollcommand=self._on_yscroll)
 
     def get_frame(self, name):
-        return self.frames.get(name)
+        """Retorna o frame do gráfico, criando-o (uma única vez) se preciso."""
+        frame = self.frames.get(name)
+        if frame is None and name in self.FRAME_FACTORIES:
+            frame = self._create_frame(name)
+        return frame
+
+    def _create_frame(self, name):
+        # Apenas instanciamos aqui. O AppController vai decidir onde colocar com .grid()
+        cls, kwargs = self.FRAME_FACTORIES[name]
+        frame = cls(self, **kwargs)
+        self.frames[name] = frame
+
+        if name in self.TIME_CHARTS:
+            frame.view_listener = self._on_frame_view
+        # Frame novo entra no modo que os demais já estão
+        if self._zoom_mode:
+            frame.enable_zoom_mode()
+        if self._cursor_mode:
+            frame.enable_cursor_mode()
+        return frame
 
     def clear(self):
+        self.cancel_deferred()
         for frame in self.frames.values():
             frame.clear()
         self.metrics_view.reset()
 
+    # --- Visibilidade (área rolada) ---
+
+    def _on_yscroll(self, first, last):
+        # Rolagem, redimensionamento ou mudança de layout
+        self._scrollbar.set(first, last)
+        if not self._visibility_scheduled:
+            self._visibility_scheduled = True
+            self.after_idle(self._check_visibility)
+
+    def is_frame_visible(self, widget):
+        """True se alguma parte do widget está na área visível do scroll."""
+        if not widget.winfo_manager(): return False
+        top, bottom = self._parent_canvas.yview()
+        altura = self.winfo_height()
+        y0 = widget.winfo_y()
+        y1 = y0 + widget.winfo_height()
+        return y1 > top * altura and y0 < bottom * altura
+
+    def update_visibility(self):
+        """Recalcula visible_charts (thread da UI). 'Metrics' é o painel do topo."""
+        visiveis = {name for name, frame in self.frames.items() if self.is_frame_visible(frame)}
+        if self.is_frame_visible(self.metrics_view):
+            visiveis.add("Metrics")
+        self.visible_charts = visiveis
+        return visiveis
+
+    def _check_visibility(self):
+        self._visibility_scheduled = False
+        self.update_visibility()
+        for name in [n for n in self._on_visible if n in self.visible_charts]:
+            self._on_visible.pop(name)()
+
+    def when_visible(self, name, fn):
+        """
+        Roda fn() já se o gráfico está à vista; senão guarda para quando ele
+        entrar na área visível (um pedido mais novo substitui o anterior).
+        """
+        frame = self.frames.get(name)
+        if frame is not None and not self.is_frame_visible(frame):
+            self._on_visible[name] = fn
+            return
+        self._on_visible.pop(name, None)
+        fn()
+
+    def cancel_deferred(self):
+        """Descarta desenhos adiados (ex.: uma nova análise vai começar)."""
+        self._on_visible.clear()
+
     def draw(self):
         for frame in self.frames.values():
             frame.draw()
@@ -506,6 +964,7 @@ class DashboardFrame(ctk.CTkScrollableFrame):
     
     def set_zoom_mode(self, enabled):
         """Ativa/Desativa zoom em TODOS os gráficos 2D."""
+        self._zoom_mode = enabled
         for frame in self.frames.values():
             if enabled:
                 frame.enable_zoom_mode()
@@ -519,8 +978,43 @@ class DashboardFrame(ctk.CTkScrollableFrame):
     
     def set_cursor_mode(self, enabled):
         """Ativa/Desativa modo inspeção em TODOS os gráficos."""
+        self._cursor_mode = enabled
         for frame in self.frames.values():
             if enabled:
                 frame.enable_cursor_mode()
             else:
-                frame.disable_cursor_mode()
\ No newline at end of file
+                frame.disable_cursor_mode()
+
+    def set_playhead(self, t):
+        """Move o cursor de reprodução em todos os gráficos de tempo visíveis."""
+        for name in self.TIME_CHARTS:
+            frame = self.frames.get(name)
+            if frame is not None and frame.winfo_manager():
+                frame.set_playhead(t)
+
+    def set_linked_x(self, enabled):
+        self.linked_x = enabled
+
+    def _on_frame_view(self, origem, xlim, zoomed):
+        """Propaga o zoom/pan de um gráfico de tempo para os demais visíveis."""
+        if not self.linked_x: return
+        for name in self.TIME_CHARTS:
+            frame = self.frames.get(name)
+            if frame is None or frame is origem or not frame.winfo_manager():
+                continue
+            if frame.apply_linked_xlim(xlim, zoomed):
+                self._schedule_redraw(frame)
+
+    def _schedule_redraw(self, frame):
+        """Agrupa os redesenhos: no máximo um draw_idle por frame a cada ciclo da UI."""
+        self._redraw_pending.add(frame)
+        if not self._redraw_scheduled:
+            self._redraw_scheduled = True
+            self.after_idle(self._flush_redraws)
+
+    def _flush_redraws(self):
+        self._redraw_scheduled = False
+        pendentes, self._redraw_pending = self._redraw_pending, set()
+        for frame in pendentes:
+            frame._on_view_changed(frame.ax)
+            frame.draw()
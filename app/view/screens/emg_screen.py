@@ -7,17 +7,27 @@ import serial
 import serial.tools.list_ports
 import time
 import numpy as np
-import pandas as pd
 from datetime import datetime
 import threading
-import queue
 import json
 import os
 import sys
 from scipy.signal import hilbert
 from numpy import sqrt, mean, std, square, abs, correlate, argmax, array
+from model.emg_stream import PARSERS, BlockQueue, ler_blocos
+from model.ring_buffer import RingBuffer
+from model.emg_recorder import EMGRecorder, ler_gravacao, exportar_csv
+from model.emg_clock import EMGClock, reamostrar_uniforme
 
 class EMGScreen(ctk.CTkFrame):
+    # Gráficos ao vivo: largura da página (s) e intervalo entre quadros (ms)
+    PAGE_SECONDS = 5.0
+    RENDER_MS = 33
+    # Amostras guardadas por canal: cobre a página até ~6,5 kHz
+    BUFFER_SAMPLES = 1 << 15
+    # Pontos desenhados por linha (acima disso, decimação simples)
+    MAX_PLOT_POINTS = 4000
+
     def __init__(self, parent, nav_controller):
         super().__init__(parent)
         self.nav_controller = nav_controller
@@ -28,12 +38,24 @@ class EMGScreen(ctk.CTkFrame):
         self.selected_channels = [1, 1]
         self.test_duration = 10
         self.serial_port = None
-        self.data_queue = queue.Queue()
+        # Blocos decodificados: a thread serial só produz, a UI consome a cada quadro
+        self.data_queue = BlockQueue()
         self.baud = 115200
-
-        self.time_data = []
-        self.channel_data = [[], []]
-        self.max_points = 1000
+        self.parser = None
+        self.clock = EMGClock()
+        self._t_ultimo_bloco = None
+        self._stream_stats = None
+
+        # Gravação em disco (arquivo binário, convertido para CSV ao salvar)
+        self.recorder = None
+        self.recording_path = None
+
+        # Sinal ao vivo: buffers circulares preenchidos e desenhados pelo timer da UI
+        self.t_buffer = RingBuffer(self.BUFFER_SAMPLES, dtype='float64')
+        self.ch_buffers = [RingBuffer(self.BUFFER_SAMPLES) for _ in range(2)]
+        self._render_job = None
+        self._page = 0
+        self._backgrounds = [None, None]
 
         self.grid_columnconfigure(0, weight=0)
         self.grid_columnconfigure(1, weight=1)
@@ -199,6 +221,15 @@ class EMGScreen(ctk.CTkFrame):
             width=120
         ).grid(row=2, column=1, padx=5, pady=5, sticky="w")
 
+        ctk.CTkLabel(self.connection_frame, text="Protocolo:").grid(row=3, column=0, padx=10, pady=5, sticky="w")
+        self.protocol_var = ctk.StringVar(value="Texto")
+        self.protocol_segment = ctk.CTkSegmentedButton(
+            self.connection_frame,
+            values=list(PARSERS),
+            variable=self.protocol_var
+        )
+        self.protocol_segment.grid(row=3, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+
         self.connect_button = ctk.CTkButton(
             self.connection_frame, 
             text="Conectar", 
@@ -214,7 +245,11 @@ class EMGScreen(ctk.CTkFrame):
             text_color="red", 
             font=ctk.CTkFont(weight="bold")
         )
-        self.connection_status.grid(row=3, column=0, columnspan=3, padx=10, pady=10)
+        self.connection_status.grid(row=4, column=0, columnspan=3, padx=10, pady=(10, 0))
+
+        # Perdas na recepção: blocos descartados pela fila cheia e erros de quadro
+        self.stream_status = ctk.CTkLabel(self.connection_frame, text="", text_color="gray")
+        self.stream_status.grid(row=5, column=0, columnspan=3, padx=10, pady=(0, 10))
 
         self.update_com_ports()
 
@@ -298,7 +333,8 @@ class EMGScreen(ctk.CTkFrame):
         self.fig_ch1, self.ax_ch1 = plt.subplots(figsize=(8, 3.5), dpi=100)
         self.fig_ch1.patch.set_facecolor("#2b2b2b")
         self.ax_ch1.set_facecolor("#1e1e1e")
-        self.line_ch1, = self.ax_ch1.plot([], [], color="#00d4ff", linewidth=1.5, label="Canal 1")
+        self.line_ch1, = self.ax_ch1.plot([], [], color="#00d4ff", linewidth=1.5, label="Canal 1", animated=True)
+        self.ax_ch1.set_xlim(0, self.PAGE_SECONDS)
         self.ax_ch1.set_xlabel("Tempo (s)", color="white")
         self.ax_ch1.set_ylabel("Amplitude (V)", color="white")
         self.ax_ch1.tick_params(colors="white")
@@ -306,6 +342,7 @@ class EMGScreen(ctk.CTkFrame):
         self.ax_ch1.legend(facecolor="#2b2b2b", edgecolor="white", labelcolor="white")
 
         self.canvas_ch1 = FigureCanvasTkAgg(self.fig_ch1, master=self.graph_frame_ch1)
+        self.canvas_ch1.mpl_connect('draw_event', lambda event: self._on_full_draw(0))
         self.canvas_ch1.draw()
         self.canvas_ch1.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -318,7 +355,8 @@ class EMGScreen(ctk.CTkFrame):
         self.fig_ch2, self.ax_ch2 = plt.subplots(figsize=(8, 3.5), dpi=100)
         self.fig_ch2.patch.set_facecolor("#2b2b2b")
         self.ax_ch2.set_facecolor("#1e1e1e")
-        self.line_ch2, = self.ax_ch2.plot([], [], color="#00ff88", linewidth=1.5, label="Canal 2")
+        self.line_ch2, = self.ax_ch2.plot([], [], color="#00ff88", linewidth=1.5, label="Canal 2", animated=True)
+        self.ax_ch2.set_xlim(0, self.PAGE_SECONDS)
         self.ax_ch2.set_xlabel("Tempo (s)", color="white")
         self.ax_ch2.set_ylabel("Amplitude (V)", color="white")
         self.ax_ch2.tick_params(colors="white")
@@ -326,6 +364,7 @@ class EMGScreen(ctk.CTkFrame):
         self.ax_ch2.legend(facecolor="#2b2b2b", edgecolor="white", labelcolor="white")
 
         self.canvas_ch2 = FigureCanvasTkAgg(self.fig_ch2, master=self.graph_frame_ch2)
+        self.canvas_ch2.mpl_connect('draw_event', lambda event: self._on_full_draw(1))
         self.canvas_ch2.draw()
         self.canvas_ch2.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -465,18 +504,26 @@ class EMGScreen(ctk.CTkFrame):
 
         try:
             self.serial_port = serial.Serial(port, int(baudrate), timeout=1)
+            self.parser = PARSERS[self.protocol_var.get()](n_canais=2)
+            self.clock = EMGClock()
+            self._t_ultimo_bloco = None
+            self.data_queue.clear()
+            self._stream_stats = None
             self.connected = True
             self.connect_button.configure(text="Desconectar", image=self.icon_disconnect)
             self.connection_status.configure(text="Conectado", text_color="green")
             self.start_button.configure(state="normal")
             self.record_button.configure(state="normal")
+            self.protocol_segment.configure(state="disabled")
 
             self.serial_thread = threading.Thread(target=self.read_serial_data, daemon=True)
             self.serial_thread.start()
+            self._start_render_loop()
         except Exception as e:
             messagebox.showerror("Erro de Conexão", f"Não foi possível conectar:\n{str(e)}")
 
     def disconnect(self):
+        self._consume_blocks()
         if self.recording:
             self.toggle_recording()
         if self.test_running:
@@ -487,76 +534,169 @@ class EMGScreen(ctk.CTkFrame):
         self.connection_status.configure(text="Desconectado", text_color="red")
         self.start_button.configure(state="disabled")
         self.record_button.configure(state="disabled")
+        self.protocol_segment.configure(state="normal")
 
         if self.serial_port and self.serial_port.is_open:
             self.serial_port.close()
 
     def read_serial_data(self):
-        while self.connected and self.serial_port and self.serial_port.is_open:
-            try:
-                if self.serial_port.in_waiting:
-                    line = self.serial_port.readline().decode('utf-8').strip()
-                    if line:
-                        self.process_serial_data(line)
-            except:
-                break
-
-    def process_serial_data(self, data):
         try:
-            parts = data.split(',')
-            values = []
-            for part in parts:
-                if ':' in part:
-                    val_str = part.split(':')[1]
-                    values.append(float(val_str))
-
-            if len(values) >= 2:
-                timestamp = time.time()
-                self.data_queue.put((timestamp, values))
-
-                if self.test_running:
-                    self.update_plot(timestamp, values)
-
-                if self.recording:
-                    self.time_data.append(timestamp)
-                    for i in range(2):
-                        if self.selected_channels[i]:
-                            self.channel_data[i].append(values[i])
-                        else:
-                            self.channel_data[i].append(0)
+            ler_blocos(
+                self.serial_port, self.parser,
+                ativo=lambda: self.connected,
+                on_bloco=self.process_serial_block
+            )
         except Exception as e:
-            print(f"Erro ao processar dados: {e}")
-
-    def update_plot(self, timestamp, values):
-        if self.selected_channels[0]:
-            x_data_ch1 = list(self.line_ch1.get_xdata())
-            y_data_ch1 = list(self.line_ch1.get_ydata())
-            x_data_ch1.append(timestamp - self.test_start_time)
-            y_data_ch1.append(values[0])
-
-            if len(x_data_ch1) > self.max_points:
-                x_data_ch1 = x_data_ch1[-self.max_points:]
-                y_data_ch1 = y_data_ch1[-self.max_points:]
-
-            self.line_ch1.set_data(x_data_ch1, y_data_ch1)
-            self.ax_ch1.relim()
-            self.ax_ch1.autoscale_view()
-            self.canvas_ch1.draw()
+            print(f"Leitura serial encerrada: {e}")
 
-        if self.selected_channels[1]:
-            x_data_ch2 = list(self.line_ch2.get_xdata())
-            y_data_ch2 = list(self.line_ch2.get_ydata())
-            x_data_ch2.append(timestamp - self.test_start_time)
-            y_data_ch2.append(values[1])
+    def process_serial_block(self, t_leitura, contadores, amostras):
+        """
+        Thread serial: apenas enfileira o bloco decodificado. Nada de Tk,
+        Matplotlib ou listas compartilhadas aqui.
+        """
+        self.data_queue.put((t_leitura, contadores, amostras))
 
-            if len(x_data_ch2) > self.max_points:
-                x_data_ch2 = x_data_ch2[-self.max_points:]
-                y_data_ch2 = y_data_ch2[-self.max_points:]
+    def _consume_blocks(self):
+        """
+        Thread da UI: drena a fila de uma vez e distribui os blocos para o
+        gráfico ao vivo e a gravação.
 
-            self.line_ch2.set_data(x_data_ch2, y_data_ch2)
-            self.ax_ch2.relim()
-            self.ax_ch2.autoscale_view()
-            self.canvas_ch2.draw()
+        Cada amostra ganha um índice (contador do dispositivo ou contagem
+        de chegada); o horário de leitura de cada bloco alimenta o modelo
+        do relógio. O gráfico usa o tempo do modelo assim que ele existe;
+        a gravação guarda índice + chegada para o ajuste final.
+        """
+        # Blocos descartados pela fila cheia vêm antes dos que estão nela
+        blocos, perdidas = self.data_queue.drain()
+        self.clock.pular(perdidas)
+
+        for t_leitura, contadores, amostras in blocos:
+            indices, validas = self.clock.indices(contadores, len(amostras), t_leitura)
+            if len(indices) < len(amostras):
+                # Frames duplicados ficam de fora do gráfico e da gravação
+                amostras = amostras[validas]
+                if not len(amostras): continue
+            n = len(amostras)
+            self.clock.observa(int(indices[-1]), t_leitura)
+
+            # Chegada: tempos distribuídos entre a leitura anterior e esta (com jitter)
+            t_anterior = self._t_ultimo_bloco if self._t_ultimo_bloco is not None else t_leitura
+            chegada = np.linspace(t_anterior, t_leitura, n + 1)[1:]
+            self._t_ultimo_bloco = t_leitura
+
+            if self.test_running:
+                self.update_plot(self.clock.tempos(indices) if self.clock.pronto else chegada, amostras)
+
+            if self.recording:
+                # Canais desativados são gravados como 0
+                try:
+                    self.recorder.write(indices, chegada, amostras * np.asarray(self.selected_channels, dtype='float32'))
+                except OSError as e:
+                    self._recording_failed(e)
+
+    def update_plot(self, timestamps, amostras):
+        """Guarda o bloco nos buffers circulares; o desenho é feito em _draw_live."""
+        self.t_buffer.extend(timestamps)
+        for i in range(2):
+            self.ch_buffers[i].extend(amostras[:, i])
+
+    def _update_stream_status(self):
+        # Falha da thread de escrita aparece mesmo sem blocos novos chegando
+        if self.recording and self.recorder.erro is not None:
+            self._recording_failed(self.recorder.erro)
+        fila = self.data_queue
+        erros = self.parser.erros if self.parser is not None else 0
+        fs = self.clock.fs
+        stats = (fila.overruns, fila.amostras_perdidas, erros, self.clock.lacunas,
+                 self.clock.duplicadas, self.clock.ressincronias, round(fs, 1) if fs else None)
+        if stats == self._stream_stats: return
+        self._stream_stats = stats
+        cor = "orange" if any(stats[:6]) else "gray"
+        taxa = f"{stats[6]:.1f} Hz" if stats[6] else "--"
+        self.stream_status.configure(
+            text=(f"Overruns: {stats[0]} blocos ({stats[1]} amostras) | Erros de quadro: {stats[2]}\n"
+                  f"Lacunas: {stats[3]} amostras | Duplicados: {stats[4]} | "
+                  f"Ressincronias: {stats[5]} | Taxa estimada: {taxa}"),
+            text_color=cor
+        )
+
+    # --- Desenho ao vivo (thread da UI, taxa fixa) ---
+
+    def _live_plots(self):
+        return [(self.ax_ch1, self.line_ch1, self.canvas_ch1),
+                (self.ax_ch2, self.line_ch2, self.canvas_ch2)]
+
+    def _on_full_draw(self, i):
+        """Após um desenho completo, guarda o fundo e repõe a linha (animada) por cima."""
+        ax, line, canvas = self._live_plots()[i]
+        self._backgrounds[i] = canvas.copy_from_bbox(ax.bbox)
+        ax.draw_artist(line)
+
+    def _start_render_loop(self):
+        if self._render_job is None:
+            self._render_job = self.after(self.RENDER_MS, self._render_frame)
+
+    def _render_frame(self):
+        """Um quadro: consome a fila, desenha (se há ensaio) e atualiza os contadores."""
+        self._render_job = None
+        self._consume_blocks()
+        if self.test_running:
+            self._draw_live()
+        self._update_stream_status()
+        if self.connected or self.test_running:
+            self._start_render_loop()
+
+    def _draw_live(self):
+        """
+        Mostra a página atual do eixo x (PAGE_SECONDS). Só a linha é
+        redesenhada (blit); a figura inteira só ao virar a página ou quando
+        o sinal sai da escala y.
+        """
+        t = self.t_buffer.ultimos()
+        canais = [b.ultimos() for b in self.ch_buffers]
+
+        if len(t):
+            t_rel = t - self.test_start_time
+            pagina = max(0, int(t_rel[-1] // self.PAGE_SECONDS))
+            inicio = pagina * self.PAGE_SECONDS
+            k = int(np.searchsorted(t_rel, inicio))
+            passo = max(1, (len(t_rel) - k) // self.MAX_PLOT_POINTS)
+            x = t_rel[k::passo]
+            nova_pagina = pagina != self._page
+            self._page = pagina
+
+            for i, (ax, line, canvas) in enumerate(self._live_plots()):
+                if not self.selected_channels[i]:
+                    continue
+                y = canais[i][k::passo]
+                line.set_data(x, y)
+                redesenhar = self._backgrounds[i] is None
+                if nova_pagina:
+                    ax.set_xlim(inicio, inicio + self.PAGE_SECONDS)
+                    redesenhar = True
+                if self._ajusta_ylim(ax, y, reset=nova_pagina):
+                    redesenhar = True
+
+                if redesenhar:
+                    canvas.draw()
+                else:
+                    canvas.restore_region(self._backgrounds[i])
+                    ax.draw_artist(line)
+                    canvas.blit(ax.bbox)
+
+    @staticmethod
+    def _ajusta_ylim(ax, y, reset=False):
+        """Amplia o eixo y (com folga) se o sinal saiu dele. Retorna True se mudou."""
+        if not len(y): return False
+        lo, hi = float(np.min(y)), float(np.max(y))
+        y0, y1 = ax.get_ylim()
+        if not reset and lo >= y0 and hi <= y1:
+            return False
+        folga = 0.1 * max(hi - lo, 1e-3)
+        if not reset:
+            lo, hi = min(lo, y0), max(hi, y1)
+        ax.set_ylim(lo - folga, hi + folga)
+        return True
 
     def toggle_channel(self, channel_idx):
         self.selected_channels[channel_idx] = self.channel_vars[channel_idx].get()
@@ -577,9 +717,19 @@ class EMGScreen(ctk.CTkFrame):
             messagebox.showerror("Erro", "Digite uma duração válida em segundos")
             return
 
-        self.time_data = []
-        for i in range(2):
-            self.channel_data[i] = []
+        # Um ensaio novo descarta a gravação anterior da análise (a não ser
+        # que esteja gravando agora); o arquivo continua no disco
+        if not self.recording:
+            self.recording_path = None
+
+        self.t_buffer.clear()
+        for buf in self.ch_buffers:
+            buf.clear()
+        self._page = 0
+        for ax, line, canvas in self._live_plots():
+            line.set_data([], [])
+            ax.set_xlim(0, self.PAGE_SECONDS)
+            canvas.draw()
 
         self.test_running = True
         self.test_start_time = time.time()
@@ -592,6 +742,7 @@ class EMGScreen(ctk.CTkFrame):
         self.stop_button.configure(state="normal")
 
         self.update_test_timer()
+        self._start_render_loop()
 
     def update_test_timer(self):
         if self.test_running:
@@ -612,25 +763,62 @@ class EMGScreen(ctk.CTkFrame):
 
     def toggle_recording(self):
         if not self.recording:
+            try:
+                self.recorder = EMGRecorder(
+                    canais_ativos=self.selected_channels,
+                    metadados={"protocolo": self.protocol_var.get()}
+                )
+            except OSError as e:
+                messagebox.showerror("Erro", f"Não foi possível criar o arquivo de gravação:\n{str(e)}")
+                return
+            self.recording_path = self.recorder.path
             self.recording = True
             self.record_button.configure(text="Parar gravação")
-
-            self.time_data = []
-            for i in range(2):
-                self.channel_data[i] = []
         else:
+            # O que ainda está na fila pertence à gravação
+            self._consume_blocks()
+            if not self.recording: return  # a escrita falhou e já foi avisada
             self.recording = False
+            self.recorder.close()
             self.record_button.configure(text="Iniciar gravação")
+            if self.recorder.erro is not None:
+                self._recording_failed(self.recorder.erro)
+                return
             self.save_data()
 
+    def _recording_failed(self, erro):
+        """A escrita em disco falhou: encerra a gravação e avisa o usuário."""
+        self.recording = False
+        self.recorder.close()
+        self.record_button.configure(text="Iniciar gravação")
+        messagebox.showerror(
+            "Erro na gravação",
+            f"A gravação foi interrompida:\n{erro}\n\n"
+            f"O arquivo mantém os dados até a falha:\n{self.recording_path}"
+        )
+
+    def _load_recording(self):
+        """
+        Última gravação numa grade uniforme: (tempos, amostras (n, 2), fs)
+        com fs do modelo do relógio, ou (None, None, None).
+        """
+        if not self.recording_path:
+            return None, None, None
+        try:
+            _, registros = ler_gravacao(self.recording_path)
+            return reamostrar_uniforme(registros['indice'], registros['t'], registros['canais'])
+        except (OSError, ValueError) as e:
+            print(f"Erro ao ler gravação: {e}")
+            return None, None, None
+
     def save_data(self):
-        if not self.time_data or not any(self.channel_data):
+        if not self.recorder or self.recorder.n_amostras == 0:
             messagebox.showwarning("Aviso", "Nenhum dado para salvar")
             return
 
         save_dialog = ctk.CTkToplevel(self.nav_controller)
         save_dialog.title("Salvar dados")
-        save_dialog.geometry("450x250")
+        save_dialog.geometry("450x320")
 
         ctk.CTkLabel(save_dialog, text="Nome do arquivo:").pack(pady=(10, 0))
         filename_entry = ctk.CTkEntry(save_dialog, width=350)
@@ -653,6 +841,13 @@ class EMGScreen(ctk.CTkFrame):
 
         ctk.CTkButton(dir_frame, text="Procurar", command=browse_dir, width=60).pack(side="left")
 
+        # A gravação bruta (.emgraw) fica em EMGRecorder.DEFAULT_DIR até ser apagada
+        apagar_bruto = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(save_dialog, text="Apagar a gravação bruta após exportar",
+                        variable=apagar_bruto).pack(pady=(10, 0))
+        ctk.CTkLabel(save_dialog, text=self.recording_path, font=("Arial", 10),
+                     text_color="gray", wraplength=420).pack()
+
         def do_save():
             filename = filename_entry.get()
             directory = dir_entry.get()
@@ -668,21 +863,31 @@ class EMGScreen(ctk.CTkFrame):
             full_path = f"{directory}/{filename}"
 
             try:
-                data_dict = {'Tempo (s)': [t - self.time_data[0] for t in self.time_data]}
-                for i in range(2):
-                    if self.selected_channels[i]:
-                        data_dict[f'Canal_{i+1}'] = self.channel_data[i]
-
-                df = pd.DataFrame(data_dict)
-                df.to_csv(full_path, index=False)
-
-                messagebox.showinfo("Sucesso", f"Dados salvos em:\n{full_path}")
-                save_dialog.destroy()
+                exportar_csv(self.recording_path, full_path)
             except Exception as e:
                 messagebox.showerror("Erro", f"Falha ao salvar arquivo:\n{str(e)}")
+                return
+
+            if apagar_bruto.get():
+                self._discard_recording()
+            messagebox.showinfo("Sucesso", f"Dados salvos em:\n{full_path}")
+            save_dialog.destroy()
 
         ctk.CTkButton(save_dialog, text="Salvar", command=do_save, width=150).pack(pady=20)
 
+    def _discard_recording(self):
+        """
+        Apaga a gravação bruta já exportada. Sem ela, a gravação sai da
+        análise e não pode ser salva de novo.
+        """
+        try:
+            os.remove(self.recording_path)
+        except OSError as e:
+            print(f"Erro ao apagar gravação: {e}")
+            return
+        self.recording_path = None
+        self.recorder = None
+
     def show_pitch_graph(self, pitches, ch_idx):
         win = ctk.CTkToplevel(self.nav_controller)
         win.title(f"Variação do Pitch - Canal {ch_idx+1}")
@@ -700,7 +905,8 @@ class EMGScreen(ctk.CTkFrame):
         canvas.get_tk_widget().pack(fill="both", expand=True)
 
     def perform_analysis(self):
-        if not self.time_data or not any(self.channel_data):
+        time_data, channel_data, fs = self._load_recording()
+        if time_data is None:
             messagebox.showwarning("Aviso", "Nenhum dado para análise")
             return
 
@@ -708,17 +914,13 @@ class EMGScreen(ctk.CTkFrame):
         perfil = self.profile_var.get()
         results = ""
 
-        try:
-            dt_avg = mean(np.diff(self.time_data))
-            fs = 1.0 / dt_avg
-        except:
-            fs = 1000.0 
-
+        # fs vem do modelo do relógio (índices de amostra), não da média
+        # dos intervalos de chegada, que carregam o jitter da porta
         for i in range(2):
-            if not self.selected_channels[i] or not self.channel_data[i]:
+            if not self.selected_channels[i]:
                 continue
 
-            dados = array(self.channel_data[i])
+            dados = array(channel_data[:, i], dtype=float)
 
             if analysis_type == "Média":
                 value = mean(dados)
@@ -786,6 +988,7 @@ class EMGScreen(ctk.CTkFrame):
             "selected_baud": self.baudrate_var.get(),
             "selected_channels": self.selected_channels,
             "selected_duration": self.duration_entry.get(),
+            "selected_protocol": self.protocol_var.get(),
         }
 
         try:
@@ -803,6 +1006,9 @@ class EMGScreen(ctk.CTkFrame):
             if "selected_baud" in settings:
                 self.baudrate_var.set(settings["selected_baud"])
 
+            if settings.get("selected_protocol") in PARSERS:
+                self.protocol_var.set(settings["selected_protocol"])
+
             if "selected_channels" in settings:
                 self.selected_channels = settings["selected_channels"]
                 for i in range(2):
@@ -2,6 +2,7 @@ import os
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
+from model.spectrogram_raster import reduzir_espectrograma
 
 # Configurações de Estilo para Artigos (Fundo Branco)
 EXPORT_FACECOLOR = 'white'
@@ -18,9 +19,11 @@ class PlotExporter:
                        analyzer, 
                        grid_enabled: bool,
                        params: dict,
-                       active_charts: list): 
+                       active_charts: list,
+                       context=None): 
         """
         Salva gráficos baseados na lista 'active_charts'.
+        'context' é o AnalysisContext do áudio ativo (STFT já calculada).
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         saved_files = []
@@ -33,6 +36,9 @@ class PlotExporter:
             fi = params.get('fi', 20)
             fm = params.get('fm', 20000)
 
+            # Reaproveita a STFT do Dashboard ou calcula uma única para todos
+            ctx = context if context is not None else analyzer.get_context(x, fs)
+
             # --- GERAÇÃO CONDICIONAL ---
             
             # 1. Waveform (Azul Claro)
@@ -41,7 +47,7 @@ class PlotExporter:
             
             # 2. Espectrograma (Colorido)
             if "Spectrogram" in active_charts:
-                saved_files.append(self._save_spectrogram(dir_path, timestamp, x, fs, analyzer, fi, fm))
+                saved_files.append(self._save_spectrogram(dir_path, timestamp, x, fs, analyzer, fi, fm, ctx))
             
             # 3. Pitch / Frequência Instantânea (Verde)
             if "Pitch" in active_charts or "HilbertFreq" in active_charts:
@@ -49,7 +55,7 @@ class PlotExporter:
 
             # --- [NEW] 3.5 Variação de Pitch STFT (Azul) ---
             if "PitchSTFT" in active_charts:
-                saved_files.append(self._save_pitch_stft(dir_path, timestamp, x, fs, analyzer, grid_enabled))
+                saved_files.append(self._save_pitch_stft(dir_path, timestamp, x, fs, analyzer, grid_enabled, ctx))
             
             # 4. Envoltória Hilbert (Vermelho Tracejado)
             if "Hilbert" in active_charts or "HilbertEnvelope" in active_charts:
@@ -57,11 +63,14 @@ class PlotExporter:
             
             # 5. RMS (Laranja)
             if "RMS" in active_charts:
-                saved_files.append(self._save_rms(dir_path, timestamp, x, fs, analyzer, grid_enabled))
+                saved_files.append(self._save_rms(
+                    dir_path, timestamp, x, fs, analyzer, grid_enabled,
+                    params.get('rms_frame', 2048), params.get('rms_hop', 1024)
+                ))
             
             # 6. SFFT 3D (Opcional)
             if "SFFT3D" in active_charts:
-                saved_files.append(self._save_sfft_3d(dir_path, timestamp, x, fs, analyzer, fi, fm))
+                saved_files.append(self._save_sfft_3d(dir_path, timestamp, x, fs, analyzer, fi, fm, ctx))
 
         # 7. FFT Comparativo
         if plot_list and ("FFT" in active_charts):
@@ -106,10 +115,17 @@ class PlotExporter:
         plt.close(fig)
         return fname
 
-    def _save_spectrogram(self, dir_path, ts, x, fs, analyzer, fi, fm):
+    def _save_spectrogram(self, dir_path, ts, x, fs, analyzer, fi, fm, ctx=None):
         fig, ax = self._create_figure()
-        t, f, S_db = analyzer.calcular_espectrograma(x, fs, fmin=fi, fmax=fm)
-        img = ax.pcolormesh(t, f, S_db, shading='gouraud', cmap='inferno')
+        t, f, S_db = analyzer.calcular_espectrograma(x, fs, fmin=fi, fmax=fm, ctx=ctx)
+        # Raster no tamanho da imagem exportada (em pixels), não da matriz inteira
+        fig.canvas.draw()
+        bbox = ax.get_window_extent()
+        S_img, extent = reduzir_espectrograma(t, f, S_db, bbox.width, bbox.height)
+        if S_img is None:
+            S_img, extent = np.zeros((1, 1)), None
+        img = ax.imshow(S_img, origin='lower', aspect='auto', extent=extent,
+                        cmap='inferno', interpolation='nearest')
         cbar = fig.colorbar(img, ax=ax, format='%+2.0f dB')
         cbar.ax.yaxis.set_tick_params(color=TEXT_COLOR)
         plt.setp(plt.getp(cbar.ax.axes, 'yticklabels'), color=TEXT_COLOR)
@@ -148,10 +164,10 @@ class PlotExporter:
         return fname
 
     # --- [NEW] MÉTODO NOVO ---
-    def _save_pitch_stft(self, dir_path, ts, x, fs, analyzer, grid):
+    def _save_pitch_stft(self, dir_path, ts, x, fs, analyzer, grid, ctx=None):
         fig, ax = self._create_figure()
         # Chama o novo método do analyzer
-        t, f_stft = analyzer.get_pitch_variation_stft(x, fs)
+        t, f_stft = analyzer.get_pitch_variation_stft(x, fs, ctx=ctx)
         
         # Cor Azul (#448AFF) igual à definida na View
         ax.plot(t, f_stft, color='#448AFF', linewidth=1.5)
@@ -181,9 +197,9 @@ class PlotExporter:
         plt.close(fig)
         return fname
 
-    def _save_rms(self, dir_path, ts, x, fs, analyzer, grid):
+    def _save_rms(self, dir_path, ts, x, fs, analyzer, grid, frame_len=2048, hop=1024):
         fig, ax = self._create_figure()
-        t, rms = analyzer.get_rms_data(x, fs)
+        t, rms = analyzer.get_rms_data(x, fs, frame_len=frame_len, hop=hop)
         ax.plot(t, rms, color='orange', linewidth=1.0)
         ax.set_title("Envelope RMS")
         ax.set_xlabel("Tempo (s)")
@@ -194,13 +210,14 @@ class PlotExporter:
         plt.close(fig)
         return fname
 
-    def _save_sfft_3d(self, dir_path, ts, x, fs, analyzer, fi, fm):
+    def _save_sfft_3d(self, dir_path, ts, x, fs, analyzer, fi, fm, ctx=None):
         fig, ax = self._create_figure(is_3d=True)
-        T, Fgrid, Zxx_mag = analyzer.get_sfft_3d_data(x, fs, fmin=fi, fmax=fm)
+        t, f, Z = analyzer.get_sfft_3d_data(x, fs, fmin=fi, fmax=fm, ctx=ctx)
+        T, Fgrid = np.meshgrid(t, f)  # grade já reduzida pelo analyzer
         ax.plot_surface(
-            T, Fgrid, Zxx_mag, 
+            T, Fgrid, Z, 
             cmap='viridis', edgecolor='none', 
-            rstride=8, cstride=8, antialiased=False
+            rstride=1, cstride=1, antialiased=False
         )
         ax.set_title("Espectro 3D (SFFT)")
         ax.set_xlabel("Tempo (s)")
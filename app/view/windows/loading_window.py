@@ -52,4 +52,8 @@ class LoadingWindow(ctk.CTkToplevel):
             font=("Roboto Medium", 16), 
             text_color="white"
         )
-        self.lbl_msg.place(relx=0.5, rely=0.5, anchor="center")
\ No newline at end of file
+        self.lbl_msg.place(relx=0.5, rely=0.5, anchor="center")
+
+    def set_message(self, message):
+        """Atualiza o texto (ex.: progresso da análise em segundo plano)."""
+        self.lbl_msg.configure(text=message)